@@ -0,0 +1,93 @@
+"""
+Cache of already verified API keys.
+
+Verifying a key costs a DB lookup plus a hasher check (a deliberately slow
+password hasher for keys created before djangorestframework-api-key 2.x).
+Once a key has been verified, we remember it for a short TTL under a keyed
+BLAKE2 digest of the presented key, so the raw key never reaches the cache.
+
+Entries live in the "api_keys" namespace of the two-tier cache: a per-process
+LRU (API_KEY_CACHE_LOCAL_TTL) in front of the shared cache (API_KEY_CACHE_TTL).
+Changing or deleting a key drops the whole namespace (see signals.py), so every
+process forgets it within CACHE_VERSION_CHECK_INTERVAL; entries past the key's
+expiry date are discarded on read. While the shared tier is failing, a drop
+cannot reach the other processes, so cached entries are ignored and every key
+is verified against the DB until it is back.
+"""
+
+import hashlib
+import time
+from functools import lru_cache
+
+from django.conf import settings
+
+from apps.common.cache.two_tier_cache import get_cache
+
+_cache = get_cache(
+    "api_keys",
+    ttl=settings.API_KEY_CACHE_TTL,
+    local_ttl=settings.API_KEY_CACHE_LOCAL_TTL,
+    maxsize=settings.API_KEY_CACHE_SIZE,
+)
+
+
+@lru_cache(maxsize=1)
+def _digest_key() -> bytes:
+    return hashlib.blake2b(settings.SECRET_KEY.encode(), digest_size=32).digest()
+
+
+def digest(key: str) -> str:
+    """
+    Fast keyed digest of a presented API key.
+    """
+    return hashlib.blake2b(key.encode(), key=_digest_key(), digest_size=20).hexdigest()
+
+
+def _entry_key(key_digest: str) -> str:
+    return f"verified:{key_digest}"
+
+
+def get(key_digest: str):
+    """
+    Return the cached ``{"id", "expires_at"}`` entry for a verified key, or None.
+    Entries past the key's own expiry date are deleted on read, and none is
+    returned while the shared tier is failing.
+    """
+    entry = _cache.get(_entry_key(key_digest))
+    if entry is None or _cache.degraded:
+        return None
+
+    expires_at = entry["expires_at"]
+    if expires_at is not None and expires_at <= time.time():
+        _cache.delete(_entry_key(key_digest))
+        return None
+    return entry
+
+
+def store(key_digest: str, api_key) -> dict:
+    """
+    Remember a freshly verified APIKey instance.
+    """
+    expires_at = api_key.expiry_date.timestamp() if api_key.expiry_date else None
+    entry = {"id": api_key.pk, "expires_at": expires_at}
+
+    ttl = _cache.ttl
+    if expires_at is not None:
+        ttl = max(0, min(ttl, int(expires_at - time.time())))
+    if ttl:
+        _cache.set(_entry_key(key_digest), entry, ttl=ttl)
+    return entry
+
+
+def purge():
+    """
+    Forget every verified key, in the shared tier, this process and, within
+    CACHE_VERSION_CHECK_INTERVAL, every other process. Keys still valid are
+    verified again on their next request. When the shared tier is failing, the
+    other processes stop trusting their entries instead (see get()).
+    """
+    _cache.invalidate()
+
+
+def clear_local():
+    _cache.local.clear()
@@ -1,12 +1,24 @@
 from typing import List
 
-from rest_framework_api_key.permissions import HasAPIKey
+from apps.authentication.permissions.cached_has_api_key import CachedHasAPIKey
+from apps.authentication.throttles.api_key_token_bucket_throttle import (
+    ApiKeyTokenBucketThrottle,
+)
 
 
 def add_api_permission_to_permission_classes(permissions: List):
     """
     Adds ApiKey class to base auth permissions
     """
-    permissions = [HasAPIKey()] + permissions
+    permissions = [CachedHasAPIKey()] + permissions
 
     return permissions
+
+
+def add_api_throttle_to_throttle_classes(throttles: List):
+    """
+    Adds the per ApiKey token bucket to base throttles
+    """
+    throttles = [ApiKeyTokenBucketThrottle()] + throttles
+
+    return throttles
@@ -0,0 +1,114 @@
+"""
+Token buckets for per-API-key rate limiting.
+
+Buckets live in Redis, updated by a Lua script so the refill-and-take step is
+atomic across every gunicorn worker. When REDIS_URL is not set, or Redis
+fails, buckets fall back to this process' memory: limits then apply per
+worker instead of globally, but requests keep flowing.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+import redis
+
+from apps.common.methods.redis_fallback import RedisFallback
+
+logger = logging.getLogger(__name__)
+
+# Same period notation as DRF throttle rates: only the first letter counts.
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# KEYS[1] bucket; ARGV[1] capacity; ARGV[2] tokens per second.
+# Returns the seconds to wait for a token ("0" when one was taken).
+TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+
+@lru_cache(maxsize=32)
+def parse_rate(rate: str):
+    """
+    "600/minute" → (capacity=600, refill=10.0 tokens per second).
+    The bucket holds one period worth of tokens, so bursts up to the full rate
+    are allowed and the sustained rate is the one given.
+    """
+    tokens, _, period = rate.partition("/")
+    capacity = int(tokens)
+    return capacity, capacity / PERIODS[period.strip()[0]]
+
+
+class LocalTokenBucket:
+    """
+    In-process buckets, bounded to ``maxsize`` keys (least recently used
+    buckets are dropped, which only ever refills them).
+    """
+
+    def __init__(self, maxsize: int = 10_000, clock=time.monotonic):
+        self.maxsize = maxsize
+        self._clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        with self._lock:
+            now = self._clock()
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+            return wait
+
+
+class RedisTokenBucket:
+    def __init__(self, client: redis.Redis):
+        self.client = client
+        self.script = self.client.register_script(TAKE_SCRIPT)
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        return float(self.script(keys=[key], args=[capacity, rate]))
+
+
+_local = LocalTokenBucket()
+_redis = RedisFallback("Token bucket", "API_KEY_THROTTLE_REDIS", RedisTokenBucket, logger)
+
+
+def take(key: str, rate: str) -> float:
+    """
+    Take one token from bucket ``key`` configured with ``rate``.
+    Returns 0 when allowed, otherwise the seconds until a token is available.
+    """
+    capacity, refill = parse_rate(rate)
+    bucket = _redis.get()
+    if bucket is not None:
+        try:
+            return bucket.take(f"throttle:{key}", capacity, refill)
+        except redis.RedisError as e:
+            _redis.failed(e)
+    return _local.take(key, capacity, refill)
@@ -2,7 +2,9 @@ from rest_framework.views import APIView
 
 from apps.authentication.methods.authentication_config import (
     add_api_permission_to_permission_classes,
+    add_api_throttle_to_throttle_classes,
 )
+from apps.common.methods.request_timing import timed
 
 
 class ApiKeyProtectedViewMixin(APIView):
@@ -15,12 +17,22 @@ class ApiKeyProtectedViewMixin(APIView):
     - ViewSet
     - GenericViewSet
     - ModelViewSet
+
+    Requests are also rate limited per api key (see ApiKeyTokenBucketThrottle).
     """
 
     def check_permissions(self, request):
         permissions = add_api_permission_to_permission_classes(self.get_permissions())
-        for permission in permissions:
-            if not permission.has_permission(request=request, view=self):
-                self.permission_denied(
-                    request, message=getattr(permission, "message", None)
-                )
+        with timed("auth"):
+            for permission in permissions:
+                if not permission.has_permission(request=request, view=self):
+                    self.permission_denied(
+                        request, message=getattr(permission, "message", None)
+                    )
+
+    def check_throttles(self, request):
+        with timed("throttle"):
+            super().check_throttles(request)
+
+    def get_throttles(self):
+        return add_api_throttle_to_throttle_classes(super().get_throttles())
@@ -0,0 +1,31 @@
+from rest_framework_api_key.permissions import HasAPIKey
+
+from apps.authentication.methods import api_key_cache
+
+
+class CachedHasAPIKey(HasAPIKey):
+    """
+    HasAPIKey that skips the DB lookup and hasher check for keys verified
+    within the last API_KEY_CACHE_TTL seconds.
+
+    The id of the verified key is exposed as ``request.api_key_id``.
+    """
+
+    def has_permission(self, request, view):
+        key = self.get_key(request)
+        if not key:
+            return False
+
+        key_digest = api_key_cache.digest(key)
+        entry = api_key_cache.get(key_digest)
+        if entry is None:
+            try:
+                api_key = self.model.objects.get_from_key(key)
+            except self.model.DoesNotExist:
+                return False
+            if api_key.has_expired:
+                return False
+            entry = api_key_cache.store(key_digest, api_key)
+
+        request.api_key_id = entry["id"]
+        return True
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_api_key.models import APIKey
+
+from apps.authentication.methods import api_key_cache
+
+
+@receiver(post_save, sender=APIKey)
+@receiver(post_delete, sender=APIKey)
+def purge_cached_api_key(sender, instance, **kwargs):
+    """
+    Any change to a key (revoked, new expiry date, deleted) drops the cached
+    verifications so the next request goes through the full check. A new key
+    has nothing cached yet.
+    """
+    if not kwargs.get("created"):
+        api_key_cache.purge()
@@ -0,0 +1,115 @@
+from datetime import timedelta
+from unittest import mock
+
+import redis
+from django.conf import settings
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from rest_framework_api_key.models import APIKey
+
+from apps.authentication.methods import api_key_cache
+from apps.authentication.permissions.cached_has_api_key import CachedHasAPIKey
+from apps.common.cache import two_tier_cache
+from apps.common.cache.two_tier_cache import TwoTierCache
+
+
+class CachedHasAPIKeyTests(TestCase):
+    def setUp(self):
+        self.api_key_obj, self.api_key = APIKey.objects.create_key(name="test")
+        self.permission = CachedHasAPIKey()
+        self.factory = RequestFactory()
+
+    def has_permission(self, key=None):
+        request = self.factory.get("/customers/", HTTP_X_API_KEY=key or self.api_key)
+        return self.permission.has_permission(request, view=None), request
+
+    def test_verified_key_is_served_from_cache(self):
+        """The first check hits the DB; the next ones run no query at all."""
+        allowed, request = self.has_permission()
+        self.assertTrue(allowed)
+        self.assertEqual(request.api_key_id, self.api_key_obj.pk)
+
+        api_key_cache.clear_local()
+        with self.assertNumQueries(0):
+            self.assertTrue(self.has_permission()[0])
+
+    def test_invalid_key_is_rejected_and_not_cached(self):
+        bad_key = f"{self.api_key_obj.prefix}.not-the-secret"
+        self.assertFalse(self.has_permission(bad_key)[0])
+        self.assertIsNone(api_key_cache.get(api_key_cache.digest(bad_key)))
+
+    def test_revoking_a_key_purges_it_immediately(self):
+        self.assertTrue(self.has_permission()[0])
+
+        self.api_key_obj.revoked = True
+        self.api_key_obj.save()
+
+        self.assertFalse(self.has_permission()[0])
+
+    def test_revoking_a_key_purges_it_in_other_processes(self):
+        other_process = TwoTierCache(
+            "api_keys",
+            ttl=settings.API_KEY_CACHE_TTL,
+            local_ttl=settings.API_KEY_CACHE_LOCAL_TTL,
+        )
+        self.assertTrue(self.has_permission()[0])
+        with mock.patch.object(api_key_cache, "_cache", other_process):
+            self.assertTrue(self.has_permission()[0])
+
+        self.api_key_obj.revoked = True
+        self.api_key_obj.save()
+
+        with (
+            mock.patch.object(api_key_cache, "_cache", other_process),
+            self.settings(CACHE_VERSION_CHECK_INTERVAL=0),
+        ):
+            self.assertFalse(self.has_permission()[0])
+
+    def test_revoking_a_key_while_the_shared_tier_fails(self):
+        self.addCleanup(two_tier_cache._redis.reset)
+        other_process = TwoTierCache(
+            "api_keys",
+            ttl=settings.API_KEY_CACHE_TTL,
+            local_ttl=settings.API_KEY_CACHE_LOCAL_TTL,
+        )
+        self.assertTrue(self.has_permission()[0])
+        with mock.patch.object(api_key_cache, "_cache", other_process):
+            self.assertTrue(self.has_permission()[0])
+
+        failing = mock.Mock()
+        for method in ("get", "set", "add", "incr", "delete"):
+            getattr(failing, method).side_effect = redis.ConnectionError("down")
+        with (
+            mock.patch.object(api_key_cache._cache, "remote", failing),
+            mock.patch.object(other_process, "remote", failing),
+            mock.patch.object(api_key_cache._cache, "_start_invalidate_retry") as retry,
+            self.settings(CACHE_VERSION_CHECK_INTERVAL=0),
+            self.assertLogs(two_tier_cache.logger, "ERROR"),
+        ):
+            self.api_key_obj.revoked = True
+            self.api_key_obj.save()
+            retry.assert_called_once()
+
+            # Every process verifies against the DB while the bump is pending.
+            self.assertFalse(self.has_permission()[0])
+            with mock.patch.object(api_key_cache, "_cache", other_process):
+                self.assertFalse(self.has_permission()[0])
+
+        # Back up: the retried bump drops the stale shared entry.
+        two_tier_cache._redis.reset()
+        with (
+            self.settings(CACHE_REMOTE_RETRY=0, CACHE_VERSION_CHECK_INTERVAL=0),
+            self.assertLogs(two_tier_cache.logger, "WARNING"),
+        ):
+            api_key_cache._cache._retry_invalidate()
+            with mock.patch.object(api_key_cache, "_cache", other_process):
+                self.assertFalse(self.has_permission()[0])
+
+    def test_cached_key_stops_working_once_expired(self):
+        self.api_key_obj.expiry_date = timezone.now() + timedelta(hours=1)
+        self.api_key_obj.save()
+        self.assertTrue(self.has_permission()[0])
+
+        later = (timezone.now() + timedelta(hours=2)).timestamp()
+        with mock.patch.object(api_key_cache.time, "time", return_value=later):
+            self.assertIsNone(api_key_cache.get(api_key_cache.digest(self.api_key)))
@@ -0,0 +1,69 @@
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_api_key.models import APIKey
+
+from apps.authentication.methods.token_bucket import LocalTokenBucket, parse_rate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LocalTokenBucketTests(SimpleTestCase):
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("120/m"), (120, 2.0))
+        self.assertEqual(parse_rate("10/second"), (10, 10.0))
+
+    def test_bucket_refills_over_time(self):
+        clock = FakeClock()
+        bucket = LocalTokenBucket(clock=clock)
+        capacity, rate = parse_rate("2/s")
+
+        self.assertEqual(bucket.take("k", capacity, rate), 0)
+        self.assertEqual(bucket.take("k", capacity, rate), 0)
+        self.assertAlmostEqual(bucket.take("k", capacity, rate), 0.5)
+
+        clock.now += 0.5
+        self.assertEqual(bucket.take("k", capacity, rate), 0)
+
+
+@override_settings(REDIS_URL="", API_KEY_THROTTLE_RATES={"read": "2/h", "write": "1/h"})
+class ApiKeyThrottleTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        _, self.api_key = APIKey.objects.create_key(name="test")
+        self.auth = {"HTTP_X_API_KEY": self.api_key}
+
+    def test_read_budget_exhausted_returns_429_with_retry_after(self):
+        for _ in range(2):
+            resp = self.client.get("/customers/", **self.auth)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        resp = self.client.get("/customers/", **self.auth)
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(resp["Retry-After"]), 0)
+
+    def test_reads_and_writes_have_separate_budgets(self):
+        for _ in range(2):
+            self.client.get("/customers/", **self.auth)
+
+        payload = {"external_id": "cust_throttle", "score": "100.00"}
+        resp = self.client.post("/customers/", payload, format="json", **self.auth)
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+        resp = self.client.post("/customers/", payload, format="json", **self.auth)
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_budgets_are_per_api_key(self):
+        for _ in range(3):
+            self.client.get("/customers/", **self.auth)
+
+        _, other_key = APIKey.objects.create_key(name="other")
+        resp = self.client.get("/customers/", HTTP_X_API_KEY=other_key)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
@@ -0,0 +1,37 @@
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from apps.authentication.methods import token_bucket
+
+
+class ApiKeyTokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket per API key, with separate budgets for reads and writes
+    (API_KEY_THROTTLE_RATES). Runs after the API key permission, which sets
+    ``request.api_key_id``.
+
+    When the bucket is empty DRF answers 429 with a Retry-After header.
+    """
+
+    read_actions = {"list", "retrieve", "balance", "simulate", "metadata", None}
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_scope(self, view):
+        return "read" if getattr(view, "action", None) in self.read_actions else "write"
+
+    def allow_request(self, request, view):
+        api_key_id = getattr(request, "api_key_id", None)
+        if api_key_id is None:
+            return True
+
+        scope = self.get_scope(view)
+        prefix = api_key_id.partition(".")[0]
+        self.wait_seconds = token_bucket.take(
+            f"{scope}:{prefix}", settings.API_KEY_THROTTLE_RATES[scope]
+        )
+        return self.wait_seconds == 0
+
+    def wait(self):
+        return self.wait_seconds
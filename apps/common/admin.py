@@ -1,2 +1,52 @@
+# apps/common/admin.py
+from django.contrib import admin
 
-# Register your models here.
+from apps.common.models.slow_query import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = (
+        "statement_preview",
+        "caller",
+        "calls",
+        "mean_duration_ms",
+        "max_duration_ms",
+        "database",
+        "last_seen",
+    )
+    list_filter = ("database", "caller")
+    search_fields = ("statement", "caller")
+    ordering = ("-last_seen",)
+    fields = (
+        "caller",
+        "database",
+        "calls",
+        "mean_duration_ms",
+        "max_duration_ms",
+        "created_at",
+        "last_seen",
+        "statement",
+        "sql",
+        "params_fingerprint",
+        "plan",
+    )
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="statement")
+    def statement_preview(self, obj):
+        return obj.statement[:120]
+
+    @admin.display(description="mean ms", ordering="total_duration")
+    def mean_duration_ms(self, obj):
+        return round(obj.mean_duration * 1e3, 1)
+
+    @admin.display(description="max ms", ordering="max_duration")
+    def max_duration_ms(self, obj):
+        return round(obj.max_duration * 1e3, 1)
@@ -0,0 +1,68 @@
+from functools import wraps
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.common.cache.two_tier_cache import get_cache
+
+
+def cached(namespace: str, key=None, ttl=None):
+    """
+    Cache the return value of a function in a TwoTierCache namespace.
+
+    ``key`` receives the same arguments as the function and returns the cache
+    key; by default the arguments' repr is used, so pass ``key`` when
+    decorating methods (e.g. a serializer's) whose ``self`` should not count:
+
+        @cached("customers", key=lambda self, customer: customer.external_id)
+        def get_total_debt(self, customer): ...
+
+    The namespace cache is exposed as ``func.cache`` for invalidation.
+    """
+    cache = get_cache(namespace)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if key is not None:
+                cache_key = key(*args, **kwargs)
+            else:
+                cache_key = f"{func.__qualname__}:{args!r}:{sorted(kwargs.items())!r}"
+            return cache.get_or_set(cache_key, lambda: func(*args, **kwargs), ttl=ttl)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def cache_response(namespace: str, ttl=None):
+    """
+    Cache the data of successful GET responses of a viewset action, keyed on
+    the action, its URL kwargs and the full path (query string included).
+
+        @cache_response("customers", ttl=30)
+        def retrieve(self, request, external_id=None): ...
+    """
+    cache = get_cache(namespace)
+
+    def decorator(action):
+        @wraps(action)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method != "GET":
+                return action(view, request, *args, **kwargs)
+
+            cache_key = f"{view.action}:{request.get_full_path()}"
+            data = cache.get(cache_key)
+            if data is not None:
+                return Response(data)
+
+            response = action(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(cache_key, response.data, ttl=ttl)
+            return response
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -0,0 +1,286 @@
+"""
+Two-tier cache: a per-process LRU in front of Django's default cache (Redis in
+production, locmem in tests and local runs without REDIS_URL).
+
+Every feature caches under its own namespace:
+
+    customers = get_cache("customers", ttl=60)
+    data = customers.get_or_set(external_id, compute)
+    customers.invalidate()  # version bump: drops the whole namespace
+
+Keys are ``<namespace>:<version>:<key>``. The namespace version lives in the
+shared tier; each process re-reads it at most every CACHE_VERSION_CHECK_INTERVAL
+seconds, so a bump reaches every worker within that interval.
+
+When the shared tier fails (Redis down or timing out), the error is logged and
+the lookup counts as a miss: values are computed and kept in the local tier
+only, and the shared tier is skipped for CACHE_REMOTE_RETRY seconds (the cache
+is ``degraded`` for twice that). An invalidation that cannot reach the shared
+tier only drops this process' local tier: invalidate() returns False and a
+thread retries the version bump every CACHE_REMOTE_RETRY seconds until the
+shared tier is back.
+"""
+
+import logging
+import threading
+import time
+
+import redis
+from django.conf import settings
+from django.core.cache import cache as shared_cache
+
+from apps.common.methods.lru_cache import MISSING, LRUCache
+from apps.common.methods.metrics import CACHE_LOOKUPS
+from apps.common.methods.redis_fallback import RedisFallback
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+_registry_lock = threading.Lock()
+_redis = RedisFallback("Cache", "CACHE_REMOTE", log=logger)
+
+
+class CacheStats:
+    """
+    Hit/miss counters and accumulated lookup latency of one namespace.
+    """
+
+    __slots__ = ("local_hits", "remote_hits", "misses", "computes", "lookups", "seconds")
+
+    def __init__(self):
+        self.local_hits = self.remote_hits = self.misses = self.computes = 0
+        self.lookups = 0
+        self.seconds = 0.0
+
+    def as_dict(self):
+        hits = self.local_hits + self.remote_hits
+        return {
+            "local_hits": self.local_hits,
+            "remote_hits": self.remote_hits,
+            "misses": self.misses,
+            "computes": self.computes,
+            "hit_ratio": hits / self.lookups if self.lookups else 0.0,
+            "avg_lookup_us": self.seconds / self.lookups * 1e6 if self.lookups else 0.0,
+        }
+
+
+class TwoTierCache:
+    def __init__(self, namespace: str, ttl=None, local_ttl=None, maxsize=None):
+        self.namespace = namespace
+        self.ttl = settings.CACHE_DEFAULT_TTL if ttl is None else ttl
+        self.local_ttl = settings.CACHE_LOCAL_TTL if local_ttl is None else local_ttl
+        self.local = LRUCache(maxsize=maxsize or settings.CACHE_LOCAL_MAXSIZE)
+        self.remote = shared_cache
+        self.stats = CacheStats()
+        self._lookups = {
+            result: CACHE_LOOKUPS.labels(namespace, result)
+            for result in ("local_hit", "remote_hit", "miss")
+        }
+        self._version = None
+        self._version_checked_at = 0.0
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self._invalidate_retrying = False
+
+    @property
+    def _version_key(self):
+        return f"{self.namespace}:version"
+
+    @property
+    def degraded(self) -> bool:
+        """
+        Whether the shared tier failed recently: while it is skipped, and for
+        one more CACHE_REMOTE_RETRY pause, the time another process needs to
+        retry an invalidation it could not get through.
+        """
+        return time.monotonic() < _redis.down_until + _redis.retry
+
+    def _call_remote(self, method: str, *args, default=None, **kwargs):
+        """
+        Call ``method`` of the shared tier. On a backend error, log it and
+        return ``default``, and skip the shared tier for a short pause.
+        """
+        if not _redis.available:
+            return default
+        try:
+            return getattr(self.remote, method)(*args, **kwargs)
+        except redis.RedisError as e:
+            _redis.failed(e)
+            return default
+
+    def version(self) -> int:
+        now = time.monotonic()
+        if (
+            self._version is None
+            or now - self._version_checked_at >= settings.CACHE_VERSION_CHECK_INTERVAL
+        ):
+            version = self._call_remote("get", self._version_key, default=MISSING)
+            if version is not MISSING:
+                self._version = version or 1
+            elif self._version is None:
+                self._version = 1
+            self._version_checked_at = now
+        return self._version
+
+    def make_key(self, key) -> str:
+        return f"{self.namespace}:{self.version()}:{key}"
+
+    def invalidate(self) -> bool:
+        """
+        Drop every entry of the namespace by bumping its version. Returns False
+        when the shared tier could not be reached: only this process' entries
+        are dropped, and the bump is retried in the background.
+        """
+        self.local.clear()
+        if self._bump_version():
+            return True
+        self._start_invalidate_retry()
+        return False
+
+    def _bump_version(self) -> bool:
+        added = self._call_remote(
+            "add", self._version_key, 1, timeout=None, default=MISSING
+        )
+        if added is MISSING:
+            return False
+        try:
+            version = self._call_remote("incr", self._version_key)
+        except ValueError:  # evicted between add() and incr()
+            stored = self._call_remote(
+                "set", self._version_key, 2, timeout=None, default=MISSING
+            )
+            version = None if stored is MISSING else 2
+        if version is None:
+            return False
+        self._version = version
+        self._version_checked_at = time.monotonic()
+        return True
+
+    def _retry_invalidate(self):
+        try:
+            while True:
+                time.sleep(settings.CACHE_REMOTE_RETRY)
+                if self._bump_version():
+                    self.local.clear()
+                    logger.warning(f"Cache {self.namespace} invalidated after an outage")
+                    return
+        finally:
+            self._invalidate_retrying = False
+
+    def _start_invalidate_retry(self):
+        with self._flights_lock:
+            if self._invalidate_retrying:
+                return
+            self._invalidate_retrying = True
+        threading.Thread(
+            target=self._retry_invalidate,
+            name=f"cache-invalidate-{self.namespace}",
+            daemon=True,
+        ).start()
+
+    def get(self, key, default=None):
+        started = time.perf_counter()
+        full_key = self.make_key(key)
+        value = self.local.get(full_key)
+        if value is not MISSING:
+            self.stats.local_hits += 1
+            self._lookups["local_hit"].inc()
+        else:
+            value = self._call_remote("get", full_key, MISSING, default=MISSING)
+            if value is not MISSING:
+                self.stats.remote_hits += 1
+                self._lookups["remote_hit"].inc()
+                self.local.set(full_key, value, ttl=self.local_ttl)
+            else:
+                self.stats.misses += 1
+                self._lookups["miss"].inc()
+        self.stats.lookups += 1
+        self.stats.seconds += time.perf_counter() - started
+        return default if value is MISSING else value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        full_key = self.make_key(key)
+        self._call_remote("set", full_key, value, timeout=ttl)
+        self.local.set(full_key, value, ttl=min(ttl, self.local_ttl))
+
+    def delete(self, key):
+        full_key = self.make_key(key)
+        self._call_remote("delete", full_key)
+        self.local.delete(full_key)
+
+    def get_or_set(self, key, compute, ttl=None):
+        """
+        Return the cached value or compute, store and return it.
+
+        Stampede protection: in this process, concurrent misses for the same
+        key wait for a single computation; across processes, a short lock in
+        the shared tier lets one worker compute while the others poll for the
+        result (up to CACHE_LOCK_TIMEOUT, then they compute themselves).
+        """
+        value = self.get(key, MISSING)
+        if value is not MISSING:
+            return value
+
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = threading.Event()
+
+        if not leader:
+            flight.wait(settings.CACHE_LOCK_TIMEOUT)
+            value = self.get(key, MISSING)
+            if value is not MISSING:
+                return value
+            return self._compute(key, compute, ttl)
+
+        try:
+            return self._compute_once(key, compute, ttl)
+        finally:
+            with self._flights_lock:
+                self._flights.pop(key, None)
+            flight.set()
+
+    def _compute(self, key, compute, ttl):
+        value = compute()
+        self.stats.computes += 1
+        self.set(key, value, ttl)
+        return value
+
+    def _compute_once(self, key, compute, ttl):
+        lock_key = f"{self.make_key(key)}:lock"
+        timeout = settings.CACHE_LOCK_TIMEOUT
+        if self._call_remote("add", lock_key, 1, timeout=timeout, default=True):
+            try:
+                return self._compute(key, compute, ttl)
+            finally:
+                self._call_remote("delete", lock_key)
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.01)
+            value = self._call_remote("get", self.make_key(key), MISSING, default=MISSING)
+            if value is not MISSING:
+                self.local.set(self.make_key(key), value, ttl=self.local_ttl)
+                return value
+        return self._compute(key, compute, ttl)
+
+
+def get_cache(namespace: str, **options) -> TwoTierCache:
+    """
+    Return the process-wide TwoTierCache of ``namespace``, creating it with
+    ``options`` (ttl, local_ttl, maxsize) on first use.
+    """
+    with _registry_lock:
+        instance = _registry.get(namespace)
+        if instance is None:
+            instance = _registry[namespace] = TwoTierCache(namespace, **options)
+        return instance
+
+
+def cache_stats() -> dict:
+    """
+    Stats of every namespace used by this process.
+    """
+    return {namespace: c.stats.as_dict() for namespace, c in _registry.items()}
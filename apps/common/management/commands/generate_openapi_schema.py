@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from mo.swagger import SCHEMA_FORMATS, generate_schema_files, schema_fingerprint
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema of the current code into OPENAPI_SCHEMA_DIR "
+        "and remove the schemas of previous versions."
+    )
+
+    def handle(self, *args, **options):
+        paths = generate_schema_files()
+        for path in paths:
+            self.stdout.write(f"Wrote {path}")
+
+        fingerprint = schema_fingerprint()
+        for schema_format in SCHEMA_FORMATS:
+            for path in Path(settings.OPENAPI_SCHEMA_DIR).glob(
+                f"openapi-*{schema_format}"
+            ):
+                if path.name != f"openapi-{fingerprint}{schema_format}":
+                    path.unlink(missing_ok=True)
+                    self.stdout.write(f"Removed {path}")
@@ -0,0 +1,25 @@
+from django.db.models import Manager, QuerySet
+from django.utils import timezone
+
+
+class ActiveQuerySet(QuerySet):
+    def active(self):
+        return self.filter(is_active=True)
+
+    def disable(self) -> int:
+        """
+        Bulk counterpart of BaseModel.disable(): deactivates every row of the
+        queryset in a single UPDATE (no save() or signals per row) and returns
+        the number of rows.
+        """
+        return self.update(is_active=False, updated_at=timezone.now())
+
+
+class ActiveManager(Manager.from_queryset(ActiveQuerySet)):
+    """
+    Only the live (``is_active``) rows. The API reads through it; ``objects``
+    keeps seeing every row (admin, uniqueness checks).
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True)
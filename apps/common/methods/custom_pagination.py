@@ -1,5 +1,6 @@
+from django.core.paginator import InvalidPage
 from rest_framework.exceptions import NotFound
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
 
@@ -16,6 +17,30 @@ class CustomPagination(PageNumberPagination):
             request.query_params["page"] = "last"
             return super().paginate_queryset(queryset, request, view)
 
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async paginate_queryset (async ORM count and page fetch), with the same
+        fallback to the last page for out of range page numbers.
+        """
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        if page_number in self.last_page_strings:
+            page_number = paginator.num_pages
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage:
+            self.page = paginator.page(paginator.num_pages)
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return [obj async for obj in self.page.object_list]
+
     def get_paginated_response(self, data):
         return Response(
             {
@@ -27,3 +52,20 @@ class CustomPagination(PageNumberPagination):
                 "results": data,
             }
         )
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset pagination on the primary key alone, newest first.
+
+    BaseModel ids are UUIDv7, so ``-id`` is creation order and each page is an
+    index range scan on the primary key, however deep the client pages. Rows
+    created before the switch keep their random v4 ids, which almost all
+    compare greater than today's v7 ids: they come out first, in arbitrary but
+    stable order, and paging still returns every row exactly once.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-id"
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimated_count(queryset) -> int:
+    """
+    Number of rows of ``queryset`` estimated by the query planner (EXPLAIN):
+    nothing is read, whatever the size of the table and the filters.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists of big tables: an exact COUNT(*) reads the
+    whole table (or every row matching the search), so above
+    ADMIN_EXACT_COUNT_LIMIT rows the planner's estimate is shown instead.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate < settings.ADMIN_EXACT_COUNT_LIMIT:
+            return super().count
+        return estimate
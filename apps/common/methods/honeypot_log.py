@@ -0,0 +1,227 @@
+"""
+Buffered logging of the admin honeypot's login attempts.
+
+The honeypot view only counts each attempt in a buffer, so answering a scanner
+never touches the database. Attempts are aggregated by (IP address, username,
+path, user agent, session key): repeated attempts add to one entry, and the
+buffer holds at most HONEYPOT_BUFFER_SIZE entries, attempts that would open a
+new entry beyond that are only counted as dropped. flush() writes one
+LoginAttempt row per entry with bulk_create (timestamped at the flush), logs
+the number of attempts per IP address and, unless ADMIN_HONEYPOT_EMAIL_ADMINS
+is False, mails the same summary to the ADMINS: one email per flush instead of
+one per attempt. When the insert fails, the drained attempts go back to this
+process' buffer and the next flush writes them.
+
+The buffer lives in Redis, shared by every worker and flushed by the
+flush_honeypot_attempts_task beat task. When REDIS_URL is not set, or Redis
+fails, attempts are buffered in this process' memory and a daemon thread
+flushes them every HONEYPOT_FLUSH_INTERVAL seconds.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+import redis
+from django.conf import settings
+from django.core.mail import mail_admins
+from django.db import connection
+from ipware import get_client_ip
+
+from apps.common.methods.redis_fallback import RedisFallback
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = "honeypot:attempts"
+DROPPED_KEY = "honeypot:dropped"
+
+# KEYS[1] buffer, KEYS[2] dropped counter; ARGV[1] attempt; ARGV[2] buffer size.
+ADD_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 1
+        or redis.call('HLEN', KEYS[1]) < tonumber(ARGV[2]) then
+    return redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+end
+redis.call('INCR', KEYS[2])
+return 0
+"""
+
+# Reads and empties the buffer in one step, so concurrent flushes never write
+# the same attempts twice.
+DRAIN_SCRIPT = """
+local attempts = redis.call('HGETALL', KEYS[1])
+local dropped = redis.call('GET', KEYS[2]) or '0'
+redis.call('DEL', KEYS[1], KEYS[2])
+return {attempts, dropped}
+"""
+
+
+def attempt_of(request) -> tuple:
+    """
+    Buffer key of a login attempt, truncated to what LoginAttempt can store.
+    """
+    ip_address, _ = get_client_ip(request)
+    session_key = request.session.session_key
+    return (
+        ip_address,
+        (request.POST.get("username") or "")[:255],
+        request.get_full_path(),
+        request.META.get("HTTP_USER_AGENT"),
+        session_key[:50] if session_key else None,
+    )
+
+
+class LocalAttemptBuffer:
+    def __init__(self):
+        self._attempts = Counter()
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def add(self, attempt: tuple, maxsize: int):
+        with self._lock:
+            if attempt in self._attempts or len(self._attempts) < maxsize:
+                self._attempts[attempt] += 1
+            else:
+                self._dropped += 1
+
+    def drain(self):
+        with self._lock:
+            attempts, self._attempts = self._attempts, Counter()
+            dropped, self._dropped = self._dropped, 0
+        return attempts, dropped
+
+    def restore(self, attempts: Counter, dropped: int):
+        """
+        Put drained attempts back (past the size limit) for the next flush.
+        """
+        with self._lock:
+            self._attempts.update(attempts)
+            self._dropped += dropped
+
+
+class RedisAttemptBuffer:
+    def __init__(self, client: redis.Redis):
+        self.client = client
+        self.add_script = self.client.register_script(ADD_SCRIPT)
+        self.drain_script = self.client.register_script(DRAIN_SCRIPT)
+
+    def add(self, attempt: tuple, maxsize: int):
+        self.add_script(
+            keys=[BUFFER_KEY, DROPPED_KEY], args=[json.dumps(attempt), maxsize]
+        )
+
+    def drain(self):
+        fields, dropped = self.drain_script(keys=[BUFFER_KEY, DROPPED_KEY])
+        attempts = Counter()
+        for attempt, count in zip(fields[::2], fields[1::2]):
+            attempts[tuple(json.loads(attempt))] += int(count)
+        return attempts, int(dropped)
+
+
+_local = LocalAttemptBuffer()
+_redis = RedisFallback("Honeypot log", "HONEYPOT_REDIS", RedisAttemptBuffer, logger)
+_flusher_pid = None
+
+
+def _flush_periodically(interval: int):
+    while True:
+        time.sleep(interval)
+        try:
+            flush()
+        except Exception:
+            logger.exception("Honeypot log flush failed")
+        finally:
+            connection.close()
+
+
+def _start_flusher():
+    """
+    Start the thread flushing this process' buffer, once per process (a forked
+    worker does not inherit its parent's thread).
+    """
+    global _flusher_pid
+
+    interval = settings.HONEYPOT_FLUSH_INTERVAL
+    if not interval or _flusher_pid == os.getpid():
+        return
+    _flusher_pid = os.getpid()
+    threading.Thread(
+        target=_flush_periodically, args=(interval,), name="honeypot-log", daemon=True
+    ).start()
+
+
+def record(request):
+    """
+    Count the login attempt of ``request`` in the buffer.
+    """
+    attempt = attempt_of(request)
+    maxsize = settings.HONEYPOT_BUFFER_SIZE
+    buffer = _redis.get()
+    if buffer is not None:
+        try:
+            buffer.add(attempt, maxsize)
+            return
+        except redis.RedisError as e:
+            _redis.failed(e)
+    _local.add(attempt, maxsize)
+    _start_flusher()
+
+
+def flush() -> int:
+    """
+    Write the buffered attempts (of Redis and of this process) as LoginAttempt
+    rows. Returns the number of rows created.
+    """
+    # admin_honeypot is not installed in the API entry point (mo.settings_api).
+    from admin_honeypot.models import LoginAttempt
+
+    attempts, dropped = _local.drain()
+    buffer = _redis.get()
+    if buffer is not None:
+        try:
+            remote_attempts, remote_dropped = buffer.drain()
+            attempts.update(remote_attempts)
+            dropped += remote_dropped
+        except redis.RedisError as e:
+            _redis.failed(e)
+
+    try:
+        LoginAttempt.objects.bulk_create(
+            LoginAttempt(
+                ip_address=ip_address,
+                username=username,
+                path=path,
+                user_agent=user_agent,
+                session_key=session_key,
+            )
+            for ip_address, username, path, user_agent, session_key in attempts
+        )
+    except Exception:
+        # Redis already forgot the drained attempts: keep them all in this
+        # process for the next flush.
+        _local.restore(attempts, dropped)
+        _start_flusher()
+        raise
+    per_ip = Counter()
+    for attempt, count in attempts.items():
+        per_ip[attempt[0]] += count
+    summary = [
+        f"{count} login attempts from {ip_address}"
+        for ip_address, count in per_ip.most_common()
+    ]
+    if dropped:
+        summary.append(f"{dropped} login attempts dropped, buffer full")
+    for line in summary:
+        logger.warning(f"Honeypot: {line}")
+    if summary and getattr(settings, "ADMIN_HONEYPOT_EMAIL_ADMINS", True):
+        total = sum(per_ip.values()) + dropped
+        try:
+            mail_admins(
+                subject=f"Honeypot: {total} login attempts",
+                message="\n".join(summary),
+            )
+        except Exception:
+            logger.exception("Honeypot summary email failed")
+    return len(attempts)
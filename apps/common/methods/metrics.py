@@ -0,0 +1,69 @@
+"""
+Prometheus metrics of the API and the Celery workers.
+
+Under gunicorn (see gunicorn.conf.py) and Celery's prefork pool every process
+records its own values in PROMETHEUS_MULTIPROC_DIR, and ``registry()`` sums
+those of all processes; without it, values live in the default registry of
+the single process.
+"""
+
+import os
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram
+from prometheus_client.multiprocess import MultiProcessCollector
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+TASK_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900)
+
+# API
+REQUEST_LATENCY = Histogram(
+    "mo_http_request_duration_seconds",
+    "Request latency per endpoint (viewset.action).",
+    ["endpoint", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "mo_http_request_db_queries",
+    "SQL queries run per request.",
+    ["endpoint"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+
+# Two-tier cache (hit ratio: hits over all lookups of a namespace)
+CACHE_LOOKUPS = Counter(
+    "mo_cache_lookups",
+    "TwoTierCache lookups per namespace and result (local_hit, remote_hit, miss).",
+    ["namespace", "result"],
+)
+
+# Payments
+PAYMENT_DISTRIBUTION_LOANS = Histogram(
+    "mo_payment_distribution_loans",
+    "Loans a completed payment is distributed across.",
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100),
+)
+
+# Celery
+TASK_DURATION = Histogram(
+    "mo_celery_task_duration_seconds",
+    "Celery task run time.",
+    ["task", "state"],
+    buckets=TASK_BUCKETS,
+)
+TASK_QUEUE_WAIT = Histogram(
+    "mo_celery_task_queue_wait_seconds",
+    "Time between publishing a Celery task and a worker starting it.",
+    ["task"],
+    buckets=TASK_BUCKETS,
+)
+
+
+def registry():
+    """
+    Registry to expose: the values of every process in multiprocess mode.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    collector_registry = CollectorRegistry()
+    MultiProcessCollector(collector_registry)
+    return collector_registry
@@ -0,0 +1,107 @@
+"""
+On-demand profiling of a request or a Celery task.
+
+Two profilers:
+  "sample"   a sampling profiler (a background thread records the profiled
+             thread's stack every PROFILING_SAMPLE_INTERVAL seconds): low
+             overhead, output in collapsed-stack format, ready for
+             flamegraph.pl, speedscope or inferno.
+  "cprofile" Python's deterministic profiler: exact call counts, much higher
+             overhead; a pstats file (snakeviz, flameprof, pstats).
+
+Only the thread that starts the profile is profiled: a gunicorn worker's
+request, or a task in a Celery worker (under ASGI, the event loop). Profiles
+are saved to the default storage under PROFILING_STORAGE_DIR.
+"""
+
+import cProfile
+import logging
+import marshal
+import sys
+import threading
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+
+
+class SamplingProfiler:
+    extension = "folded"
+
+    def __init__(self):
+        self.interval = settings.PROFILING_SAMPLE_INTERVAL
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+
+    def start(self):
+        self._thread_id = threading.get_ident()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+
+    def _sample(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> bytes:
+        self._stopped.set()
+        self._sampler.join()
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.items()
+        ).encode()
+
+
+class DeterministicProfiler:
+    extension = "prof"
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        self.profiler.enable()
+
+    def stop(self) -> bytes:
+        self.profiler.disable()
+        self.profiler.create_stats()
+        # What pstats.Stats.dump_stats writes.
+        return marshal.dumps(self.profiler.stats)
+
+
+PROFILERS = {
+    "sample": SamplingProfiler,
+    "cprofile": DeterministicProfiler,
+}
+
+
+def profile_path(profile_id: str, extension: str) -> str:
+    return f"{settings.PROFILING_STORAGE_DIR}/{profile_id}.{extension}"
+
+
+@contextmanager
+def profiled(mode: str, label: str):
+    """
+    Profile the block with the ``mode`` profiler; yields the profile ID. The
+    profile is saved even if the block raises.
+    """
+    profile_id = uuid.uuid4().hex
+    profiler = PROFILERS[mode]()
+    profiler.start()
+    try:
+        yield profile_id
+    finally:
+        data = profiler.stop()
+        path = default_storage.save(
+            profile_path(profile_id, profiler.extension), ContentFile(data)
+        )
+        logger.info(f"Profile {profile_id} of {label} saved to {path}")
@@ -0,0 +1,73 @@
+"""
+Redis access of the features that fall back to process memory when Redis is
+not configured or fails (throttle buckets, honeypot buffer, shared cache tier).
+
+Each feature keeps one RedisFallback. After a Redis error, failed() logs it and
+the feature skips Redis for ``<prefix>_RETRY`` seconds, instead of waiting for
+a timeout on every call:
+
+    _redis = RedisFallback("Token bucket", "API_KEY_THROTTLE_REDIS", RedisTokenBucket)
+    bucket = _redis.get()  # None: use the in-process buckets
+    try:
+        ...
+    except redis.RedisError as e:
+        _redis.failed(e)
+"""
+
+import logging
+import time
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RedisFallback:
+    """
+    ``name`` labels the messages, logged to ``log`` (the feature's logger).
+    The feature's settings are ``<prefix>_TIMEOUT`` (seconds to wait for Redis,
+    when ``factory`` builds a client) and ``<prefix>_RETRY`` (seconds to skip
+    Redis after an error). ``factory`` wraps a redis.Redis client of REDIS_URL,
+    built once per URL.
+    """
+
+    def __init__(self, name: str, prefix: str, factory=None, log=logger):
+        self.name = name
+        self.prefix = prefix
+        self.factory = factory
+        self.log = log
+        self.down_until = 0.0
+        self._backends = {}
+
+    @property
+    def retry(self) -> int:
+        return getattr(settings, f"{self.prefix}_RETRY")
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def get(self):
+        """
+        The factory's backend for REDIS_URL, or None when it is not set or
+        Redis failed less than ``<prefix>_RETRY`` seconds ago.
+        """
+        url = settings.REDIS_URL
+        if not url or not self.available:
+            return None
+        if url not in self._backends:
+            timeout = getattr(settings, f"{self.prefix}_TIMEOUT")
+            client = redis.Redis.from_url(
+                url, socket_timeout=timeout, socket_connect_timeout=timeout
+            )
+            self._backends[url] = self.factory(client)
+        return self._backends[url]
+
+    def failed(self, e: Exception):
+        # Stop hammering a failing Redis; retry after a short pause.
+        self.down_until = time.monotonic() + self.retry
+        self.log.error(f"{self.name} falling back to local memory: {e}")
+
+    def reset(self):
+        self.down_until = 0.0
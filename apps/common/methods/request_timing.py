@@ -0,0 +1,87 @@
+"""
+Timings of the request being instrumented by ServerTimingMiddleware.
+
+Code paths worth breaking down wrap themselves in ``timed(name)``; SQL queries
+are counted and timed by ``record_query``, an execute wrapper installed on every
+database connection (see apps.common.signals), which also hands queries slower
+than SLOW_QUERY_THRESHOLD to the slow query log. Outside a request, ``timed``
+costs a context variable lookup.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from apps.common.methods import slow_query_log
+
+
+class RequestTimings:
+    __slots__ = ("durations", "queries", "view_started")
+
+    def __init__(self):
+        self.durations = {}
+        self.queries = 0
+        self.view_started = None
+
+    def add(self, name: str, seconds: float):
+        self.durations[name] = self.durations.get(name, 0) + seconds
+
+
+_timings = ContextVar("request_timings", default=None)
+
+
+def current():
+    return _timings.get()
+
+
+@contextmanager
+def collect():
+    """
+    Collect the timings of everything run in the block, including threads it
+    hands work to through asgiref (they copy the context). Nested blocks share
+    the outermost collection.
+    """
+    timings = _timings.get()
+    if timings is not None:
+        yield timings
+        return
+
+    timings = RequestTimings()
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+@contextmanager
+def timed(name: str):
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+def record_query(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        timings = _timings.get()
+        if timings is not None:
+            timings.queries += 1
+            timings.add("db", duration)
+        threshold = settings.SLOW_QUERY_THRESHOLD
+        if threshold and duration >= threshold:
+            slow_query_log.record(
+                sql, params, many, duration, context["connection"].alias
+            )
@@ -0,0 +1,241 @@
+"""
+Slow query log.
+
+Every query is timed by the execute wrapper of request_timing; those slower
+than SLOW_QUERY_THRESHOLD are handed, once the surrounding transaction
+commits, to ``record_slow_query_task`` with the calling view/serializer method
+(e.g. ``PaymentCreateSerializer.validate``). The task groups occurrences by
+normalized statement in the SlowQuery table, captures the statement's
+``EXPLAIN`` plan, and evicts the least recently seen statements beyond
+SLOW_QUERY_LOG_SIZE.
+
+The request never runs the task itself: without Celery, occurrences are queued
+(at most QUEUE_SIZE) to a background thread of the process, and when the task
+cannot be published, or the queue is full, the occurrence is dropped.
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connections, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+NORMALIZERS = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),  # string literals
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),  # numbers
+    (re.compile(r"%s"), "?"),  # placeholders
+    (re.compile(r"\(\?(?:\s*,\s*\?)*\)"), "(...)"),  # IN lists of any length
+    (re.compile(r"\s+"), " "),
+)
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+OWN_FILES = ("request_timing.py", "slow_query_log.py")
+QUEUE_SIZE = 1000
+
+_recording = ContextVar("slow_query_recording", default=False)
+_queue = queue.Queue(maxsize=QUEUE_SIZE)
+_worker_pid = None
+
+
+def normalize(sql: str) -> str:
+    for pattern, replacement in NORMALIZERS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def fingerprint(value) -> str:
+    return hashlib.blake2b(str(value).encode(), digest_size=16).hexdigest()
+
+
+def caller() -> str:
+    """
+    ``Class.method`` (or ``module.function``) of the innermost project frame
+    that is not part of the instrumentation itself.
+    """
+    apps_dir = str(Path(settings.BASE_DIR) / "apps")
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(apps_dir) and not filename.endswith(OWN_FILES):
+            owner = frame.f_locals.get("self")
+            if owner is not None:
+                return f"{type(owner).__name__}.{frame.f_code.co_name}"
+            return f"{frame.f_globals.get('__name__')}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return ""
+
+
+def serializable(params):
+    """
+    Query parameters as JSON values (to reach the task); Postgres casts the
+    string forms back for EXPLAIN.
+    """
+    if params is None:
+        return None
+    return [
+        (
+            value
+            if value is None or isinstance(value, (bool, int, float, str))
+            else str(value)
+        )
+        for value in params
+    ]
+
+
+@contextmanager
+def recording():
+    """
+    The log's own queries are never logged.
+    """
+    token = _recording.set(True)
+    try:
+        yield
+    finally:
+        _recording.reset(token)
+
+
+def record(sql: str, params, many: bool, duration: float, alias: str):
+    """
+    Called by the execute wrapper for a query slower than the threshold.
+    """
+    if many or _recording.get():
+        return
+
+    occurrence = {
+        "sql": sql,
+        "params": serializable(params),
+        "duration": duration,
+        "caller": caller(),
+        "alias": alias,
+    }
+    transaction.on_commit(lambda: dispatch(occurrence), using=alias)
+
+
+def dispatch(occurrence: dict):
+    """
+    Publish ``record_slow_query_task`` or, without Celery, queue the
+    occurrence for this process' background thread. Never runs it inline.
+    """
+    from apps.common.tasks import record_slow_query_task
+
+    if settings.USE_CELERY:
+        try:
+            record_slow_query_task.apply_async(queue="default", kwargs=occurrence)
+        except Exception as e:
+            logger.error(f"Slow query dropped, queuing the task failed: {e}")
+        return
+
+    try:
+        _queue.put_nowait(occurrence)
+    except queue.Full:
+        logger.warning("Slow query dropped, the queue is full")
+        return
+    _start_worker()
+
+
+def _store_queued():
+    while True:
+        occurrence = _queue.get()
+        try:
+            store(**occurrence)
+        except Exception:
+            logger.exception("Slow query log failed")
+        finally:
+            connections.close_all()
+
+
+def _start_worker():
+    """
+    Start the thread storing this process' queue, once per process (a forked
+    worker does not inherit its parent's thread).
+    """
+    global _worker_pid
+
+    if _worker_pid == os.getpid():
+        return
+    _worker_pid = os.getpid()
+    threading.Thread(target=_store_queued, name="slow-query-log", daemon=True).start()
+
+
+def flush() -> int:
+    """
+    Store the queued occurrences in the calling thread. Returns how many.
+    """
+    stored = 0
+    while True:
+        try:
+            occurrence = _queue.get_nowait()
+        except queue.Empty:
+            return stored
+        store(**occurrence)
+        stored += 1
+
+
+def explain(sql: str, params, alias: str) -> str:
+    if not sql.lstrip().upper().startswith(EXPLAINABLE):
+        return ""
+    with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (ANALYZE off) {sql}", params)
+        return "\n".join(row[0] for row in cursor.fetchall())
+
+
+def store(sql: str, params, duration: float, caller: str, alias: str):
+    """
+    Add an occurrence to the log (runs in record_slow_query_task).
+    """
+    from apps.common.models.slow_query import SlowQuery
+
+    statement = normalize(sql)
+    key = fingerprint(statement)
+    now = timezone.now()
+    changes = {
+        "sql": sql,
+        "params_fingerprint": fingerprint(params),
+        "caller": caller[:255],
+        "last_seen": now,
+    }
+
+    with recording():
+        updated = SlowQuery.objects.filter(fingerprint=key).update(
+            calls=F("calls") + 1,
+            total_duration=F("total_duration") + duration,
+            max_duration=Greatest("max_duration", duration),
+            **changes,
+        )
+        if not updated:
+            try:
+                with transaction.atomic():
+                    SlowQuery.objects.create(
+                        fingerprint=key,
+                        statement=statement,
+                        database=alias,
+                        total_duration=duration,
+                        max_duration=duration,
+                        **changes,
+                    )
+            except IntegrityError:  # recorded meanwhile by another worker
+                return store(sql, params, duration, caller, alias)
+            stale = SlowQuery.objects.order_by("-last_seen").values_list("pk", flat=True)
+            SlowQuery.objects.filter(
+                pk__in=list(stale[settings.SLOW_QUERY_LOG_SIZE :])
+            ).delete()
+
+        if not SlowQuery.objects.filter(fingerprint=key).exclude(plan="").exists():
+            try:
+                plan = explain(sql, params, alias)
+            except DatabaseError as e:
+                logger.error(f"EXPLAIN of slow query {key} failed: {e}")
+                return
+            SlowQuery.objects.filter(fingerprint=key).update(plan=plan)
@@ -0,0 +1,64 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from apps.authentication.methods import token_bucket
+from apps.authentication.permissions.cached_has_api_key import CachedHasAPIKey
+from apps.common.methods import profiling
+
+
+class ProfilingMiddleware:
+    """
+    Profile a request on demand
+
+    A request with ``X-Profile: sample`` (or ``cprofile``, see
+    apps.common.methods.profiling) and a privileged API key, one whose prefix is
+    in PROFILING_API_KEY_PREFIXES, runs under that profiler; the ID of the
+    saved profile is returned in the ``X-Profile-Id`` header. Profiles are
+    rate limited per key (PROFILING_RATE); past the limit, and for any other
+    key, the header is ignored and the request served as usual.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        mode = self.profile_mode(request)
+        if mode is None:
+            return self.get_response(request)
+
+        with profiling.profiled(mode, f"{request.method} {request.path}") as profile_id:
+            response = self.get_response(request)
+        response["X-Profile-Id"] = profile_id
+        return response
+
+    async def __acall__(self, request):
+        mode = self.profile_mode(request)
+        if mode is None:
+            return await self.get_response(request)
+
+        with profiling.profiled(mode, f"{request.method} {request.path}") as profile_id:
+            response = await self.get_response(request)
+        response["X-Profile-Id"] = profile_id
+        return response
+
+    def profile_mode(self, request):
+        mode = request.headers.get("X-Profile")
+        if mode not in profiling.PROFILERS:
+            return None
+        if not CachedHasAPIKey().has_permission(request, view=None):
+            return None
+
+        prefix = request.api_key_id.partition(".")[0]
+        if prefix not in settings.PROFILING_API_KEY_PREFIXES:
+            return None
+        if token_bucket.take(f"profile:{prefix}", settings.PROFILING_RATE):
+            return None
+        return mode
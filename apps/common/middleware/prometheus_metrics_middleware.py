@@ -0,0 +1,62 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from apps.common.methods import request_timing
+from apps.common.methods.metrics import REQUEST_LATENCY, REQUEST_QUERIES
+
+
+def endpoint_name(request) -> str:
+    """
+    ``<View>.<action>`` of the view that served the request, e.g.
+    ``LoanViewSet.create``, ``CustomerViewSet.balance`` or
+    ``CachedSchemaView.get``; the URL name for plain Django views.
+    """
+    match = request.resolver_match
+    if match is None:
+        return "unresolved"
+    view_class = getattr(match.func, "cls", None)
+    if view_class is None:
+        return match.view_name or match._func_path
+    method = request.method.lower()
+    actions = getattr(match.func, "actions", None) or {}
+    return f"{view_class.__name__}.{actions.get(method, method)}"
+
+
+class PrometheusMetricsMiddleware:
+    """
+    Record the latency and the SQL query count of every request per endpoint
+    (see apps.common.methods.metrics), exposed at /metrics.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        started = time.perf_counter()
+        with request_timing.collect() as timings:
+            response = self.get_response(request)
+        self.observe(request, response, timings, started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with request_timing.collect() as timings:
+            response = await self.get_response(request)
+        self.observe(request, response, timings, started)
+        return response
+
+    def observe(self, request, response, timings, started):
+        endpoint = endpoint_name(request)
+        REQUEST_LATENCY.labels(endpoint, request.method, response.status_code).observe(
+            time.perf_counter() - started
+        )
+        REQUEST_QUERIES.labels(endpoint).observe(timings.queries)
@@ -0,0 +1,87 @@
+import json
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from apps.common.methods import request_timing
+
+logger = logging.getLogger(__name__)
+
+
+class ServerTimingMiddleware:
+    """
+    Break down the time of a sample of requests (SERVER_TIMING_SAMPLE_RATE)
+
+    Reports, in a ``Server-Timing`` header and a structured log line: the total
+    time, the view (everything after URL resolution), the SQL queries (count and
+    time), and the spans the code marks with request_timing.timed, such as the
+    API key check ("auth") and serializer validation ("validation").
+    Unsampled requests go straight through.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        with request_timing.collect() as timings:
+            response = self.get_response(request)
+        return self.report(request, response, timings, started)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        started = time.perf_counter()
+        with request_timing.collect() as timings:
+            response = await self.get_response(request)
+        return self.report(request, response, timings, started)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = request_timing.current()
+        if timings is not None:
+            timings.view_started = time.perf_counter()
+
+    def sampled(self) -> bool:
+        rate = settings.SERVER_TIMING_SAMPLE_RATE
+        return rate >= 1 or random.random() < rate
+
+    def report(self, request, response, timings, started):
+        finished = time.perf_counter()
+        durations = {"total": finished - started}
+        if timings.view_started is not None:
+            durations["view"] = finished - timings.view_started
+        durations.update(timings.durations)
+        durations.setdefault("db", 0)
+
+        response["Server-Timing"] = ", ".join(
+            f"{name};dur={seconds * 1e3:.2f}"
+            + (f';desc="{timings.queries} queries"' if name == "db" else "")
+            for name, seconds in durations.items()
+        )
+
+        entry = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": timings.queries,
+            **{
+                f"{name}_ms": round(seconds * 1e3, 2)
+                for name, seconds in durations.items()
+            },
+        }
+        logger.info(f"request_timing {json.dumps(entry)}", extra={"timing": entry})
+        return response
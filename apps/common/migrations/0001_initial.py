@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:18
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('fingerprint', models.CharField(max_length=32, unique=True)),
+                ('statement', models.TextField(help_text='Normalized SQL')),
+                ('sql', models.TextField(help_text='Last occurrence, with placeholders')),
+                ('params_fingerprint', models.CharField(blank=True, max_length=32)),
+                ('caller', models.CharField(blank=True, max_length=255)),
+                ('database', models.CharField(max_length=60)),
+                ('calls', models.PositiveIntegerField(default=1)),
+                ('total_duration', models.FloatField(help_text='Seconds')),
+                ('max_duration', models.FloatField(help_text='Seconds')),
+                ('last_seen', models.DateTimeField(db_index=True)),
+                ('plan', models.TextField(blank=True, help_text='EXPLAIN (ANALYZE off) of the last SQL')),
+            ],
+            options={
+                'verbose_name_plural': 'slow queries',
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import Http404
+
+
+class ArchiveFallbackViewMixin:
+    """
+    Mixin to look objects up in the archive tables when the hot tables miss
+
+    get_object_or_archived (or aget_object_or_archived under AsyncReadViewMixin)
+    first runs get_object on the viewset's queryset; on a 404 they look the
+    object up by the same lookup_field in ``archive_queryset``. Archived
+    objects are serialized with ``archive_serializer_class`` when set, or with
+    the usual serializer. Actions that modify the object keep using get_object,
+    so archived objects stay read-only.
+    """
+
+    archive_queryset = None
+    archive_serializer_class = None
+    archived = False
+
+    def get_archive_queryset(self):
+        return self.archive_queryset.all()
+
+    def get_serializer(self, *args, **kwargs):
+        if self.archived and self.archive_serializer_class is not None:
+            kwargs.setdefault("context", self.get_serializer_context())
+            return self.archive_serializer_class(*args, **kwargs)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_archive_lookup(self) -> dict:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+
+    def archived_object(self, obj):
+        self.archived = True
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def get_object_or_archived(self):
+        try:
+            return self.get_object()
+        except Http404:
+            queryset = self.get_archive_queryset()
+            try:
+                obj = queryset.get(**self.get_archive_lookup())
+            except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+                raise Http404(
+                    f"No {queryset.model._meta.object_name} matches the given query."
+                )
+        return self.archived_object(obj)
+
+    async def aget_object_or_archived(self):
+        try:
+            return await self.aget_object()
+        except Http404:
+            queryset = self.get_archive_queryset()
+            try:
+                obj = await queryset.aget(**self.get_archive_lookup())
+            except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+                raise Http404(
+                    f"No {queryset.model._meta.object_name} matches the given query."
+                )
+        return self.archived_object(obj)
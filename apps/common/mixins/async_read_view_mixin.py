@@ -0,0 +1,76 @@
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import Http404, HttpResponse
+
+from mo.db_router import replica_reads
+
+
+class AsyncReadViewMixin:
+    """
+    Mixin to serve the read actions of a viewset natively under ASGI
+
+    Subclass a sync viewset and override its read actions with ``async def``
+    versions using the async ORM API (see AsyncReadRouter). The rest of the
+    request keeps DRF's behaviour: authentication, API key permission and
+    throttling run as usual (in a worker thread, they are sync), errors go
+    through handle_exception, and reads are served by the read replicas.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            with replica_reads():
+                await sync_to_async(self.initial)(request, *args, **kwargs)
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+                response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.render(self.response)
+
+    def render(self, response):
+        """
+        Render here rather than letting Django render the TemplateResponse in a
+        worker thread.
+        """
+        response.render()
+        rendered = HttpResponse(
+            response.content,
+            status=response.status_code,
+            content_type=response["Content-Type"],
+        )
+        for header, value in response.items():
+            rendered[header] = value
+        return rendered
+
+    async def aget_object(self):
+        """
+        Async get_object: 404 when the lookup matches nothing or is invalid.
+        Object permissions are sync; they must not hit the database.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404(
+                f"No {queryset.model._meta.object_name} matches the given query."
+            )
+
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
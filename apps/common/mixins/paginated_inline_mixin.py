@@ -0,0 +1,27 @@
+from django.core.paginator import Paginator
+
+
+class PaginatedInlineMixin:
+    """
+    Mixin for an InlineModelAdmin with many rows per parent object
+
+    The change form loads ``per_page`` of the rows, the page chosen by the
+    ``<prefix>-page`` query parameter, instead of all of them. The form posts
+    back to the same URL, so the page saved is the page shown.
+    """
+
+    per_page = 20
+    template = "admin/edit_inline/paginated_tabular.html"
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        per_page = self.per_page
+
+        class PaginatedFormSet(formset):
+            def get_queryset(self):
+                if not hasattr(self, "page"):
+                    paginator = Paginator(super().get_queryset(), per_page)
+                    self.page = paginator.get_page(request.GET.get(f"{self.prefix}-page"))
+                return self.page.object_list
+
+        return PaginatedFormSet
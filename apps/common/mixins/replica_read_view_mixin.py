@@ -0,0 +1,21 @@
+from mo.db_router import replica_reads
+
+
+class ReplicaReadViewMixin:
+    """
+    Mixin to serve the read actions of a viewset from the read replicas
+
+    Only the actions listed in ``replica_read_actions`` are routed; once a
+    request writes, its remaining reads go back to the primary (see
+    mo.db_router.ReadReplicaRouter).
+    """
+
+    replica_read_actions = {"list", "retrieve", "balance"}
+
+    def dispatch(self, request, *args, **kwargs):
+        action = self.action_map.get(request.method.lower())
+        if action not in self.replica_read_actions:
+            return super().dispatch(request, *args, **kwargs)
+
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
@@ -1,14 +1,18 @@
-import uuid
-
 from django.db.models import BooleanField, DateTimeField, Model, UUIDField
 
+from apps.common.managers.active_manager import ActiveManager, ActiveQuerySet
+from apps.common.methods.uuid7 import uuid7
+
 
 class BaseModel(Model):
-    id = UUIDField(primary_key=True, editable=False, unique=True, default=uuid.uuid4)
+    id = UUIDField(primary_key=True, editable=False, unique=True, default=uuid7)
     is_active = BooleanField(default=True)
     created_at = DateTimeField(auto_now_add=True)
     updated_at = DateTimeField(auto_now=True)
 
+    objects = ActiveQuerySet.as_manager()
+    active_objects = ActiveManager()
+
     SAVE_DELETED_DATA_TO_FILE = False
 
     class Meta:
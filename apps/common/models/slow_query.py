@@ -0,0 +1,39 @@
+from django.db.models import (
+    CharField,
+    DateTimeField,
+    FloatField,
+    PositiveIntegerField,
+    TextField,
+)
+
+from apps.common.models.base_model import BaseModel
+
+
+class SlowQuery(BaseModel):
+    """
+    One row per normalized statement that ran slower than SLOW_QUERY_THRESHOLD
+    (see apps.common.methods.slow_query_log); the table keeps the
+    SLOW_QUERY_LOG_SIZE most recently seen statements.
+    """
+
+    fingerprint = CharField(max_length=32, unique=True)
+    statement = TextField(help_text="Normalized SQL")
+    sql = TextField(help_text="Last occurrence, with placeholders")
+    params_fingerprint = CharField(max_length=32, blank=True)
+    caller = CharField(max_length=255, blank=True)
+    database = CharField(max_length=60)
+    calls = PositiveIntegerField(default=1)
+    total_duration = FloatField(help_text="Seconds")
+    max_duration = FloatField(help_text="Seconds")
+    last_seen = DateTimeField(db_index=True)
+    plan = TextField(blank=True, help_text="EXPLAIN (ANALYZE off) of the last SQL")
+
+    class Meta:
+        verbose_name_plural = "slow queries"
+
+    def __str__(self):
+        return f"{self.caller or 'SQL'} – {self.statement[:80]}"
+
+    @property
+    def mean_duration(self):
+        return self.total_duration / self.calls
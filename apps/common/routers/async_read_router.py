@@ -0,0 +1,61 @@
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from rest_framework.routers import DefaultRouter
+
+
+def async_read_view(view, async_viewset):
+    """
+    Wrap the view of one route so the methods mapped to async actions of
+    ``async_viewset`` are served by it and every other method by ``view``.
+    """
+    async_actions = {
+        method: action
+        for method, action in view.actions.items()
+        if iscoroutinefunction(getattr(async_viewset, action, None))
+    }
+    if not async_actions:
+        return view
+
+    async_view = async_viewset.as_view(async_actions, **view.initkwargs)
+    sync_view = sync_to_async(view)
+
+    async def read_view(request, *args, **kwargs):
+        if request.method.lower() in async_actions:
+            return await async_view(request, *args, **kwargs)
+        return await sync_view(request, *args, **kwargs)
+
+    # Keep what DRF and drf-yasg read from the view (schema stays the sync one).
+    read_view.cls = view.cls
+    read_view.initkwargs = view.initkwargs
+    read_view.actions = view.actions
+    read_view.csrf_exempt = True
+    return read_view
+
+
+class AsyncReadRouter(DefaultRouter):
+    """
+    DefaultRouter that, when ASYNC_READ_ENDPOINTS is set (mo/asgi.py sets it),
+    serves the read actions of a viewset from its async version:
+
+        router.register(r"customers", CustomerViewSet, async_viewset=AsyncCustomerViewSet)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.async_viewsets = {}
+
+    def register(self, prefix, viewset, basename=None, async_viewset=None):
+        super().register(prefix, viewset, basename)
+        if async_viewset is not None:
+            self.async_viewsets[viewset] = async_viewset
+
+    def get_urls(self):
+        urls = super().get_urls()
+        if not settings.ASYNC_READ_ENDPOINTS:
+            return urls
+
+        for url in urls:
+            async_viewset = self.async_viewsets.get(getattr(url.callback, "cls", None))
+            if async_viewset is not None:
+                url.callback = async_read_view(url.callback, async_viewset)
+        return urls
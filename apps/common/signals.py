@@ -0,0 +1,66 @@
+import time
+
+from celery.signals import before_task_publish, task_postrun, task_prerun, worker_init
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from prometheus_client import start_http_server
+
+from apps.common.methods import metrics
+from apps.common.methods.request_timing import record_query
+from apps.common.tasks import request_header
+
+
+@receiver(connection_created)
+def install_query_timing(sender, connection, **kwargs):
+    """
+    Time the queries of every connection (Server-Timing, metrics, slow query
+    log). Connections belong to a thread, and under ASGI a request's queries
+    run in worker threads, so the wrapper is installed for good rather than per
+    request.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# Celery metrics
+
+_task_started = {}
+
+
+@before_task_publish.connect
+def stamp_published_at(headers=None, **kwargs):
+    """
+    Wall-clock publish time, for the queue wait measured by the worker (hosts'
+    clocks are assumed to be in sync).
+    """
+    headers["published_at"] = time.time()
+
+
+@task_prerun.connect
+def start_task_timer(task_id=None, task=None, **kwargs):
+    published_at = request_header(task.request, "published_at")
+    if published_at is not None:
+        metrics.TASK_QUEUE_WAIT.labels(task.name).observe(
+            max(time.time() - published_at, 0)
+        )
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def stop_task_timer(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        metrics.TASK_DURATION.labels(task.name, state).observe(
+            time.perf_counter() - started
+        )
+
+
+@worker_init.connect
+def start_worker_metrics_server(**kwargs):
+    """
+    Expose the metrics of the worker (all its pool processes) on
+    CELERY_METRICS_PORT.
+    """
+    if settings.CELERY_METRICS_PORT:
+        start_http_server(settings.CELERY_METRICS_PORT, registry=metrics.registry())
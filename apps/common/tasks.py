@@ -0,0 +1,64 @@
+from celery import Task
+
+from apps.common.methods import honeypot_log, profiling, slow_query_log
+from mo.celery import celery_app
+
+PROFILE_KWARG = "_profile"
+
+
+def request_header(request, name: str):
+    """
+    Custom message header of a task request: an attribute of the request when
+    received from the broker, in ``request.headers`` when run by apply().
+    """
+    return request.get(name) or (request.headers or {}).get(name)
+
+
+class ProfiledTask(Task):
+    """
+    Base class of every task (see mo.celery): passing ``_profile="sample"`` (or
+    ``"cprofile"``) in the kwargs of a call runs it under that profiler and
+    logs the ID of the saved profile:
+
+        import_customers_task.delay(raw_content, _profile="sample")
+
+    The mode travels as a message header, so the task's own signature and
+    argument checks are unaffected.
+    """
+
+    def apply_async(self, args=None, kwargs=None, **options):
+        if kwargs and PROFILE_KWARG in kwargs:
+            kwargs = dict(kwargs)
+            options["headers"] = {
+                **(options.get("headers") or {}),
+                PROFILE_KWARG: kwargs.pop(PROFILE_KWARG),
+            }
+        return super().apply_async(args, kwargs, **options)
+
+    def __call__(self, *args, **kwargs):
+        mode = kwargs.pop(PROFILE_KWARG, None) or request_header(
+            self.request, PROFILE_KWARG
+        )
+        if mode not in profiling.PROFILERS:
+            return super().__call__(*args, **kwargs)
+
+        with profiling.profiled(mode, f"task {self.name}[{self.request.id}]"):
+            return super().__call__(*args, **kwargs)
+
+
+@celery_app.task(name="record_slow_query_task")
+def record_slow_query_task(sql, params, duration, caller, alias):
+    """
+    Add a slow query to the log and capture its plan (see
+    apps.common.methods.slow_query_log).
+    """
+    slow_query_log.store(sql, params, duration, caller, alias)
+
+
+@celery_app.task(name="flush_honeypot_attempts_task")
+def flush_honeypot_attempts_task():
+    """
+    Write the buffered honeypot login attempts (see
+    apps.common.methods.honeypot_log).
+    """
+    return honeypot_log.flush()
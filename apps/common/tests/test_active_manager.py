@@ -0,0 +1,63 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_api_key.models import APIKey
+
+from apps.customers.models.customers import Customer
+from apps.loans.choices.loan_status import LoanStatus
+from apps.loans.models.loans import Loan
+
+
+class ActiveManagerTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        _, api_key = APIKey.objects.create_key(name="test")
+        self.auth = {"HTTP_X_API_KEY": api_key}
+        self.customer = Customer.objects.create(external_id="cust_live", score=1000)
+        self.loans = [
+            Loan.objects.create(
+                external_id=f"loan_live_{index}",
+                customer=self.customer,
+                amount=100,
+                outstanding=100,
+                status=LoanStatus.ACTIVE,
+                maximum_payment_date="2025-05-01T00:00:00Z",
+            )
+            for index in range(3)
+        ]
+
+    def test_bulk_disable_is_one_update(self):
+        before = Loan.objects.get(pk=self.loans[0].pk).updated_at
+        with self.assertNumQueries(1):
+            disabled = Loan.objects.filter(external_id__in=["loan_live_0", "loan_live_1"])
+            self.assertEqual(disabled.disable(), 2)
+
+        self.assertEqual(Loan.objects.count(), 3)
+        self.assertEqual(list(Loan.active_objects.all()), [self.loans[2]])
+        self.assertGreater(Loan.objects.get(pk=self.loans[0].pk).updated_at, before)
+
+    def test_api_only_sees_live_rows(self):
+        self.loans[0].disable()
+        resp = self.client.get("/customers/cust_live/balance/", **self.auth)
+        self.assertEqual(resp.data["total_debt"], "200.00")
+
+        resp = self.client.get("/loans/?customer_external_id=cust_live", **self.auth)
+        self.assertEqual(resp.data["count"], 2)
+        resp = self.client.get("/loans/loan_live_0/", **self.auth)
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+        Customer.objects.filter(pk=self.customer.pk).disable()
+        resp = self.client.get("/customers/cust_live/", **self.auth)
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        resp = self.client.post(
+            "/payments/",
+            {
+                "external_id": "pay_live",
+                "customer_external_id": "cust_live",
+                "total_amount": "10.00",
+            },
+            format="json",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,152 @@
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.test import override_settings
+from django.urls import include, path
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_api_key.models import APIKey
+
+from apps.common.routers.async_read_router import AsyncReadRouter
+from apps.customers.choices.customer_status import CustomerStatus
+from apps.customers.models.customers import Customer
+from apps.customers.views.async_customer_view import AsyncCustomerViewSet
+from apps.customers.views.customer_view import CustomerViewSet
+from apps.loans.choices.loan_status import LoanStatus
+from apps.loans.models.loans import Loan
+from apps.loans.views.async_loan_view import AsyncLoanViewSet
+from apps.loans.views.loan_view import LoanViewSet
+from apps.payments.methods.archive import archive_closed_records
+from apps.payments.views.async_payments_view import AsyncPaymentViewSet
+from apps.payments.views.payments_view import PaymentViewSet
+
+router = AsyncReadRouter()
+router.register(
+    r"customers", CustomerViewSet, basename="customer", async_viewset=AsyncCustomerViewSet
+)
+router.register(r"loans", LoanViewSet, basename="loan", async_viewset=AsyncLoanViewSet)
+router.register(
+    r"payments", PaymentViewSet, basename="payment", async_viewset=AsyncPaymentViewSet
+)
+
+with override_settings(ASYNC_READ_ENDPOINTS=True):
+    urlpatterns = [path("", include(router.urls))]
+
+
+class AsyncReadViewsTests(APITestCase):
+    """
+    The async read actions (served under ASGI) answer exactly like the sync ones.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        _, self.api_key = APIKey.objects.create_key(name="test")
+        self.auth = {"HTTP_X_API_KEY": self.api_key}
+
+        self.customer = Customer.objects.create(
+            external_id="cust_async", score=1000, status=CustomerStatus.ACTIVE
+        )
+        for index, amount in enumerate((600, 400)):
+            Loan.objects.create(
+                external_id=f"loan_async_{index}",
+                customer=self.customer,
+                amount=amount,
+                outstanding=amount,
+                status=LoanStatus.ACTIVE,
+                taken_at=f"2025-04-0{index + 1}T00:00:00Z",
+                maximum_payment_date=f"2025-05-0{index + 1}T00:00:00Z",
+            )
+        resp = self.client.post(
+            "/payments/",
+            {
+                "external_id": "pay_async",
+                "customer_external_id": "cust_async",
+                "total_amount": "700.00",
+            },
+            format="json",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+    async def sync_get(self, url):
+        return await sync_to_async(self.client.get)(url, **self.auth)
+
+    async def async_get(self, url, **headers):
+        with self.settings(ROOT_URLCONF=__name__):
+            return await self.async_client.get(
+                url, headers={"x-api-key": self.api_key, **headers}
+            )
+
+    async def test_read_endpoints_match_sync_views(self):
+        urls = (
+            "/customers/",
+            "/customers/cust_async/",
+            "/customers/cust_async/balance/",
+            "/loans/?customer_external_id=cust_async",
+            "/loans/loan_async_1/",
+            "/payments/?customer_external_id=cust_async",
+            "/payments/pay_async/",
+            "/payments/?page=99",
+            "/customers/missing/",
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                expected = await self.sync_get(url)
+                resp = await self.async_get(url)
+                self.assertEqual(resp.status_code, expected.status_code)
+                self.assertEqual(resp.json(), expected.json())
+
+    async def test_archived_records_match_sync_views(self):
+        await sync_to_async(self.client.post)(
+            "/payments/",
+            {
+                "external_id": "pay_async_rest",
+                "customer_external_id": "cust_async",
+                "total_amount": "300.00",
+            },
+            format="json",
+            **self.auth,
+        )
+        moved = await sync_to_async(archive_closed_records)(retention_days=-1)
+        self.assertEqual(moved["loans"], 2)
+
+        for url in ("/loans/loan_async_0/", "/payments/pay_async/", "/payments/missing/"):
+            with self.subTest(url=url):
+                expected = await self.sync_get(url)
+                resp = await self.async_get(url)
+                self.assertEqual(resp.status_code, expected.status_code)
+                self.assertEqual(resp.json(), expected.json())
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_requires_api_key(self):
+        with self.settings(ROOT_URLCONF=__name__):
+            resp = await self.async_client.get("/customers/")
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    async def test_writes_keep_using_sync_views(self):
+        with self.settings(ROOT_URLCONF=__name__):
+            resp = await self.async_client.post(
+                "/customers/",
+                {"external_id": "cust_async_2", "score": "10.00"},
+                content_type="application/json",
+                headers={"x-api-key": self.api_key},
+            )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(
+            await Customer.objects.filter(external_id="cust_async_2").aexists()
+        )
+
+    def test_router_only_wraps_routes_when_enabled(self):
+        callbacks = {url.name: url.callback for url in urlpatterns[0].url_patterns}
+        self.assertTrue(iscoroutinefunction(callbacks["customer-list"]))
+        self.assertTrue(iscoroutinefunction(callbacks["customer-balance"]))
+        self.assertFalse(iscoroutinefunction(callbacks["customer-upload"]))
+        self.assertIs(callbacks["customer-list"].cls, CustomerViewSet)
+
+        with override_settings(ASYNC_READ_ENDPOINTS=False):
+            sync_router = AsyncReadRouter()
+            sync_router.register(
+                r"customers", CustomerViewSet, async_viewset=AsyncCustomerViewSet
+            )
+            self.assertFalse(
+                any(iscoroutinefunction(url.callback) for url in sync_router.urls)
+            )
@@ -0,0 +1,67 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.viewsets import ViewSet
+
+from apps.common.mixins.replica_read_view_mixin import ReplicaReadViewMixin
+from apps.customers.models.customers import Customer
+from mo import db_router
+from mo.db_router import ReadReplicaRouter, replica_reads
+
+
+@override_settings(
+    DATABASE_REPLICAS=["replica_1", "replica_2"], DATABASE_REPLICA_MAX_LAG=5
+)
+class ReadReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReadReplicaRouter()
+        lag = mock.patch.object(db_router, "replica_lag", return_value=0.0)
+        self.replica_lag = lag.start()
+        self.addCleanup(lag.stop)
+
+    def test_reads_outside_replica_block_use_primary(self):
+        self.assertEqual(self.router.db_for_read(Customer), "default")
+
+    def test_reads_round_robin_over_replicas(self):
+        with replica_reads():
+            aliases = {self.router.db_for_read(Customer) for _ in range(4)}
+        self.assertEqual(aliases, {"replica_1", "replica_2"})
+
+    def test_reads_after_a_write_use_primary(self):
+        with replica_reads():
+            self.assertEqual(self.router.db_for_write(Customer), "default")
+            self.assertEqual(self.router.db_for_read(Customer), "default")
+
+        with replica_reads():
+            self.assertNotEqual(self.router.db_for_read(Customer), "default")
+
+    def test_lagging_replicas_are_skipped(self):
+        self.replica_lag.side_effect = lambda alias: 30.0 if alias == "replica_1" else 0.0
+        with replica_reads():
+            aliases = {self.router.db_for_read(Customer) for _ in range(4)}
+        self.assertEqual(aliases, {"replica_2"})
+
+        self.replica_lag.side_effect = None
+        self.replica_lag.return_value = float("inf")
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Customer), "default")
+
+    def test_only_primary_is_migrated(self):
+        self.assertTrue(self.router.allow_migrate("default", "customers"))
+        self.assertFalse(self.router.allow_migrate("replica_1", "customers"))
+
+    def test_mixin_routes_only_read_actions(self):
+        router = self.router
+
+        class ProbeViewSet(ReplicaReadViewMixin, ViewSet):
+            def list(self, request):
+                return Response({"db": router.db_for_read(Customer)})
+
+            create = list
+
+        view = ProbeViewSet.as_view({"get": "list", "post": "create"})
+        factory = APIRequestFactory()
+        self.assertNotEqual(view(factory.get("/")).data["db"], "default")
+        self.assertEqual(view(factory.post("/")).data["db"], "default")
@@ -0,0 +1,54 @@
+import tempfile
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework_api_key.models import APIKey
+
+from apps.customers.models.customers import Customer
+from mo import settings_api
+from mo.swagger import load_schema
+
+
+class EntryPointsTests(TestCase):
+    """
+    The API-only and admin entry points each serve their half of mo.urls.
+    """
+
+    def test_api_urlconf_has_no_admin_or_docs(self):
+        self.assertEqual(resolve("/customers/", "mo.api_urls").url_name, "customer-list")
+        for url in (f"/{settings.ADMIN_URL}/", "/swagger/", "/swagger.json"):
+            with self.subTest(url=url), self.assertRaises(Resolver404):
+                resolve(url, "mo.api_urls")
+
+    def test_admin_urlconf_has_no_api(self):
+        resolve(f"/{settings.ADMIN_URL}/", "mo.admin_urls")
+        resolve("/swagger.json", "mo.admin_urls")
+        with self.assertRaises(Resolver404):
+            resolve("/customers/", "mo.admin_urls")
+
+    @override_settings(
+        ROOT_URLCONF=settings_api.ROOT_URLCONF,
+        MIDDLEWARE=settings_api.MIDDLEWARE,
+    )
+    def test_api_entry_point_serves_json(self):
+        _, api_key = APIKey.objects.create_key(name="test")
+        Customer.objects.create(external_id="cust_lean", score=100)
+
+        resp = self.client.get("/customers/cust_lean/", HTTP_X_API_KEY=api_key)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["external_id"], "cust_lean")
+
+        resp = self.client.get("/customers/")
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(ROOT_URLCONF="mo.admin_urls")
+    def test_admin_entry_point_documents_the_api(self):
+        with tempfile.TemporaryDirectory() as schema_dir:
+            load_schema.cache_clear()
+            self.addCleanup(load_schema.cache_clear)
+            with self.settings(OPENAPI_SCHEMA_DIR=schema_dir):
+                resp = self.client.get("/swagger.json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIn("/customers/", resp.json()["paths"])
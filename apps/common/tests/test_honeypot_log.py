@@ -0,0 +1,118 @@
+from unittest import mock
+
+from admin_honeypot.models import LoginAttempt
+from django.conf import settings
+from django.core import mail
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+
+from apps.common.methods import honeypot_log
+from apps.common.tasks import flush_honeypot_attempts_task
+
+
+@override_settings(REDIS_URL="", HONEYPOT_FLUSH_INTERVAL=0)
+class HoneypotLogTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        honeypot_log._local.drain()
+        self.url = f"/{settings.ADMIN_HONEYPOT_URL}/login/"
+
+    def attempt(self, username, ip="203.0.113.7"):
+        return self.client.post(
+            self.url,
+            {"username": username, "password": "hunter2"},
+            REMOTE_ADDR=ip,
+            HTTP_USER_AGENT="scanner",
+        )
+
+    def test_attempt_is_answered_without_touching_the_database(self):
+        with self.assertNumQueries(0):
+            resp = self.attempt("admin")
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "errornote")
+        self.assertFalse(LoginAttempt.objects.exists())
+
+    def test_flush_aggregates_repeated_attempts(self):
+        for _ in range(3):
+            self.attempt("admin")
+        self.attempt("root")
+        self.attempt("admin", ip="198.51.100.1")
+
+        with self.assertLogs(honeypot_log.logger, "WARNING") as logs:
+            self.assertEqual(flush_honeypot_attempts_task.apply().get(), 3)
+        self.assertIn("4 login attempts from 203.0.113.7", logs.output[0])
+        self.assertCountEqual(
+            LoginAttempt.objects.values_list("ip_address", "username", "user_agent"),
+            [
+                ("203.0.113.7", "admin", "scanner"),
+                ("203.0.113.7", "root", "scanner"),
+                ("198.51.100.1", "admin", "scanner"),
+            ],
+        )
+        self.assertEqual(honeypot_log.flush(), 0)
+
+    @override_settings(ADMINS=[("Security", "security@example.com")])
+    def test_flush_mails_one_summary(self):
+        for _ in range(3):
+            self.attempt("admin")
+        self.attempt("root", ip="198.51.100.1")
+        with self.assertLogs(honeypot_log.logger, "WARNING"):
+            honeypot_log.flush()
+        (email,) = mail.outbox
+        self.assertIn("4 login attempts", email.subject)
+        self.assertEqual(
+            email.body.splitlines(),
+            [
+                "3 login attempts from 203.0.113.7",
+                "1 login attempts from 198.51.100.1",
+            ],
+        )
+        honeypot_log.flush()
+        self.assertEqual(len(mail.outbox), 1)
+        with self.settings(ADMIN_HONEYPOT_EMAIL_ADMINS=False):
+            self.attempt("admin")
+            with self.assertLogs(honeypot_log.logger, "WARNING"):
+                honeypot_log.flush()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_attempts_survive_a_failed_flush(self):
+        self.attempt("admin")
+        self.attempt("admin")
+        with (
+            mock.patch.object(
+                LoginAttempt.objects, "bulk_create", side_effect=DatabaseError("down")
+            ),
+            self.assertRaises(DatabaseError),
+        ):
+            honeypot_log.flush()
+        self.assertFalse(LoginAttempt.objects.exists())
+
+        with self.assertLogs(honeypot_log.logger, "WARNING") as logs:
+            self.assertEqual(honeypot_log.flush(), 1)
+        self.assertIn("2 login attempts from 203.0.113.7", logs.output[0])
+        self.assertEqual(LoginAttempt.objects.get().username, "admin")
+
+    @override_settings(
+        REDIS_URL="redis://127.0.0.1:1/0",
+        HONEYPOT_REDIS_TIMEOUT=0.1,
+        HONEYPOT_REDIS_RETRY=60,
+    )
+    def test_failing_redis_falls_back_to_process_memory(self):
+        self.addCleanup(honeypot_log._redis.reset)
+        with self.assertLogs(honeypot_log.logger, "ERROR") as logs:
+            self.attempt("admin")
+        self.assertIn("Honeypot log falling back to local memory", logs.output[0])
+        self.assertIsNone(honeypot_log._redis.get())
+        with self.assertLogs(honeypot_log.logger, "WARNING"):
+            self.assertEqual(honeypot_log.flush(), 1)
+
+    def test_buffer_is_capped(self):
+        with self.settings(HONEYPOT_BUFFER_SIZE=1):
+            self.attempt("admin")
+            self.attempt("root")
+            self.attempt("admin")
+        with self.assertLogs(honeypot_log.logger, "WARNING") as logs:
+            self.assertEqual(honeypot_log.flush(), 1)
+        self.assertIn("2 login attempts from 203.0.113.7", logs.output[0])
+        self.assertIn("1 login attempts dropped", logs.output[1])
+        self.assertEqual(LoginAttempt.objects.get().username, "admin")
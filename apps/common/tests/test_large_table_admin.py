@@ -0,0 +1,176 @@
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.common.methods.estimated_count_paginator import (
+    EstimatedCountPaginator,
+    estimated_count,
+)
+from apps.customers.models.customers import Customer
+from apps.loans.choices.loan_status import LoanStatus
+from apps.loans.models.loans import Loan
+from apps.payments.models.payment import Payment
+from apps.payments.models.payment_detail import PaymentDetail
+from apps.users.models.user import User
+
+
+class LargeTableAdminTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        admin = User.objects.create_superuser("admin@example.com", "password")
+        self.client.force_login(admin)
+        customers = [
+            Customer.objects.create(external_id=f"cust_admin_{name}", score=1000)
+            for name in ("ana", "bob")
+        ]
+        for customer in customers:
+            Loan.objects.create(
+                external_id=f"loan_of_{customer.external_id}",
+                customer=customer,
+                amount=100,
+                outstanding=100,
+                status=LoanStatus.ACTIVE,
+                maximum_payment_date="2025-05-01T00:00:00Z",
+            )
+        self.payments = [
+            Payment.objects.create(
+                external_id=external_id, customer=customer, total_amount=10
+            )
+            for external_id, customer in (
+                ("pay_bob_refund", customers[0]),
+                ("pay_001", customers[1]),
+                ("pay_002", customers[1]),
+            )
+        ]
+
+    def admin_url(self, model, *path):
+        opts = model._meta
+        return "/".join(
+            (f"/{settings.ADMIN_URL}", opts.app_label, opts.model_name, *path, "")
+        )
+
+    def changelist(self, model, **params):
+        resp = self.client.get(self.admin_url(model), params)
+        self.assertEqual(resp.status_code, 200)
+        return resp.context["cl"]
+
+    def test_search_unions_the_search_fields(self):
+        cl = self.changelist(Payment, q="BOB")
+        self.assertEqual(cl.result_count, 3)
+        cl = self.changelist(Payment, q="bob 002")
+        self.assertEqual(list(cl.result_list), [self.payments[2]])
+        cl = self.changelist(Customer, q="ana")
+        self.assertEqual([c.external_id for c in cl.result_list], ["cust_admin_ana"])
+        self.assertEqual(self.changelist(Loan, q="missing").result_count, 0)
+
+    def test_changelist_is_newest_first(self):
+        cl = self.changelist(Payment)
+        self.assertEqual(list(cl.result_list), self.payments[::-1])
+        self.assertIsNone(cl.full_result_count)
+
+    def test_changelist_shows_inactive_rows(self):
+        self.payments[1].disable()
+        cl = self.changelist(Payment)
+        self.assertEqual(list(cl.result_list), self.payments[::-1])
+
+    def test_foreign_key_filter_autocompletes(self):
+        customer = Customer.objects.get(external_id="cust_admin_bob")
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(self.admin_url(Loan))
+        self.assertContains(resp, 'class="autocomplete-filter"')
+        self.assertContains(resp, "admin-autocomplete")
+        self.assertContains(resp, "select2")
+        # The customers are not listed: they only come with their loans.
+        self.assertFalse(
+            [q for q in queries if q["sql"].startswith('SELECT "customers_customer"')]
+        )
+
+        resp = self.client.get(self.admin_url(Loan), {"customer__id__exact": customer.pk})
+        self.assertEqual(
+            [loan.external_id for loan in resp.context["cl"].result_list],
+            ["loan_of_cust_admin_bob"],
+        )
+        self.assertContains(resp, f'<option value="{customer.pk}" selected>')
+
+    def test_large_tables_show_the_estimated_count(self):
+        queryset = Payment.objects.order_by("-created_at")
+        self.assertEqual(EstimatedCountPaginator(queryset, 10).count, 3)
+        with self.settings(ADMIN_EXACT_COUNT_LIMIT=0):
+            with self.assertNumQueries(1):
+                count = EstimatedCountPaginator(queryset, 10).count
+        self.assertEqual(count, estimated_count(queryset))
+
+    def test_change_forms_do_not_list_related_tables(self):
+        payment = self.payments[1]
+        loan = Loan.objects.get(external_id="loan_of_cust_admin_bob")
+        detail = PaymentDetail.objects.create(payment=payment, loan=loan, amount=10)
+        for model, obj in ((Payment, payment), (PaymentDetail, detail), (Loan, loan)):
+            with self.subTest(model=model.__name__):
+                resp = self.client.get(self.admin_url(model, str(obj.pk), "change"))
+                self.assertEqual(resp.status_code, 200)
+                self.assertContains(resp, "admin-autocomplete")
+                # Only the selected customer is rendered, not the whole table.
+                self.assertNotContains(resp, "cust_admin_ana")
+
+        resp = self.client.get(
+            f"/{settings.ADMIN_URL}/autocomplete/",
+            {
+                "app_label": "payments",
+                "model_name": "paymentdetail",
+                "field_name": "loan",
+                "term": "bob",
+            },
+        )
+        self.assertEqual(
+            [result["text"] for result in resp.json()["results"]],
+            ["Loan loan_of_cust_admin_bob – Customer cust_admin_bob"],
+        )
+
+    def test_payment_details_inline_is_paginated(self):
+        payment = self.payments[1]
+        loan = Loan.objects.get(external_id="loan_of_cust_admin_bob")
+        PaymentDetail.objects.bulk_create(
+            PaymentDetail(payment=payment, loan=loan, amount=index) for index in range(25)
+        )
+        url = self.admin_url(Payment, str(payment.pk), "change")
+        for page, rows in (("1", 20), ("2", 5)):
+            with self.subTest(page=page):
+                resp = self.client.get(url, {"details-page": page})
+                formset = resp.context["inline_admin_formsets"][0].formset
+                self.assertEqual(len(formset.forms), rows)
+                self.assertContains(resp, "25 payment details")
+
+    def test_str_uses_external_ids(self):
+        loan = Loan.objects.get(external_id="loan_of_cust_admin_bob")
+        PaymentDetail.objects.create(payment=self.payments[1], loan=loan, amount=10)
+        expected = "Detail: $10.00 for Loan loan_of_cust_admin_bob (Payment pay_001)"
+        self.assertEqual(str(PaymentDetail.objects.get()), expected)
+        detail = PaymentDetail.objects.select_related("loan", "payment").get()
+        with self.assertNumQueries(0):
+            self.assertEqual(str(detail), expected)
+
+    def test_detail_pages_query_once_per_page_not_per_row(self):
+        loan = Loan.objects.get(external_id="loan_of_cust_admin_bob")
+        payment = self.payments[1]
+        detail = PaymentDetail.objects.create(payment=payment, loan=loan, amount=10)
+        urls = (
+            self.admin_url(PaymentDetail),
+            self.admin_url(PaymentDetail, str(detail.pk), "change"),
+            self.admin_url(PaymentDetail, str(detail.pk), "delete"),
+            self.admin_url(Payment, str(payment.pk), "change"),
+        )
+
+        def query_counts():
+            counts = []
+            for url in urls:
+                with CaptureQueriesContext(connection) as queries:
+                    self.assertEqual(self.client.get(url).status_code, 200)
+                counts.append(len(queries))
+            return counts
+
+        before = query_counts()
+        PaymentDetail.objects.bulk_create(
+            PaymentDetail(payment=payment, loan=loan, amount=index) for index in range(5)
+        )
+        self.assertEqual(query_counts(), before)
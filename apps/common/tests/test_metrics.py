@@ -0,0 +1,115 @@
+import time
+
+from django.test import override_settings
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_api_key.models import APIKey
+
+from apps.customers.models.customers import Customer
+from apps.customers.tasks import import_customers_task
+from apps.loans.choices.loan_status import LoanStatus
+from apps.loans.models.loans import Loan
+
+
+def sample(name, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class PrometheusMetricsTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        _, self.api_key = APIKey.objects.create_key(name="test")
+        self.auth = {"HTTP_X_API_KEY": self.api_key}
+
+        self.customer = Customer.objects.create(external_id="cust_metrics", score=1000)
+        for index in range(2):
+            Loan.objects.create(
+                external_id=f"loan_metrics_{index}",
+                customer=self.customer,
+                amount=100,
+                outstanding=100,
+                status=LoanStatus.ACTIVE,
+                taken_at="2025-04-01T00:00:00Z",
+                maximum_payment_date="2025-05-01T00:00:00Z",
+            )
+
+    def test_request_latency_and_queries_per_endpoint(self):
+        labels = {"endpoint": "CustomerViewSet.balance", "method": "GET", "status": "200"}
+        requests = sample("mo_http_request_duration_seconds_count", **labels)
+        queries = sample(
+            "mo_http_request_db_queries_sum", endpoint="CustomerViewSet.balance"
+        )
+
+        resp = self.client.get("/customers/cust_metrics/balance/", **self.auth)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            sample("mo_http_request_duration_seconds_count", **labels), requests + 1
+        )
+        self.assertGreater(
+            sample("mo_http_request_db_queries_sum", endpoint="CustomerViewSet.balance"),
+            queries,
+        )
+
+    def test_payment_distribution_size(self):
+        observed = sample("mo_payment_distribution_loans_sum")
+        resp = self.client.post(
+            "/payments/",
+            {
+                "external_id": "pay_metrics",
+                "customer_external_id": "cust_metrics",
+                "total_amount": "150.00",
+            },
+            format="json",
+            **self.auth,
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(sample("mo_payment_distribution_loans_sum"), observed + 2)
+
+    def test_cache_lookups(self):
+        self.client.get("/customers/cust_metrics/", **self.auth)
+        hits = sample("mo_cache_lookups_total", namespace="api_keys", result="local_hit")
+        self.client.get("/customers/cust_metrics/", **self.auth)
+        self.assertEqual(
+            sample("mo_cache_lookups_total", namespace="api_keys", result="local_hit"),
+            hits + 1,
+        )
+
+    def test_celery_task_runtime_and_queue_wait(self):
+        task = "import_customers_task"
+        runs = sample("mo_celery_task_duration_seconds_count", task=task, state="SUCCESS")
+        waited = sample("mo_celery_task_queue_wait_seconds_sum", task=task)
+
+        import_customers_task.apply(
+            args=("cust_metrics_2,10",), headers={"published_at": time.time() - 2}
+        )
+
+        self.assertEqual(
+            sample("mo_celery_task_duration_seconds_count", task=task, state="SUCCESS"),
+            runs + 1,
+        )
+        self.assertGreaterEqual(
+            sample("mo_celery_task_queue_wait_seconds_sum", task=task), waited + 2
+        )
+
+    def test_metrics_endpoint(self):
+        self.client.get("/customers/cust_metrics/", **self.auth)
+        with override_settings(METRICS_TOKEN="scraper"):
+            resp = self.client.get("/metrics")
+            self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+            resp = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer scraper")
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            b'mo_http_request_duration_seconds_count{endpoint="CustomerViewSet.retrieve"',
+            resp.content,
+        )
+
+    def test_metrics_endpoint_needs_a_token_unless_debug(self):
+        with override_settings(METRICS_TOKEN=""):
+            resp = self.client.get("/metrics")
+            self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+            with override_settings(DEBUG=True):
+                resp = self.client.get("/metrics")
+                self.assertEqual(resp.status_code, status.HTTP_200_OK)
@@ -0,0 +1,51 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+
+from mo.swagger import load_schema, schema_fingerprint
+
+
+class CachedSchemaTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        schema_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(schema_dir.cleanup)
+        self.schema_dir = Path(schema_dir.name)
+        settings_override = override_settings(OPENAPI_SCHEMA_DIR=schema_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        load_schema.cache_clear()
+        self.addCleanup(load_schema.cache_clear)
+
+    def test_schema_is_generated_once_and_served_with_cache_headers(self):
+        resp = self.client.get("/swagger.json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp["Content-Type"], "application/json")
+        self.assertIn("max-age=", resp["Cache-Control"])
+        self.assertIn("/customers/", resp.json()["paths"])
+        self.assertTrue(
+            (self.schema_dir / f"openapi-{schema_fingerprint()}.json").exists()
+        )
+
+        resp = self.client.get("/swagger.json", HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        resp = self.client.get("/swagger.yaml")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp["Content-Type"], "application/yaml")
+
+    def test_command_writes_current_schema_and_drops_old_ones(self):
+        stale = self.schema_dir / "openapi-0123.json"
+        stale.write_text("{}")
+
+        call_command("generate_openapi_schema", stdout=StringIO())
+
+        names = sorted(path.name for path in self.schema_dir.iterdir())
+        fingerprint = schema_fingerprint()
+        self.assertEqual(
+            names, [f"openapi-{fingerprint}.json", f"openapi-{fingerprint}.yaml"]
+        )
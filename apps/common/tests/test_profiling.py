@@ -0,0 +1,81 @@
+import marshal
+import tempfile
+from unittest import mock
+
+from django.core.files.storage import FileSystemStorage
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_api_key.models import APIKey
+
+from apps.common.methods.profiling import profile_path
+from apps.customers.models.customers import Customer
+from apps.customers.tasks import import_customers_task
+
+
+class ProfilingTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+
+        self.client = APIClient()
+        privileged, self.api_key = APIKey.objects.create_key(name="oncall")
+        _, self.other_key = APIKey.objects.create_key(name="partner")
+        self.storage = FileSystemStorage(location=media_root.name)
+        storage_patch = mock.patch(
+            "apps.common.methods.profiling.default_storage", self.storage
+        )
+        storage_patch.start()
+        self.addCleanup(storage_patch.stop)
+
+        settings_override = override_settings(
+            PROFILING_API_KEY_PREFIXES=[privileged.prefix],
+            PROFILING_RATE="2/h",
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        Customer.objects.create(external_id="cust_profile", score=100)
+
+    def get(self, api_key, mode):
+        return self.client.get(
+            "/customers/cust_profile/", HTTP_X_API_KEY=api_key, HTTP_X_PROFILE=mode
+        )
+
+    def test_privileged_key_gets_a_profile(self):
+        resp = self.get(self.api_key, "cprofile")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        path = profile_path(resp["X-Profile-Id"], "prof")
+        with self.storage.open(path) as profile:
+            stats = marshal.loads(profile.read())
+        self.assertTrue(any("customer_view.py" in func[0] for func in stats))
+
+        resp = self.get(self.api_key, "sample")
+        self.assertTrue(self.storage.exists(profile_path(resp["X-Profile-Id"], "folded")))
+
+    def test_rate_limited(self):
+        for _ in range(2):
+            self.assertIn("X-Profile-Id", self.get(self.api_key, "sample"))
+        resp = self.get(self.api_key, "sample")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Profile-Id", resp)
+
+    def test_ignored_for_other_keys_and_modes(self):
+        for api_key, mode in ((self.other_key, "sample"), (self.api_key, "yes")):
+            resp = self.get(api_key, mode)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertNotIn("X-Profile-Id", resp)
+
+    def test_celery_task_profile_kwarg(self):
+        with self.assertLogs("apps.common.methods.profiling", "INFO") as logs:
+            result = import_customers_task.apply(
+                kwargs={"raw_content": "cust_profile_2,10", "_profile": "cprofile"}
+            )
+            import_customers_task.apply(
+                kwargs={"raw_content": "cust_profile_3,10"},
+                headers={"_profile": "sample"},
+            )
+        self.assertEqual(result.get()["created"], ["cust_profile_2"])
+        self.assertEqual(len(logs.output), 2)
+        self.assertIn("task import_customers_task", logs.output[0])
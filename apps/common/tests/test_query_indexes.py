@@ -0,0 +1,92 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from apps.customers.models.customers import Customer
+from apps.loans.choices.loan_status import LoanStatus
+from apps.loans.models.loans import Loan
+from apps.payments.methods.payment_distribution import OPEN_LOAN_STATUSES
+from apps.payments.models.payment import Payment
+
+
+class MigrationsTests(TestCase):
+    def test_models_have_no_pending_migrations(self):
+        call_command("makemigrations", "--check", "--dry-run", stdout=StringIO())
+
+
+class QueryIndexesTests(TestCase):
+    """
+    The hot query shapes can be served by their indexes (the test tables are
+    tiny, so sequential scans are disabled to see which index the planner picks).
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.customer = Customer.objects.create(external_id="cust_idx", score=1000)
+        Loan.objects.create(
+            external_id="loan_idx",
+            customer=self.customer,
+            amount=500,
+            outstanding=500,
+            status=LoanStatus.ACTIVE,
+            taken_at="2025-04-01T00:00:00Z",
+            maximum_payment_date="2025-05-01T00:00:00Z",
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset, index):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}", params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+            # On partitioned tables the plan shows the partitions' own indexes.
+            cursor.execute(
+                "SELECT inhrelid::regclass::text FROM pg_inherits "
+                "WHERE inhparent = %s::regclass",
+                [index],
+            )
+            names = [index] + [row[0] for row in cursor.fetchall()]
+        self.assertTrue(any(name in plan for name in names), plan)
+
+    def test_open_loans_use_partial_index(self):
+        self.assertUsesIndex(
+            self.customer.loans.active()
+            .filter(status__in=OPEN_LOAN_STATUSES)
+            .values_list("outstanding"),
+            "loan_live_open_idx",
+        )
+
+    def test_list_pages_use_created_at_indexes(self):
+        loans = Loan.active_objects.order_by("-created_at")
+        payments = Payment.active_objects.order_by("-created_at")
+        cases = (
+            (loans[:10], "loan_live_created_idx"),
+            (loans.filter(customer=self.customer)[:10], "loan_customer_created_idx"),
+            (payments[:10], "payment_live_created_idx"),
+            (
+                payments.filter(customer=self.customer)[:10],
+                "payment_customer_created_idx",
+            ),
+            (
+                Customer.active_objects.order_by("-created_at")[:10],
+                "customer_live_created_idx",
+            ),
+        )
+        for queryset, index in cases:
+            with self.subTest(index=index):
+                self.assertUsesIndex(queryset, index)
+
+    def test_admin_search_uses_trigram_indexes(self):
+        cases = (
+            (Customer, "customer_external_id_trgm_idx"),
+            (Loan, "loan_external_id_trgm_idx"),
+            (Payment, "payment_external_id_trgm_idx"),
+        )
+        for model, index in cases:
+            with self.subTest(index=index):
+                self.assertUsesIndex(
+                    model.objects.filter(external_id__icontains="idx"), index
+                )
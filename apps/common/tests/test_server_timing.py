@@ -0,0 +1,85 @@
+import re
+
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_api_key.models import APIKey
+
+from apps.customers.models.customers import Customer
+from apps.loans.choices.loan_status import LoanStatus
+from apps.loans.models.loans import Loan
+
+LOGGER = "apps.common.middleware.server_timing_middleware"
+
+
+def server_timing(response) -> dict:
+    """
+    {name: (duration ms, description)} from the Server-Timing header.
+    """
+    return {
+        name: (float(duration), description)
+        for name, duration, description in re.findall(
+            r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?', response["Server-Timing"]
+        )
+    }
+
+
+@override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+class ServerTimingMiddlewareTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        _, self.api_key = APIKey.objects.create_key(name="test")
+        self.auth = {"HTTP_X_API_KEY": self.api_key}
+
+        self.customer = Customer.objects.create(external_id="cust_timing", score=1000)
+        Loan.objects.create(
+            external_id="loan_timing",
+            customer=self.customer,
+            amount=500,
+            outstanding=500,
+            status=LoanStatus.ACTIVE,
+            taken_at="2025-04-01T00:00:00Z",
+            maximum_payment_date="2025-05-01T00:00:00Z",
+        )
+
+    def test_payment_breakdown_in_header_and_log(self):
+        with self.assertLogs(LOGGER, "INFO") as logs:
+            resp = self.client.post(
+                "/payments/",
+                {
+                    "external_id": "pay_timing",
+                    "customer_external_id": "cust_timing",
+                    "total_amount": "100.00",
+                },
+                format="json",
+                **self.auth,
+            )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+        timing = server_timing(resp)
+        for name in ("total", "view", "auth", "validation", "debt", "distribution"):
+            self.assertIn(name, timing)
+        self.assertLessEqual(timing["view"][0], timing["total"][0])
+        queries = int(timing["db"][1].split()[0])
+        self.assertGreater(queries, 3)
+
+        (line,) = logs.output
+        self.assertIn('"path": "/payments/"', line)
+        self.assertIn(f'"queries": {queries}', line)
+
+    def test_unsampled_requests_are_not_instrumented(self):
+        with self.settings(SERVER_TIMING_SAMPLE_RATE=0), self.assertNoLogs(LOGGER):
+            resp = self.client.get("/customers/cust_timing/", **self.auth)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Server-Timing", resp)
+
+    async def test_counts_queries_run_in_worker_threads_under_asgi(self):
+        with self.assertLogs(LOGGER, "INFO"):
+            resp = await self.async_client.get(
+                "/customers/cust_timing/", headers={"x-api-key": self.api_key}
+            )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        timing = server_timing(resp)
+        self.assertIn("auth", timing)
+        self.assertNotEqual(timing["db"][1], "0 queries")
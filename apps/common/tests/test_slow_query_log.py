@@ -0,0 +1,108 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_api_key.models import APIKey
+
+from apps.common.methods import slow_query_log
+from apps.common.methods.slow_query_log import normalize
+from apps.common.models.slow_query import SlowQuery
+from apps.customers.models.customers import Customer
+from apps.loans.choices.loan_status import LoanStatus
+from apps.loans.models.loans import Loan
+
+
+class NormalizeTests(TestCase):
+    def test_literals_and_in_lists_are_normalized(self):
+        self.assertEqual(
+            normalize("SELECT * FROM t WHERE a IN (%s, %s,\n %s) AND b = 'x' LIMIT 21"),
+            "SELECT * FROM t WHERE a IN (...) AND b = ? LIMIT ?",
+        )
+        self.assertEqual(
+            normalize("SELECT 1 FROM t WHERE a IN (%s)"),
+            normalize("SELECT 2 FROM t WHERE a IN (%s, %s)"),
+        )
+
+
+@override_settings(SLOW_QUERY_THRESHOLD=1e-9, USE_CELERY=False)
+class SlowQueryLogTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        # Occurrences are stored with flush(), in the test's transaction.
+        worker = mock.patch.object(slow_query_log, "_start_worker")
+        worker.start()
+        self.addCleanup(worker.stop)
+        self.client = APIClient()
+        _, api_key = APIKey.objects.create_key(name="test")
+        self.auth = {"HTTP_X_API_KEY": api_key}
+        customer = Customer.objects.create(external_id="cust_slow", score=1000)
+        Loan.objects.create(
+            external_id="loan_slow",
+            customer=customer,
+            amount=500,
+            outstanding=500,
+            status=LoanStatus.ACTIVE,
+            taken_at="2025-04-01T00:00:00Z",
+            maximum_payment_date="2025-05-01T00:00:00Z",
+        )
+
+    def pay(self, external_id):
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(
+                "/payments/",
+                {
+                    "external_id": external_id,
+                    "customer_external_id": "cust_slow",
+                    "total_amount": "10.00",
+                },
+                format="json",
+                **self.auth,
+            )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        slow_query_log.flush()
+
+    def test_records_caller_plan_and_deduplicates(self):
+        self.pay("pay_slow_1")
+        self.pay("pay_slow_2")
+
+        debt = SlowQuery.objects.get(
+            caller="PaymentCreateSerializer.validate", statement__contains="SUM"
+        )
+        self.assertEqual(debt.calls, 2)
+        self.assertIn('"loans_loan"', debt.statement)
+        self.assertIn("Scan", debt.plan)
+        self.assertGreaterEqual(debt.total_duration, debt.max_duration)
+        self.assertFalse(SlowQuery.objects.filter(statement__contains="slowquery"))
+
+    def test_request_never_stores_the_occurrences(self):
+        with self.assertNumQueries(0):
+            slow_query_log.dispatch(
+                {
+                    "sql": "SELECT 1",
+                    "params": None,
+                    "duration": 1.0,
+                    "caller": "",
+                    "alias": "default",
+                }
+            )
+        self.assertFalse(SlowQuery.objects.exists())
+        self.assertEqual(slow_query_log.flush(), 1)
+        self.assertTrue(SlowQuery.objects.exists())
+
+    @override_settings(USE_CELERY=True)
+    def test_occurrence_is_dropped_when_the_task_cannot_be_queued(self):
+        with (
+            mock.patch(
+                "apps.common.tasks.record_slow_query_task.apply_async",
+                side_effect=ConnectionError("broker down"),
+            ),
+            self.assertLogs(slow_query_log.logger, "ERROR"),
+        ):
+            self.pay("pay_slow_1")
+        self.assertFalse(SlowQuery.objects.exists())
+
+    @override_settings(SLOW_QUERY_LOG_SIZE=3)
+    def test_keeps_only_the_most_recent_statements(self):
+        self.pay("pay_slow_1")
+        self.assertEqual(SlowQuery.objects.count(), 3)
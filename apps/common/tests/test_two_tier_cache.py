@@ -0,0 +1,149 @@
+import threading
+import time
+from unittest import mock
+
+import redis
+from django.core.cache import cache as shared_cache
+from django.test import SimpleTestCase
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from apps.common.cache import two_tier_cache
+from apps.common.cache.decorators import cache_response, cached
+from apps.common.cache.two_tier_cache import TwoTierCache, get_cache
+
+
+class TwoTierCacheTests(SimpleTestCase):
+    def setUp(self):
+        shared_cache.clear()
+        self.cache = TwoTierCache("tests", ttl=60, local_ttl=60)
+
+    def test_hits_local_tier_then_shared_tier(self):
+        self.cache.set("answer", 42)
+        self.assertEqual(self.cache.get("answer"), 42)
+
+        self.cache.local.clear()
+        self.assertEqual(self.cache.get("answer"), 42)
+        self.assertEqual(self.cache.get("missing", "default"), "default")
+
+        stats = self.cache.stats.as_dict()
+        self.assertEqual(
+            (stats["local_hits"], stats["remote_hits"], stats["misses"]), (1, 1, 1)
+        )
+
+    def test_invalidate_bumps_the_namespace_version(self):
+        self.cache.set("answer", 42)
+        other_process = TwoTierCache("tests", ttl=60, local_ttl=60)
+        self.assertEqual(other_process.get("answer"), 42)
+
+        self.cache.invalidate()
+
+        self.assertIsNone(self.cache.get("answer"))
+        with self.settings(CACHE_VERSION_CHECK_INTERVAL=0):
+            self.assertIsNone(other_process.get("answer"))
+
+    def test_get_or_set_computes_once_for_concurrent_misses(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(self.cache.get_or_set("slow", compute))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 8)
+
+    def test_failing_shared_tier_falls_back_to_local_tier(self):
+        self.addCleanup(two_tier_cache._redis.reset)
+        self.cache.remote = mock.Mock()
+        for method in ("get", "set", "add", "incr", "delete"):
+            getattr(self.cache.remote, method).side_effect = redis.ConnectionError(
+                "Connection refused"
+            )
+
+        with self.assertLogs(two_tier_cache.logger, "ERROR"):
+            self.assertEqual(self.cache.get_or_set("answer", lambda: 42), 42)
+        self.assertEqual(self.cache.get("answer"), 42)
+        self.cache.delete("answer")
+        self.assertIsNone(self.cache.get("answer"))
+        self.assertTrue(self.cache.degraded)
+        with mock.patch.object(self.cache, "_start_invalidate_retry") as retry:
+            self.assertFalse(self.cache.invalidate())
+        retry.assert_called_once()
+        # Only the first error reaches the backend; then it is skipped for a while.
+        self.assertEqual(self.cache.remote.get.call_count, 1)
+
+    def test_failed_invalidation_is_retried_once_the_shared_tier_is_back(self):
+        self.addCleanup(two_tier_cache._redis.reset)
+        self.cache.set("answer", 42)
+        other_process = TwoTierCache("tests", ttl=60, local_ttl=60)
+        remote, self.cache.remote = self.cache.remote, mock.Mock()
+        self.cache.remote.add.side_effect = redis.ConnectionError("Connection refused")
+
+        with (
+            self.assertLogs(two_tier_cache.logger, "ERROR"),
+            mock.patch.object(self.cache, "_start_invalidate_retry"),
+        ):
+            self.assertFalse(self.cache.invalidate())
+
+        # Back up, the shared tier still has the entry until the bump is retried.
+        self.cache.remote = remote
+        two_tier_cache._redis.reset()
+        self.assertEqual(other_process.get("answer"), 42)
+        with (
+            self.settings(CACHE_REMOTE_RETRY=0, CACHE_VERSION_CHECK_INTERVAL=0),
+            self.assertLogs(two_tier_cache.logger, "WARNING"),
+        ):
+            self.cache._invalidate_retrying = True
+            self.cache._retry_invalidate()
+            self.assertFalse(self.cache._invalidate_retrying)
+            self.assertIsNone(other_process.get("answer"))
+
+
+class CacheDecoratorTests(SimpleTestCase):
+    def setUp(self):
+        shared_cache.clear()
+        get_cache("decorated").local.clear()
+
+    def test_cached_uses_key_function(self):
+        calls = []
+
+        @cached("decorated", key=lambda self, value: f"double:{value}")
+        def double(self, value):
+            calls.append(value)
+            return value * 2
+
+        self.assertEqual(double(object(), 2), 4)
+        self.assertEqual(double(object(), 2), 4)
+        self.assertEqual(calls, [2])
+
+    def test_cache_response_only_caches_successful_gets(self):
+        calls = []
+
+        class View:
+            action = "retrieve"
+
+            @cache_response("decorated", ttl=60)
+            def retrieve(self, request):
+                calls.append(request.method)
+                return Response({"calls": len(calls)})
+
+        factory = APIRequestFactory()
+        first = View().retrieve(factory.get("/things/1/?page=2"))
+        second = View().retrieve(factory.get("/things/1/?page=2"))
+        View().retrieve(factory.post("/things/1/?page=2"))
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(calls, ["GET", "POST"])
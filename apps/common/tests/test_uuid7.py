@@ -0,0 +1,57 @@
+import time
+import uuid
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.common.methods.custom_pagination import IdCursorPagination
+from apps.common.methods.uuid7 import uuid7
+from apps.customers.models.customers import Customer
+
+
+class UUID7Tests(TestCase):
+    def test_layout(self):
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+        self.assertTrue(before <= value.int >> 80 <= after)
+
+    def test_strictly_increasing_even_if_the_clock_stalls(self):
+        with mock.patch("time.time_ns", return_value=1_700_000_000_000_000_000):
+            values = [uuid7() for _ in range(1000)]
+        values += [uuid7() for _ in range(1000)]
+        self.assertEqual(values, sorted(set(values)))
+
+    def test_base_model_uses_uuid7(self):
+        customer = Customer.objects.create(external_id="cust_v7", score=10)
+        self.assertEqual(customer.id.version, 7)
+
+
+class IdCursorPaginationTests(TestCase):
+    def test_pages_through_mixed_v4_and_v7_ids_once(self):
+        Customer.objects.bulk_create(
+            Customer(id=uuid.uuid4(), external_id=f"cust_v4_{index}", score=10)
+            for index in range(7)
+        )
+        created = [
+            Customer.objects.create(external_id=f"cust_v7_{index}", score=10)
+            for index in range(8)
+        ]
+
+        seen, url = [], "/customers/?page_size=4"
+        while url:
+            request = Request(APIRequestFactory().get(url))
+            paginator = IdCursorPagination()
+            page = paginator.paginate_queryset(Customer.objects.all(), request)
+            seen += [customer.external_id for customer in page]
+            url = paginator.get_next_link()
+
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(len(seen), 15)
+        v7_order = [external_id for external_id in seen if "v7" in external_id]
+        self.assertEqual(v7_order, [c.external_id for c in reversed(created)])
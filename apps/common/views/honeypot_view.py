@@ -0,0 +1,20 @@
+from admin_honeypot.views import AdminHoneypot
+from django.contrib.auth.models import AnonymousUser
+
+from apps.common.methods import honeypot_log
+
+
+class BufferedAdminHoneypot(AdminHoneypot):
+    """
+    The admin_honeypot login page, answering without touching the database:
+    attempts go to the honeypot_log buffer instead of one LoginAttempt insert
+    each, and the page never looks up the visitor's session or user.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        request.user = AnonymousUser()
+        return super().dispatch(request, *args, **kwargs)
+
+    def form_invalid(self, form):
+        honeypot_log.record(self.request)
+        return super(AdminHoneypot, self).form_invalid(form)
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from apps.common.methods.metrics import registry
+
+
+def metrics_view(request):
+    """
+    Prometheus exposition of this instance's metrics (every gunicorn worker).
+    Scrapers must send ``Authorization: Bearer <METRICS_TOKEN>``; without a
+    METRICS_TOKEN, metrics are only served when DEBUG is on.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponseForbidden()
+    elif not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(generate_latest(registry()), content_type=CONTENT_TYPE_LATEST)
@@ -1,11 +1,12 @@
 # apps/customers/admin.py
 from django.contrib import admin
 
+from apps.common.mixins.large_table_admin_mixin import LargeTableAdminMixin
 from apps.customers.models.customers import Customer
 
 
 @admin.register(Customer)
-class CustomerAdmin(admin.ModelAdmin):
+class CustomerAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         "external_id",
         "status",
@@ -17,4 +18,3 @@ class CustomerAdmin(admin.ModelAdmin):
     list_filter = ("status",)
     search_fields = ("external_id",)
     readonly_fields = ("created_at", "updated_at")
-    ordering = ("-created_at",)
@@ -1,4 +1,13 @@
-from django.db.models import CharField, DateTimeField, DecimalField, SmallIntegerField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models import (
+    CharField,
+    DateTimeField,
+    DecimalField,
+    Index,
+    Q,
+    SmallIntegerField,
+)
+from django.db.models.functions import Upper
 
 from apps.common.models.base_model import BaseModel
 from apps.customers.choices.customer_status import CustomerStatus
@@ -13,5 +22,21 @@ class Customer(BaseModel):
     score = DecimalField(max_digits=12, decimal_places=2)
     preapproved_at = DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            Index(
+                fields=["created_at"],
+                condition=Q(is_active=True),
+                name="customer_live_created_idx",
+            ),
+            # Admin changelist: every row, newest first.
+            Index(fields=["created_at"], name="customer_created_idx"),
+            # Admin search: icontains compiles to UPPER(external_id) LIKE '%...%'.
+            GinIndex(
+                OpClass(Upper("external_id"), name="gin_trgm_ops"),
+                name="customer_external_id_trgm_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"Customer {self.external_id} (status={self.status})"
@@ -1,10 +1,13 @@
 from django.urls import include, path
-from rest_framework import routers
 
+from apps.common.routers.async_read_router import AsyncReadRouter
+from apps.customers.views.async_customer_view import AsyncCustomerViewSet
 from apps.customers.views.customer_view import CustomerViewSet
 
-router = routers.DefaultRouter()
-router.register(r"customers", CustomerViewSet, basename="customer")
+router = AsyncReadRouter()
+router.register(
+    r"customers", CustomerViewSet, basename="customer", async_viewset=AsyncCustomerViewSet
+)
 
 urlpatterns = [
     path("", include(router.urls)),
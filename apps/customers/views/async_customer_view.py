@@ -0,0 +1,39 @@
+from django.db.models import Sum
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from apps.common.mixins.async_read_view_mixin import AsyncReadViewMixin
+from apps.customers.views.customer_view import CustomerViewSet
+
+
+class AsyncCustomerViewSet(AsyncReadViewMixin, CustomerViewSet):
+    """
+    Async (ASGI) versions of the CustomerViewSet read actions:
+      GET /api/customers/
+      GET /api/customers/{external_id}/
+      GET /api/customers/{external_id}/balance/
+    """
+
+    async def list(self, request):
+        customers = self.get_queryset()
+        page = await self.apaginate_queryset(customers)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([c async for c in customers], many=True)
+        return Response(serializer.data)
+
+    async def retrieve(self, request, external_id=None):
+        customer = await self.aget_object()
+        serializer = self.get_serializer(customer)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=["get"])
+    async def balance(self, request, external_id=None):
+        customer = await self.aget_object()
+        agg = (
+            await customer.loans.active()
+            .filter(status__in=[1, 2])
+            .aaggregate(total_debt=Sum("outstanding"))
+        )
+        return self.balance_response(customer, agg["total_debt"] or 0)
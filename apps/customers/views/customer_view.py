@@ -12,6 +12,8 @@ from apps.authentication.mixins.api_key_protected_view_mixin import (
     ApiKeyProtectedViewMixin,
 )
 from apps.common.methods.custom_pagination import CustomPagination
+from apps.common.methods.request_timing import timed
+from apps.common.mixins.replica_read_view_mixin import ReplicaReadViewMixin
 from apps.customers.models.customers import Customer
 from apps.customers.serializers.customer_serializer import (
     CustomerBalanceSerializer,
@@ -21,7 +23,7 @@ from apps.customers.serializers.customer_serializer import (
 from mo.task_handler import handle_task
 
 
-class CustomerViewSet(ApiKeyProtectedViewMixin, GenericViewSet):
+class CustomerViewSet(ReplicaReadViewMixin, ApiKeyProtectedViewMixin, GenericViewSet):
     """
     retrieve:
       GET /api/customers/{external_id}/       Retrieve a single customer.
@@ -35,7 +37,7 @@ class CustomerViewSet(ApiKeyProtectedViewMixin, GenericViewSet):
       GET /api/customers/{external_id}/balance/  Get total debt & available credit.
     """
 
-    queryset = Customer.objects.all().order_by("-created_at")
+    queryset = Customer.active_objects.order_by("-created_at")
     lookup_field = "external_id"
     parser_classes = [JSONParser, MultiPartParser]
     pagination_class = CustomPagination
@@ -67,7 +69,8 @@ class CustomerViewSet(ApiKeyProtectedViewMixin, GenericViewSet):
     @transaction.atomic
     def create(self, request):
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        with timed("validation"):
+            serializer.is_valid(raise_exception=True)
         customer = serializer.save()
         return Response(
             self.get_serializer(customer).data, status=status.HTTP_201_CREATED
@@ -124,7 +127,8 @@ class CustomerViewSet(ApiKeyProtectedViewMixin, GenericViewSet):
     )
     def upload(self, request):
         upload_ser = self.get_serializer(data=request.data)
-        upload_ser.is_valid(raise_exception=True)
+        with timed("validation"):
+            upload_ser.is_valid(raise_exception=True)
 
         raw = upload_ser.validated_data["file"].read().decode("utf-8")
         result = handle_task(
@@ -146,10 +150,14 @@ class CustomerViewSet(ApiKeyProtectedViewMixin, GenericViewSet):
     @action(detail=True, methods=["get"])
     def balance(self, request, external_id=None):
         customer = self.get_object()
-        agg = customer.loans.filter(status__in=[1, 2]).aggregate(
-            total_debt=Sum("outstanding")
+        agg = (
+            customer.loans.active()
+            .filter(status__in=[1, 2])
+            .aggregate(total_debt=Sum("outstanding"))
         )
-        total_debt = agg["total_debt"] or 0
+        return self.balance_response(customer, agg["total_debt"] or 0)
+
+    def balance_response(self, customer, total_debt):
         available = customer.score - total_debt
         payload = {
             "external_id": customer.external_id,
@@ -1,11 +1,13 @@
 # apps/loans/admin.py
 from django.contrib import admin
 
+from apps.common.mixins.large_table_admin_mixin import LargeTableAdminMixin
+from apps.loans.models.archived_loan import ArchivedLoan
 from apps.loans.models.loans import Loan
 
 
 @admin.register(Loan)
-class LoanAdmin(admin.ModelAdmin):
+class LoanAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         "external_id",
         "customer",
@@ -20,5 +22,30 @@ class LoanAdmin(admin.ModelAdmin):
     list_filter = ("status", "customer", "taken_at")
     search_fields = ("external_id", "customer__external_id")
     list_select_related = ("customer",)
+    autocomplete_fields = ("customer",)
     readonly_fields = ("created_at", "updated_at")
-    ordering = ("-taken_at",)
+
+    def get_queryset(self, request):
+        # Also the autocomplete results of the loan foreign keys.
+        return super().get_queryset(request).select_related("customer")
+
+
+@admin.register(ArchivedLoan)
+class ArchivedLoanAdmin(admin.ModelAdmin):
+    list_display = (
+        "external_id",
+        "customer",
+        "amount",
+        "status",
+        "taken_at",
+        "archived_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("external_id", "customer__external_id")
+    list_select_related = ("customer",)
+    autocomplete_fields = ("customer",)
+    readonly_fields = ("created_at", "updated_at", "archived_at")
+    ordering = ("-archived_at",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("customer")
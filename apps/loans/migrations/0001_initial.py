@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('customers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Loan',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('external_id', models.CharField(max_length=60, unique=True)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('status', models.SmallIntegerField(choices=[(1, 'Pending'), (2, 'Active'), (3, 'Rejected'), (4, 'Paid')], default=1)),
+                ('contract_version', models.CharField(max_length=30)),
+                ('maximum_payment_date', models.DateTimeField()),
+                ('taken_at', models.DateTimeField(blank=True, null=True)),
+                ('outstanding', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('customer', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='loans', to='customers.customer')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
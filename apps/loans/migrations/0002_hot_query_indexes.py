@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:19
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; building the
+    # indexes this way does not block writes to the tables.
+    atomic = False
+
+    dependencies = [
+        ('loans', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='loan',
+            index=models.Index(condition=models.Q(('status__in', [1, 2])), fields=['customer', 'status', 'taken_at'], include=('outstanding',), name='loan_open_by_customer_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='loan',
+            index=models.Index(fields=['customer', 'created_at'], name='loan_customer_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='loan',
+            index=models.Index(fields=['created_at'], name='loan_created_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:27
+
+import apps.common.methods.uuid7
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0002_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='loan',
+            name='id',
+            field=models.UUIDField(default=apps.common.methods.uuid7.uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:38
+
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The partial indexes are built before the ones they replace are dropped,
+    # both concurrently, so the queries are never left without an index.
+    atomic = False
+
+    dependencies = [
+        ('loans', '0003_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='loan',
+            index=models.Index(condition=models.Q(('is_active', True), ('status__in', [1, 2])), fields=['customer', 'status', 'taken_at'], include=('outstanding',), name='loan_live_open_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='loan',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='loan_live_created_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='loan',
+            name='loan_open_by_customer_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='loan',
+            name='loan_created_idx',
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:49
+
+import apps.common.methods.uuid7
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0004_live_partial_indexes'),
+        ('loans', '0004_live_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedLoan',
+            fields=[
+                ('id', models.UUIDField(default=apps.common.methods.uuid7.uuid7, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('external_id', models.CharField(max_length=60, unique=True)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('status', models.SmallIntegerField(choices=[(1, 'Pending'), (2, 'Active'), (3, 'Rejected'), (4, 'Paid')])),
+                ('contract_version', models.CharField(max_length=30)),
+                ('maximum_payment_date', models.DateTimeField()),
+                ('taken_at', models.DateTimeField(blank=True, null=True)),
+                ('outstanding', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('archived_at', models.DateTimeField()),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_loans', to='customers.customer')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:02
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('loans', '0006_trigram_search_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='loan',
+            index=models.Index(fields=['created_at'], name='loan_created_idx'),
+        ),
+    ]
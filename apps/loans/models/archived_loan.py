@@ -0,0 +1,33 @@
+from django.db.models import (
+    PROTECT,
+    CharField,
+    DateTimeField,
+    DecimalField,
+    ForeignKey,
+    SmallIntegerField,
+)
+
+from apps.common.models.base_model import BaseModel
+from apps.customers.models.customers import Customer
+from apps.loans.choices.loan_status import LoanStatus
+
+
+class ArchivedLoan(BaseModel):
+    """
+    Closed (PAID or REJECTED) loan moved out of the loans table by the
+    archival job (see apps.payments.methods.archive). Same columns as Loan,
+    plus the time it was archived.
+    """
+
+    external_id = CharField(max_length=60, unique=True)
+    amount = DecimalField(max_digits=12, decimal_places=2)
+    status = SmallIntegerField(choices=LoanStatus.choices)
+    contract_version = CharField(max_length=30)
+    maximum_payment_date = DateTimeField()
+    taken_at = DateTimeField(null=True, blank=True)
+    outstanding = DecimalField(max_digits=12, decimal_places=2)
+    customer = ForeignKey(Customer, on_delete=PROTECT, related_name="archived_loans")
+    archived_at = DateTimeField()
+
+    def __str__(self):
+        return f"Archived loan {self.external_id} – Customer {self.customer.external_id}"
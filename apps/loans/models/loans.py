@@ -1,11 +1,15 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db.models import (
     PROTECT,
     CharField,
     DateTimeField,
     DecimalField,
     ForeignKey,
+    Index,
+    Q,
     SmallIntegerField,
 )
+from django.db.models.functions import Upper
 
 from apps.common.models.base_model import BaseModel
 from apps.customers.models.customers import Customer
@@ -20,7 +24,36 @@ class Loan(BaseModel):
     maximum_payment_date = DateTimeField()
     taken_at = DateTimeField(null=True, blank=True)
     outstanding = DecimalField(max_digits=12, decimal_places=2)
-    customer = ForeignKey(Customer, on_delete=PROTECT, related_name="loans")
+    customer = ForeignKey(
+        Customer, on_delete=PROTECT, related_name="loans", db_index=False
+    )
+
+    class Meta:
+        indexes = [
+            # Open loans of a customer: balances, credit checks and payment allocation.
+            Index(
+                fields=["customer", "status", "taken_at"],
+                include=["outstanding"],
+                condition=Q(
+                    status__in=[LoanStatus.PENDING, LoanStatus.ACTIVE], is_active=True
+                ),
+                name="loan_live_open_idx",
+            ),
+            # Also serves the customer foreign key (PROTECT checks), so not partial.
+            Index(fields=["customer", "created_at"], name="loan_customer_created_idx"),
+            Index(
+                fields=["created_at"],
+                condition=Q(is_active=True),
+                name="loan_live_created_idx",
+            ),
+            # Admin changelist: every row, newest first.
+            Index(fields=["created_at"], name="loan_created_idx"),
+            # Admin search: icontains compiles to UPPER(external_id) LIKE '%...%'.
+            GinIndex(
+                OpClass(Upper("external_id"), name="gin_trgm_ops"),
+                name="loan_external_id_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Loan {self.external_id} – Customer {self.customer.external_id}"
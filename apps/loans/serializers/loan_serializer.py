@@ -2,6 +2,7 @@ from django.db.models import Sum
 from rest_framework import serializers
 
 from apps.customers.models.customers import Customer
+from apps.loans.models.archived_loan import ArchivedLoan
 from apps.loans.models.loans import Loan, LoanStatus
 
 
@@ -45,7 +46,9 @@ class LoanCreateSerializer(serializers.ModelSerializer):
     """
 
     customer_external_id = serializers.SlugRelatedField(
-        source="customer", slug_field="external_id", queryset=Customer.objects.all()
+        source="customer",
+        slug_field="external_id",
+        queryset=Customer.active_objects.all(),
     )
 
     class Meta:
@@ -61,20 +64,33 @@ class LoanCreateSerializer(serializers.ModelSerializer):
         # status and outstanding are set in create(), so we do not expose them here
         read_only_fields = []
 
+    def validate_external_id(self, value):
+        """
+        The unique constraint only covers the loans table: external_ids of
+        archived loans stay taken.
+        """
+        if ArchivedLoan.objects.filter(external_id=value).exists():
+            raise serializers.ValidationError(
+                "loan with this external id already exists."
+            )
+        return value
+
     def validate_amount(self, value):
         """
         Ensure new loan amount plus all existing pending/active outstanding
         does not exceed the customer's credit line (score).
         """
         customer = self.initial_data.get("customer_external_id")
-        customer_instance = Customer.objects.filter(external_id=customer).first()
+        customer_instance = Customer.active_objects.filter(external_id=customer).first()
         if customer_instance is None:
             raise serializers.ValidationError(
                 "Customer with that external_id does not exist."
             )
 
-        aggregate = customer_instance.loans.filter(status__in=[1, 2]).aggregate(
-            total_outstanding=Sum("outstanding")
+        aggregate = (
+            customer_instance.loans.active()
+            .filter(status__in=[1, 2])
+            .aggregate(total_outstanding=Sum("outstanding"))
         )
         existing_debt = aggregate["total_outstanding"] or 0
 
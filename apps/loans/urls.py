@@ -1,10 +1,11 @@
 from django.urls import include, path
-from rest_framework import routers
 
+from apps.common.routers.async_read_router import AsyncReadRouter
+from apps.loans.views.async_loan_view import AsyncLoanViewSet
 from apps.loans.views.loan_view import LoanViewSet
 
-router = routers.DefaultRouter()
-router.register(r"loans", LoanViewSet, basename="loan")
+router = AsyncReadRouter()
+router.register(r"loans", LoanViewSet, basename="loan", async_viewset=AsyncLoanViewSet)
 
 urlpatterns = [
     path("", include(router.urls)),
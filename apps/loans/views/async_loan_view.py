@@ -0,0 +1,29 @@
+from rest_framework.response import Response
+
+from apps.common.mixins.async_read_view_mixin import AsyncReadViewMixin
+from apps.loans.views.loan_view import LoanViewSet
+
+
+class AsyncLoanViewSet(AsyncReadViewMixin, LoanViewSet):
+    """
+    Async (ASGI) versions of the LoanViewSet read actions:
+      GET /api/loans/?customer_external_id={external_id}
+      GET /api/loans/{external_id}/
+    """
+
+    async def list(self, request):
+        customer_id = request.query_params.get("customer_external_id")
+        qs = self.get_queryset()
+        if customer_id:
+            qs = qs.filter(customer__external_id=customer_id)
+        page = await self.apaginate_queryset(qs)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([loan async for loan in qs], many=True)
+        return Response(serializer.data)
+
+    async def retrieve(self, request, external_id=None):
+        loan = await self.aget_object_or_archived()
+        serializer = self.get_serializer(loan)
+        return Response(serializer.data)
@@ -12,11 +12,20 @@ from apps.authentication.mixins.api_key_protected_view_mixin import (
     ApiKeyProtectedViewMixin,
 )
 from apps.common.methods.custom_pagination import CustomPagination
+from apps.common.methods.request_timing import timed
+from apps.common.mixins.archive_fallback_view_mixin import ArchiveFallbackViewMixin
+from apps.common.mixins.replica_read_view_mixin import ReplicaReadViewMixin
+from apps.loans.models.archived_loan import ArchivedLoan
 from apps.loans.models.loans import Loan, LoanStatus
 from apps.loans.serializers.loan_serializer import LoanCreateSerializer, LoanSerializer
 
 
-class LoanViewSet(ApiKeyProtectedViewMixin, viewsets.GenericViewSet):
+class LoanViewSet(
+    ArchiveFallbackViewMixin,
+    ReplicaReadViewMixin,
+    ApiKeyProtectedViewMixin,
+    viewsets.GenericViewSet,
+):
     """
     list:
       GET /api/loans/?customer_external_id={external_id}
@@ -28,7 +37,7 @@ class LoanViewSet(ApiKeyProtectedViewMixin, viewsets.GenericViewSet):
 
     retrieve:
       GET /api/loans/{external_id}/
-      Returns a single loan by its external_id.
+      Returns a single loan by its external_id, archived loans included.
 
     activate:
       POST /api/loans/{external_id}/activate/
@@ -39,7 +48,8 @@ class LoanViewSet(ApiKeyProtectedViewMixin, viewsets.GenericViewSet):
       Rejects a pending loan.
     """
 
-    queryset = Loan.objects.select_related("customer").all()
+    queryset = Loan.active_objects.select_related("customer").order_by("-created_at")
+    archive_queryset = ArchivedLoan.active_objects.select_related("customer")
     lookup_field = "external_id"
     parser_classes = [JSONParser]
     pagination_class = CustomPagination
@@ -89,17 +99,22 @@ class LoanViewSet(ApiKeyProtectedViewMixin, viewsets.GenericViewSet):
     )
     def create(self, request):
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        with timed("validation"):
+            serializer.is_valid(raise_exception=True)
         loan = serializer.save()
         output = LoanSerializer(loan)
         return Response(output.data, status=status.HTTP_201_CREATED)
 
     @swagger_auto_schema(
         operation_summary="Retrieve Loan",
+        operation_description=(
+            "Fetch a single loan by its external_id; closed loans moved to the "
+            "archive are found there."
+        ),
         responses={200: LoanSerializer, 404: "Not Found", 403: "Forbidden"},
     )
     def retrieve(self, request, external_id=None):
-        loan = self.get_object()
+        loan = self.get_object_or_archived()
         serializer = self.get_serializer(loan)
         return Response(serializer.data)
 
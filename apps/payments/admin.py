@@ -1,19 +1,28 @@
 # apps/payments/admin.py
 from django.contrib import admin
 
+from apps.common.mixins.large_table_admin_mixin import LargeTableAdminMixin
+from apps.common.mixins.paginated_inline_mixin import PaginatedInlineMixin
+from apps.loans.models.loans import Loan
+from apps.payments.models.archived_payment import ArchivedPayment
+from apps.payments.models.archived_payment_detail import ArchivedPaymentDetail
 from apps.payments.models.payment import Payment
 from apps.payments.models.payment_detail import PaymentDetail
 
 
-class PaymentDetailInline(admin.TabularInline):
+class PaymentDetailInline(PaginatedInlineMixin, admin.TabularInline):
     model = PaymentDetail
     extra = 0
     readonly_fields = ("loan", "amount")
     can_delete = False
 
+    def get_queryset(self, request):
+        # The formset only sets payment_id; each row's __str__ renders both parents.
+        return super().get_queryset(request).select_related("payment", "loan__customer")
+
 
 @admin.register(Payment)
-class PaymentAdmin(admin.ModelAdmin):
+class PaymentAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         "external_id",
         "customer",
@@ -23,18 +32,59 @@ class PaymentAdmin(admin.ModelAdmin):
         "created_at",
         "updated_at",
     )
-    list_filter = ("status", "paid_at")
+    # Filtering by created_at only reads the matching monthly partitions (a
+    # date_hierarchy would first scan every row for the years to offer).
+    list_filter = ("status", "paid_at", "created_at")
     search_fields = ("external_id", "customer__external_id")
     list_select_related = ("customer",)
+    autocomplete_fields = ("customer",)
     inlines = [PaymentDetailInline]
     readonly_fields = ("created_at", "updated_at")
-    ordering = ("-paid_at",)
 
 
 @admin.register(PaymentDetail)
-class PaymentDetailAdmin(admin.ModelAdmin):
+class PaymentDetailAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("payment", "loan", "amount")
-    list_select_related = ("payment", "loan")
+    list_select_related = ("payment", "loan__customer")
+    autocomplete_fields = ("payment", "loan")
+    list_filter = ("created_at",)
     search_fields = ("payment__external_id", "loan__external_id")
     readonly_fields = ("created_at", "updated_at")
-    ordering = ("payment", "loan")
+
+    def get_queryset(self, request):
+        # __str__ renders both parents (change form, delete confirmation).
+        return super().get_queryset(request).select_related("payment", "loan__customer")
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == "loan":
+            kwargs["queryset"] = Loan.objects.select_related("customer")
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+class ArchivedPaymentDetailInline(PaginatedInlineMixin, admin.TabularInline):
+    model = ArchivedPaymentDetail
+    extra = 0
+    readonly_fields = ("loan_external_id", "amount")
+    can_delete = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("payment")
+
+
+@admin.register(ArchivedPayment)
+class ArchivedPaymentAdmin(admin.ModelAdmin):
+    list_display = (
+        "external_id",
+        "customer",
+        "total_amount",
+        "status",
+        "paid_at",
+        "archived_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("external_id", "customer__external_id")
+    list_select_related = ("customer",)
+    autocomplete_fields = ("customer",)
+    inlines = [ArchivedPaymentDetailInline]
+    readonly_fields = ("created_at", "updated_at", "archived_at")
+    ordering = ("-archived_at",)
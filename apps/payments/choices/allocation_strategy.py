@@ -0,0 +1,7 @@
+from django.db.models import TextChoices
+
+
+class AllocationStrategy(TextChoices):
+    FIFO = "fifo", "First in, first out (taken_at)"
+    OLDEST_DUE = "oldest_due", "Oldest due first (maximum_payment_date)"
+    PRO_RATA = "pro_rata", "Pro rata (outstanding)"
@@ -0,0 +1,87 @@
+import datetime
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from apps.payments.methods import dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with synthetic customers, loans, payments and payment "
+        "details for benchmarks (see apps.payments.methods.dataset). Meant for a "
+        "local database: rows are added next to the existing ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--customers", type=int, default=100_000)
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Same seed and end date, same rows. Also part of the external_ids, "
+            "so a seed can only be loaded once per database.",
+        )
+        parser.add_argument(
+            "--end",
+            type=datetime.date.fromisoformat,
+            help="Date (YYYY-MM-DD) of the last generated rows. Default: today.",
+        )
+        parser.add_argument("--months", type=int, default=24)
+        parser.add_argument("--loans-per-customer", type=float, default=3)
+        parser.add_argument("--payments-per-loan", type=float, default=3)
+        parser.add_argument("--chunk-size", type=int, default=5_000)
+        parser.add_argument("--workers", type=int, default=os.cpu_count())
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        if connection.vendor != "postgresql":
+            raise CommandError("generate_dataset writes with COPY: PostgreSQL only.")
+        end = options["end"]
+        if end is not None:
+            end = datetime.datetime.combine(end, datetime.time(), datetime.timezone.utc)
+        spec = dataset.DatasetSpec(
+            customers=options["customers"],
+            seed=options["seed"],
+            end=end,
+            months=options["months"],
+            loans_per_customer=options["loans_per_customer"],
+            payments_per_loan=options["payments_per_loan"],
+            chunk_size=options["chunk_size"],
+        )
+        dataset.create_partitions(spec)
+
+        start = time.perf_counter()
+        totals = {model: 0 for model in dataset.COLUMNS}
+        chunks = range(spec.chunks)
+        workers = min(options["workers"], spec.chunks)
+        if workers > 1:
+            # Every worker opens its own connection.
+            connections.close_all()
+            with ProcessPoolExecutor(workers, initializer=django.setup) as executor:
+                counts = executor.map(dataset.load_chunk, [spec] * len(chunks), chunks)
+                self.add_counts(totals, counts, spec)
+        else:
+            counts = (dataset.load_chunk(spec, chunk) for chunk in chunks)
+            self.add_counts(totals, counts, spec)
+
+        with connection.cursor() as cursor:
+            for model in totals:
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+        elapsed = time.perf_counter() - start
+        for model, count in totals.items():
+            self.stdout.write(f"{count:>12} {model._meta.verbose_name_plural}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated in {elapsed:.1f}s ({workers or 1} workers)")
+        )
+
+    def add_counts(self, totals: dict, counts, spec):
+        for done, chunk_counts in enumerate(counts, 1):
+            for model, count in chunk_counts.items():
+                totals[model] += count
+            if self.verbosity > 1:
+                self.stdout.write(f"Chunk {done}/{spec.chunks} written")
@@ -0,0 +1,147 @@
+"""
+Archival of closed loans and settled payments.
+
+Loans that are PAID or REJECTED never change again, yet every scan of the hot
+tables has to step past them. archive_closed_records moves, in batches of
+ARCHIVE_BATCH_SIZE rows per transaction:
+
+  1. payments created more than ARCHIVE_RETENTION_DAYS ago that no longer
+     touch an open loan (REJECTED payments touch none), together with their
+     details, into payments_archivedpayment / payments_archivedpaymentdetail;
+  2. then loans closed more than ARCHIVE_RETENTION_DAYS ago that no payment
+     detail of the hot tables refers to any more, into loans_archivedloan.
+
+Details follow their payment, so a hot payment always has all its details and
+a loan is only archived once its payment history is. Each batch moves its rows
+with one DELETE ... RETURNING feeding an INSERT, so a row is always in exactly
+one of the two tables. Retrieve endpoints fall back to the archive by
+external_id (see ArchiveFallbackViewMixin).
+"""
+
+import datetime
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.loans.choices.loan_status import LoanStatus
+from apps.loans.models.archived_loan import ArchivedLoan
+from apps.loans.models.loans import Loan
+from apps.payments.methods.payment_distribution import OPEN_LOAN_STATUSES
+from apps.payments.models.archived_payment import ArchivedPayment
+from apps.payments.models.archived_payment_detail import ArchivedPaymentDetail
+from apps.payments.models.payment import Payment
+from apps.payments.models.payment_detail import PaymentDetail
+
+CLOSED_LOAN_STATUSES = (LoanStatus.REJECTED, LoanStatus.PAID)
+
+
+def copied_columns(archive_model) -> str:
+    """Columns shared with the hot table: all of them but archived_at."""
+    return ", ".join(
+        field.column
+        for field in archive_model._meta.concrete_fields
+        if field.name != "archived_at"
+    )
+
+
+def archive_payments_batch(cursor, cutoff: datetime.datetime, batch_size: int) -> tuple:
+    """
+    Move one batch of settled payments and their details. Returns the number of
+    payments and of details moved.
+    """
+    payment = Payment._meta.db_table
+    detail = PaymentDetail._meta.db_table
+    loan = Loan._meta.db_table
+    cursor.execute(
+        f"SELECT p.id FROM {payment} p WHERE p.created_at < %s "
+        f"AND NOT EXISTS (SELECT 1 FROM {detail} d JOIN {loan} l ON l.id = d.loan_id "
+        "WHERE d.payment_id = p.id AND l.status = ANY(%s)) "
+        "ORDER BY p.created_at LIMIT %s FOR UPDATE OF p SKIP LOCKED",
+        [cutoff, [int(status) for status in OPEN_LOAN_STATUSES], batch_size],
+    )
+    ids = [row[0] for row in cursor.fetchall()]
+    if not ids:
+        return 0, 0
+
+    # Details first: a payment cannot be deleted while details refer to it.
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {detail} WHERE payment_id = ANY(%s) RETURNING *) "
+        f"INSERT INTO {ArchivedPaymentDetail._meta.db_table} "
+        "(id, is_active, created_at, updated_at, amount, loan_external_id, payment_id) "
+        "SELECT moved.id, moved.is_active, moved.created_at, moved.updated_at, "
+        "moved.amount, l.external_id, moved.payment_id "
+        f"FROM moved JOIN {loan} l ON l.id = moved.loan_id",
+        [ids],
+    )
+    details = cursor.rowcount
+    columns = copied_columns(ArchivedPayment)
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {payment} WHERE id = ANY(%s) "
+        f"AND created_at < %s RETURNING *) "
+        f"INSERT INTO {ArchivedPayment._meta.db_table} ({columns}, archived_at) "
+        f"SELECT {columns}, now() FROM moved",
+        [ids, cutoff],
+    )
+    return cursor.rowcount, details
+
+
+def archive_loans_batch(cursor, cutoff: datetime.datetime, batch_size: int) -> int:
+    """
+    Move one batch of closed loans without hot payment details. Returns the
+    number of loans moved.
+    """
+    loan = Loan._meta.db_table
+    cursor.execute(
+        f"SELECT l.id FROM {loan} l WHERE l.status = ANY(%s) AND l.updated_at < %s "
+        f"AND NOT EXISTS (SELECT 1 FROM {PaymentDetail._meta.db_table} d "
+        "WHERE d.loan_id = l.id) "
+        "ORDER BY l.updated_at LIMIT %s FOR UPDATE SKIP LOCKED",
+        [[int(status) for status in CLOSED_LOAN_STATUSES], cutoff, batch_size],
+    )
+    ids = [row[0] for row in cursor.fetchall()]
+    if not ids:
+        return 0
+
+    columns = copied_columns(ArchivedLoan)
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {loan} WHERE id = ANY(%s) RETURNING *) "
+        f"INSERT INTO {ArchivedLoan._meta.db_table} ({columns}, archived_at) "
+        f"SELECT {columns}, now() FROM moved",
+        [ids],
+    )
+    return cursor.rowcount
+
+
+def archive_closed_records(
+    retention_days: int = None, batch_size: int = None, now=None
+) -> dict:
+    """
+    Archive the payments and loans closed for longer than ``retention_days``
+    (ARCHIVE_RETENTION_DAYS by default), ``batch_size`` rows
+    (ARCHIVE_BATCH_SIZE by default) per transaction. Returns the number of
+    rows moved per kind.
+    """
+    if retention_days is None:
+        retention_days = settings.ARCHIVE_RETENTION_DAYS
+    if batch_size is None:
+        batch_size = settings.ARCHIVE_BATCH_SIZE
+    cutoff = (now or timezone.now()) - datetime.timedelta(days=retention_days)
+    moved = {"payments": 0, "payment_details": 0, "loans": 0}
+
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            payments, details = archive_payments_batch(cursor, cutoff, batch_size)
+        moved["payments"] += payments
+        moved["payment_details"] += details
+        if payments < batch_size:
+            break
+
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            loans = archive_loans_batch(cursor, cutoff, batch_size)
+        moved["loans"] += loans
+        if loans < batch_size:
+            break
+
+    return moved
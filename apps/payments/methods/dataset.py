@@ -0,0 +1,344 @@
+"""
+Synthetic customers, loans, payments and payment details for benchmarks
+(``manage.py generate_dataset``).
+
+Customers are generated in chunks. Each chunk has its own random generator,
+seeded from the dataset seed and the chunk number, so the same seed and end
+date always produce the same rows, whatever the number of worker processes.
+Every chunk is written in one transaction with COPY.
+
+Each customer's history is replayed in time order the way the API would have
+written it. Loan amounts stay within the credit line left (score minus open
+debt), and some loans are rejected or still pending. Payments are allocated
+with the allocation engine and PAYMENT_ALLOCATION_STRATEGY, and the ones above
+the open debt are rejected. So ``Loan.outstanding`` is always ``amount`` minus
+the sum of the loan's payment details, and a completed payment's total is the
+sum of its details.
+"""
+
+import datetime
+import io
+import math
+import random
+import uuid
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from apps.customers.choices.customer_status import CustomerStatus
+from apps.customers.models.customers import Customer
+from apps.loans.choices.loan_status import LoanStatus
+from apps.loans.models.loans import Loan
+from apps.payments.choices.payment_status_choices import PaymentStatus
+from apps.payments.methods.allocation_engine import OpenLoans, allocate, from_cents
+from apps.payments.methods.partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    create_partition,
+    month_start,
+)
+from apps.payments.methods.payment_distribution import OPEN_LOAN_STATUSES
+from apps.payments.models.payment import Payment
+from apps.payments.models.payment_detail import PaymentDetail
+
+DAY = datetime.timedelta(days=1)
+MEDIAN_SCORE = 5_000
+TERMS_DAYS = (30, 60, 90, 180)
+# Loans requested in the last days before the end date are still pending.
+PENDING_DAYS = 7
+# Share of loan requests rejected regardless of the credit line, and share of
+# payments above the open debt (rejected by the API).
+REJECTED_LOANS = 0.05
+REJECTED_PAYMENTS = 0.02
+# Share of payments settling all the open debt; the others pay part of it.
+SETTLING_PAYMENTS = 0.35
+
+COLUMNS = {
+    Customer: (
+        "id",
+        "is_active",
+        "created_at",
+        "updated_at",
+        "external_id",
+        "status",
+        "score",
+        "preapproved_at",
+    ),
+    Loan: (
+        "id",
+        "is_active",
+        "created_at",
+        "updated_at",
+        "external_id",
+        "amount",
+        "status",
+        "contract_version",
+        "maximum_payment_date",
+        "taken_at",
+        "outstanding",
+        "customer_id",
+    ),
+    Payment: (
+        "id",
+        "is_active",
+        "created_at",
+        "updated_at",
+        "external_id",
+        "total_amount",
+        "status",
+        "paid_at",
+        "customer_id",
+    ),
+    PaymentDetail: (
+        "id",
+        "is_active",
+        "created_at",
+        "updated_at",
+        "amount",
+        "loan_id",
+        "payment_id",
+    ),
+}
+MONEY_COLUMNS = ("score", "amount", "outstanding", "total_amount")
+# Positions of the loan columns updated while replaying the payments.
+UPDATED_AT, STATUS, DUE_AT, TAKEN_AT, OUTSTANDING = map(
+    COLUMNS[Loan].index,
+    ("updated_at", "status", "maximum_payment_date", "taken_at", "outstanding"),
+)
+
+
+class DatasetSpec:
+    """
+    What to generate: ``customers`` customers created over the ``months``
+    months before ``end``, with about ``loans_per_customer`` loans each and
+    about ``payments_per_loan`` payments per loan.
+    """
+
+    def __init__(
+        self,
+        customers: int,
+        seed: int = 0,
+        end: datetime.datetime = None,
+        months: int = 24,
+        loans_per_customer: float = 3,
+        payments_per_loan: float = 3,
+        chunk_size: int = 5_000,
+    ):
+        if end is None:
+            today = datetime.datetime.now(datetime.timezone.utc).date()
+            end = datetime.datetime.combine(today, datetime.time(), datetime.timezone.utc)
+        self.customers = customers
+        self.seed = seed
+        self.end = end
+        self.start = end - months * 30 * DAY
+        self.loans_per_customer = loans_per_customer
+        self.payments_per_loan = payments_per_loan
+        self.chunk_size = chunk_size
+        self.strategy = settings.PAYMENT_ALLOCATION_STRATEGY
+
+    @property
+    def chunks(self) -> int:
+        return math.ceil(self.customers / self.chunk_size)
+
+
+def ordered_id(rng: random.Random, moment: datetime.datetime) -> str:
+    """
+    UUID laid out like uuid7() for ``moment``, with the random bits taken from
+    ``rng`` so it is reproducible.
+    """
+    milliseconds = int(moment.timestamp() * 1000)
+    value = (
+        milliseconds << 80
+        | 0x7 << 76
+        | rng.getrandbits(12) << 64
+        | 0b10 << 62
+        | rng.getrandbits(62)
+    )
+    return str(uuid.UUID(int=value))
+
+
+def between(rng: random.Random, start, end) -> datetime.datetime:
+    return start + (end - start) * rng.random()
+
+
+def cents(rng: random.Random, total: int, low: float, high: float) -> int:
+    return max(1, int(total * rng.uniform(low, high)))
+
+
+def customer_history(spec: DatasetSpec, rng: random.Random, index: int, rows: dict):
+    """
+    Append the rows of customer ``index`` to ``rows`` (one list per model).
+    Money is in integer cents.
+    """
+    prefix = f"ds{spec.seed}-{index}"
+    created_at = between(rng, spec.start, spec.end - PENDING_DAYS * DAY)
+    customer_id = ordered_id(rng, created_at)
+    score = (
+        int(min(max(rng.lognormvariate(math.log(MEDIAN_SCORE), 0.8), 500), 250_000)) * 100
+    )
+    rows[Customer].append(
+        [
+            customer_id,
+            True,
+            created_at,
+            created_at,
+            prefix,
+            CustomerStatus.ACTIVE if rng.random() > 0.05 else CustomerStatus.INACTIVE,
+            score,
+            created_at + rng.randint(0, 30) * DAY if rng.random() < 0.3 else None,
+        ]
+    )
+
+    loans = 0
+    if spec.loans_per_customer:
+        loans = int(rng.expovariate(1 / spec.loans_per_customer))
+    payments = round(loans * spec.payments_per_loan * rng.uniform(0.5, 1.5))
+    events = [(between(rng, created_at, spec.end), "loan") for _ in range(loans)]
+    if events:
+        first = min(moment for moment, _ in events)
+        events += [(between(rng, first, spec.end), "payment") for _ in range(payments)]
+    events.sort(key=lambda event: event[0])
+
+    # Rows of the open loans, the same lists as in rows[Loan], updated in place.
+    open_loans = []
+    for number, (moment, kind) in enumerate(events):
+        debt = sum(loan[OUTSTANDING] for loan in open_loans)
+        if kind == "loan":
+            amount = min(cents(rng, score, 0.05, 0.4), score - debt)
+            if amount < score // 100:
+                # The API refuses loans above the credit line left.
+                continue
+            if rng.random() < REJECTED_LOANS:
+                status, taken_at = LoanStatus.REJECTED, None
+            elif moment > spec.end - PENDING_DAYS * DAY:
+                status, taken_at = LoanStatus.PENDING, None
+            else:
+                status, taken_at = LoanStatus.ACTIVE, moment
+            loan = [
+                ordered_id(rng, moment),
+                True,
+                moment,
+                moment,
+                f"{prefix}-loan-{number}",
+                amount,
+                status,
+                "v1",
+                moment + rng.choice(TERMS_DAYS) * DAY,
+                taken_at,
+                amount,
+                customer_id,
+            ]
+            rows[Loan].append(loan)
+            if status in OPEN_LOAN_STATUSES:
+                open_loans.append(loan)
+            continue
+
+        if not debt:
+            continue
+        draw = rng.random()
+        if draw < REJECTED_PAYMENTS:
+            amount = debt + cents(rng, debt, 0.01, 0.5)
+        elif draw < REJECTED_PAYMENTS + SETTLING_PAYMENTS:
+            amount = debt
+        else:
+            amount = cents(rng, debt, 0.05, 0.5)
+        book = OpenLoans.from_rows(
+            (position, from_cents(loan[OUTSTANDING]), loan[TAKEN_AT], loan[DUE_AT])
+            for position, loan in enumerate(open_loans)
+        )
+        allocation = allocate(book, amount, spec.strategy)
+        payment_id = ordered_id(rng, moment)
+        rejected = allocation.rejected
+        rows[Payment].append(
+            [
+                payment_id,
+                True,
+                moment,
+                moment,
+                f"{prefix}-payment-{number}",
+                amount,
+                PaymentStatus.REJECTED if rejected else PaymentStatus.COMPLETED,
+                None if rejected else moment,
+                customer_id,
+            ]
+        )
+        for position, applied in allocation.items():
+            loan = open_loans[position]
+            loan[OUTSTANDING] -= applied
+            paid = loan[OUTSTANDING] == 0
+            loan[STATUS] = LoanStatus.PAID if paid else LoanStatus.ACTIVE
+            loan[UPDATED_AT] = moment
+            rows[PaymentDetail].append(
+                [
+                    ordered_id(rng, moment),
+                    True,
+                    moment,
+                    moment,
+                    applied,
+                    loan[0],
+                    payment_id,
+                ]
+            )
+        open_loans = [loan for loan in open_loans if loan[OUTSTANDING]]
+
+
+def create_partitions(spec: DatasetSpec):
+    """
+    Create the monthly payments partitions the dataset's dates fall in.
+    """
+    month = month_start(spec.start)
+    while month <= spec.end:
+        for table in PARTITIONED_TABLES:
+            create_partition(table, month)
+        month = add_months(month, 1)
+
+
+def build_chunk(spec: DatasetSpec, chunk: int) -> dict:
+    """
+    Rows of every model for chunk number ``chunk`` of the dataset.
+    """
+    rng = random.Random(f"{spec.seed}:{chunk}")
+    rows = {model: [] for model in COLUMNS}
+    first = chunk * spec.chunk_size
+    for index in range(first, min(first + spec.chunk_size, spec.customers)):
+        customer_history(spec, rng, index, rows)
+    return rows
+
+
+def copy_value(value, money: bool) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if money:
+        return f"{value // 100}.{value % 100:02d}"
+    return str(value)
+
+
+def copy_rows(model, rows: list):
+    """
+    Write ``rows`` of ``model`` with COPY.
+    """
+    columns = COLUMNS[model]
+    money = [column in MONEY_COLUMNS for column in columns]
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(map(copy_value, row, money)))
+        buffer.write("\n")
+    buffer.seek(0)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {model._meta.db_table} ({', '.join(columns)}) FROM STDIN", buffer
+        )
+
+
+def load_chunk(spec: DatasetSpec, chunk: int) -> dict:
+    """
+    Generate and write chunk number ``chunk`` in one transaction. Returns the
+    number of rows written per model.
+    """
+    rows = build_chunk(spec, chunk)
+    with transaction.atomic():
+        for model, model_rows in rows.items():
+            copy_rows(model, model_rows)
+    return {model: len(model_rows) for model, model_rows in rows.items()}
@@ -0,0 +1,128 @@
+"""
+Monthly range partitions of the payments tables.
+
+payments_payment and payments_paymentdetail are partitioned by ``created_at``
+month (migration 0005_monthly_partitions): one partition per month, named
+``<table>_pYYYYMM``, plus a ``<table>_default`` partition that only catches
+rows when the partitions have not been created ahead of time. The
+create_payment_partitions_task beat task keeps PAYMENT_PARTITIONS_AHEAD months
+of partitions ready. On a database that had payments before the migration,
+those rows stay in a ``<table>_before_YYYYMM`` partition holding every month
+before YYYYMM.
+
+The partition key must be part of every unique constraint, so in the database
+the primary keys are (id, created_at) and Payment.external_id is unique per
+partition only: see lock_external_id for how its global uniqueness is kept.
+Payment details reference their payment through triggers instead of a foreign
+key.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+PARTITIONED_TABLES = ("payments_payment", "payments_paymentdetail")
+
+
+def month_start(value) -> datetime.datetime:
+    return datetime.datetime(value.year, value.month, 1, tzinfo=datetime.timezone.utc)
+
+
+def add_months(month: datetime.datetime, months: int) -> datetime.datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime.datetime) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def before_partition_end(cursor, table: str):
+    """
+    Upper bound of the ``<table>_before_YYYYMM`` partition, or None.
+    """
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = %s::regclass AND c.relname ~ %s",
+        [table, rf"^{table}_before_\d{{6}}$"],
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    end = datetime.datetime.strptime(row[0][-6:], "%Y%m")
+    return end.replace(tzinfo=datetime.timezone.utc)
+
+
+def create_partition(table: str, month: datetime.datetime) -> bool:
+    """
+    Create the partition of ``table`` for ``month`` unless it exists or the
+    ``_before_`` partition holds that month. Rows of that month already in the
+    default partition are moved into it. Returns whether the partition was
+    created.
+    """
+    name = partition_name(table, month)
+    default = f"{table}_default"
+    bounds = [month, add_months(month, 1)]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [name])
+        if cursor.fetchone()[0] is not None:
+            return False
+        end = before_partition_end(cursor, table)
+        if end is not None and month < end:
+            return False
+
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {default} "
+            "WHERE created_at >= %s AND created_at < %s)",
+            bounds,
+        )
+        stray_rows = cursor.fetchone()[0]
+        if stray_rows:
+            cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {default}")
+        cursor.execute(
+            f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)",
+            bounds,
+        )
+        if stray_rows:
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {default} "
+                "WHERE created_at >= %s AND created_at < %s RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved",
+                bounds,
+            )
+            cursor.execute(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
+    return True
+
+
+def ensure_partitions(months_ahead: int = None, today=None) -> list:
+    """
+    Create the partitions of the current month and of the ``months_ahead``
+    next ones (PAYMENT_PARTITIONS_AHEAD by default) that do not exist yet.
+    Returns the names of the partitions created.
+    """
+    if months_ahead is None:
+        months_ahead = settings.PAYMENT_PARTITIONS_AHEAD
+    current = month_start(today or timezone.now())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        for table in PARTITIONED_TABLES:
+            if create_partition(table, month):
+                created.append(partition_name(table, month))
+    return created
+
+
+def lock_external_id(external_id: str):
+    """
+    Serialize the creation of payments with the same external_id until the end
+    of the transaction. The database can only enforce (external_id, created_at)
+    uniqueness on the partitioned table, so writers take this lock and then
+    check that the external_id is free.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(hashtextextended(%s, 0))",
+            [f"payment:{external_id}"],
+        )
@@ -0,0 +1,74 @@
+"""
+Domain layer on top of the allocation engine: which loans are open, what
+status a loan ends in after a payment and how a simulated payment looks.
+Shared by PaymentCreateSerializer (real payments) and the simulate endpoint.
+"""
+
+from apps.loans.choices.loan_status import LoanStatus
+from apps.payments.choices.payment_status_choices import PaymentStatus
+from apps.payments.methods.allocation_engine import (
+    OpenLoans,
+    allocate,
+    from_cents,
+    to_cents,
+)
+
+OPEN_LOAN_STATUSES = [LoanStatus.PENDING, LoanStatus.ACTIVE]
+
+
+def distribute(loans: OpenLoans, allocation):
+    """
+    Yield ``(key, applied, outstanding, status)`` for every loan touched by the
+    allocation, with amounts as Decimals and the loan status after the payment.
+    """
+    for index, cents in allocation.items():
+        left = loans.outstanding[index] - cents
+        status = LoanStatus.PAID if left == 0 else LoanStatus.ACTIVE
+        yield loans.keys[index], from_cents(cents), from_cents(left), status
+
+
+def load_open_loans(customer) -> OpenLoans:
+    """
+    Snapshot the customer's open loans, keyed by external_id, in a single query.
+    """
+    rows = (
+        customer.loans.active()
+        .filter(status__in=OPEN_LOAN_STATUSES)
+        .values_list("external_id", "outstanding", "taken_at", "maximum_payment_date")
+    )
+    return OpenLoans.from_rows(rows)
+
+
+def simulate_payments(loans: OpenLoans, amounts, strategy):
+    """
+    Allocate every candidate amount over the same snapshot without writing.
+
+    Returns one result per amount, in the order given, already in the API
+    representation (money as two-decimal strings, like DRF's DecimalField).
+    """
+    results = []
+    for amount in amounts:
+        allocation = allocate(loans, to_cents(amount), strategy)
+        if allocation.rejected:
+            status, paid = PaymentStatus.REJECTED, 0
+        else:
+            status, paid = PaymentStatus.COMPLETED, max(allocation.amount, 0)
+        results.append(
+            {
+                "total_amount": str(from_cents(allocation.amount)),
+                "status": status,
+                "remaining_debt": str(from_cents(loans.total - paid)),
+                "payment_details": [
+                    {
+                        "loan_external_id": key,
+                        "amount": str(applied),
+                        "outstanding": str(outstanding),
+                        "status": loan_status,
+                    }
+                    for key, applied, outstanding, loan_status in distribute(
+                        loans, allocation
+                    )
+                ],
+            }
+        )
+    return results
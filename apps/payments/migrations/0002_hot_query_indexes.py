@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:19
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; building the
+    # indexes this way does not block writes to the tables.
+    atomic = False
+
+    dependencies = [
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='payment',
+            index=models.Index(fields=['customer', 'created_at'], name='payment_customer_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='payment',
+            index=models.Index(fields=['created_at'], name='payment_created_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:38
+
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The partial indexes are built before the ones they replace are dropped,
+    # both concurrently, so the queries are never left without an index.
+    atomic = False
+
+    dependencies = [
+        ('payments', '0003_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='payment_live_created_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='payment',
+            name='payment_created_idx',
+        ),
+    ]
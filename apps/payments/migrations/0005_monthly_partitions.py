@@ -0,0 +1,294 @@
+import datetime
+
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+
+# Partitions created ahead of the current month; afterwards the
+# create_payment_partitions_task beat task keeps them coming.
+MONTHS_AHEAD = 3
+TABLES = ("payments_payment", "payments_paymentdetail")
+
+# Payment details cannot have a foreign key to the partitioned payments (there
+# is no unique constraint on id alone to reference). These triggers check the
+# same thing once per statement: inserted or updated details must point at an
+# existing payment, which they lock like a foreign key would (FOR KEY SHARE),
+# and deleted or updated payments must not leave details behind.
+CHECK_PAYMENT_FUNCTION = """
+CREATE FUNCTION payments_paymentdetail_check_payment() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    missing uuid;
+BEGIN
+    PERFORM 1 FROM payments_payment p
+    WHERE p.id IN (SELECT payment_id FROM new_details) FOR KEY SHARE OF p;
+    SELECT d.payment_id INTO missing FROM new_details d
+    WHERE NOT EXISTS (SELECT 1 FROM payments_payment p WHERE p.id = d.payment_id)
+    LIMIT 1;
+    IF FOUND THEN
+        RAISE foreign_key_violation USING MESSAGE = format(
+            'payment %s of payments_paymentdetail does not exist', missing
+        );
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+CHECK_DETAILS_FUNCTION = """
+CREATE FUNCTION payments_payment_check_details() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    orphaned uuid;
+BEGIN
+    SELECT o.id INTO orphaned FROM old_payments o
+    WHERE NOT EXISTS (SELECT 1 FROM payments_payment p WHERE p.id = o.id)
+    AND EXISTS (SELECT 1 FROM payments_paymentdetail d WHERE d.payment_id = o.id)
+    LIMIT 1;
+    IF FOUND THEN
+        RAISE foreign_key_violation USING MESSAGE = format(
+            'payment %s is still referenced from payments_paymentdetail', orphaned
+        );
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+TRIGGERS = (
+    "CREATE TRIGGER payments_paymentdetail_payment_insert_check AFTER INSERT "
+    "ON payments_paymentdetail REFERENCING NEW TABLE AS new_details "
+    "FOR EACH STATEMENT EXECUTE FUNCTION payments_paymentdetail_check_payment()",
+    "CREATE TRIGGER payments_paymentdetail_payment_update_check AFTER UPDATE "
+    "ON payments_paymentdetail REFERENCING NEW TABLE AS new_details "
+    "FOR EACH STATEMENT EXECUTE FUNCTION payments_paymentdetail_check_payment()",
+    "CREATE TRIGGER payments_payment_details_delete_check AFTER DELETE "
+    "ON payments_payment REFERENCING OLD TABLE AS old_payments "
+    "FOR EACH STATEMENT EXECUTE FUNCTION payments_payment_check_details()",
+    "CREATE TRIGGER payments_payment_details_update_check AFTER UPDATE "
+    "ON payments_payment REFERENCING OLD TABLE AS old_payments "
+    "FOR EACH STATEMENT EXECUTE FUNCTION payments_payment_check_details()",
+)
+
+
+def month_start(value):
+    return datetime.datetime(value.year, value.month, 1, tzinfo=datetime.timezone.utc)
+
+
+def next_month(month):
+    return (month + datetime.timedelta(days=32)).replace(day=1)
+
+
+def plain_indexes(cursor, table):
+    """
+    (name, CREATE INDEX statement) of the indexes of ``table`` that back no
+    constraint, but the unique ones built by prepare().
+    """
+    cursor.execute(
+        "SELECT c.relname, pg_get_indexdef(i.indexrelid) FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE i.indrelid = %s::regclass AND NOT EXISTS "
+        "(SELECT 1 FROM pg_constraint WHERE conindid = i.indexrelid) "
+        "ORDER BY c.relname",
+        [table],
+    )
+    return [
+        (name, definition)
+        for name, definition in cursor.fetchall()
+        if not name.endswith("_id_created_at_uniq")
+    ]
+
+
+def constraints(cursor, table, kind, references=None):
+    """
+    (name, definition) of the constraints of ``kind`` ("f", "p", "u") of
+    ``table``, optionally only those referencing the table ``references``.
+    """
+    sql = (
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = %s"
+    )
+    params = [table, kind]
+    if references:
+        sql += " AND confrelid = %s::regclass"
+        params.append(references)
+    cursor.execute(sql + " ORDER BY conname", params)
+    return cursor.fetchall()
+
+
+def prepare(schema_editor, table, bound):
+    """
+    Build what ``table`` needs to be attached as a partition without blocking
+    writes: unique indexes including created_at (concurrently) and a validated
+    check that its rows fall below ``bound``.
+    """
+    execute = schema_editor.execute
+    execute(
+        f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {table}_id_created_at_uniq "
+        f"ON {table} (id, created_at)"
+    )
+    if table == "payments_payment":
+        execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "
+            "payments_payment_external_id_created_at_uniq "
+            "ON payments_payment (external_id, created_at)"
+        )
+    execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_created_at_check")
+    execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {table}_created_at_check "
+        "CHECK (created_at < %s) NOT VALID",
+        [bound],
+    )
+    execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_created_at_check")
+
+
+def swap(schema_editor, cursor, table, bound, last):
+    """
+    Replace ``table`` by a table partitioned by created_at month. Its rows stay
+    where they are: the existing table becomes the ``<table>_before_YYYYMM``
+    partition of everything before ``bound``, with its indexes and foreign keys
+    attached to the partitioned table's. An empty table is dropped instead.
+    """
+    execute = schema_editor.execute
+    indexes = plain_indexes(cursor, table)
+    # The varchar_pattern_ops index of the formerly unique external_id goes.
+    like_indexes = [name for name, _ in indexes if name.endswith("_like")]
+    indexes = [index for index in indexes if index[0] not in like_indexes]
+    foreign_keys = constraints(cursor, table, "f")
+    cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {table})")
+    legacy = f"{table}_before_{bound:%Y%m}" if cursor.fetchone()[0] else None
+
+    if legacy:
+        execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        for name in like_indexes:
+            execute(f"DROP INDEX {name}")
+        for name, _ in indexes:
+            execute(f"ALTER INDEX {name} RENAME TO {name}_before")
+        for name, _ in constraints(cursor, legacy, "p") + constraints(cursor, legacy, "u"):
+            execute(f"ALTER TABLE {legacy} DROP CONSTRAINT {name}")
+        execute(
+            f"ALTER TABLE {legacy} ADD CONSTRAINT {legacy}_pkey "
+            f"PRIMARY KEY USING INDEX {table}_id_created_at_uniq"
+        )
+        if table == "payments_payment":
+            execute(
+                f"ALTER TABLE {legacy} ADD CONSTRAINT {legacy}_external_id_created_at_uniq "
+                "UNIQUE USING INDEX payments_payment_external_id_created_at_uniq"
+            )
+        execute(
+            f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (created_at)"
+        )
+        month = bound
+    else:
+        execute(
+            f"CREATE TABLE {table}_partitioned (LIKE {table} INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (created_at)"
+        )
+        execute(f"DROP TABLE {table}")
+        execute(f"ALTER TABLE {table}_partitioned RENAME TO {table}")
+        month = month_start(datetime.datetime.now(datetime.timezone.utc))
+
+    execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, created_at)")
+    if table == "payments_payment":
+        execute(
+            "ALTER TABLE payments_payment ADD CONSTRAINT "
+            "payments_payment_external_id_created_at_uniq UNIQUE (external_id, created_at)"
+        )
+    if legacy:
+        # The validated check lets the attach skip scanning the rows.
+        execute(
+            f"ALTER TABLE {table} ATTACH PARTITION {legacy} "
+            "FOR VALUES FROM (MINVALUE) TO (%s)",
+            [bound],
+        )
+        execute(f"ALTER TABLE {legacy} DROP CONSTRAINT {table}_created_at_check")
+    while month <= last:
+        execute(
+            f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+            "FOR VALUES FROM (%s) TO (%s)",
+            [month, next_month(month)],
+        )
+        month = next_month(month)
+    execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+    # Matching indexes and foreign keys of the old table are attached, not
+    # rebuilt or validated again.
+    for _, definition in indexes:
+        execute(definition)
+    for name, definition in foreign_keys:
+        execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+
+
+def partition(apps, schema_editor):
+    """
+    Turn payments_payment and payments_paymentdetail into tables partitioned by
+    created_at month.
+
+    The partition key must be part of every unique constraint: the primary
+    keys become (id, created_at), external_id is unique together with
+    created_at, and the foreign key of payment details to their payment is
+    replaced by triggers. No row is copied: the slow steps (index builds, range
+    check) run first without blocking writes, then one short transaction swaps
+    the tables.
+    """
+    connection = schema_editor.connection
+    current = month_start(datetime.datetime.now(datetime.timezone.utc))
+    # Rows keep arriving while the migration runs: the existing tables take
+    # everything up to the end of next month.
+    bound = next_month(next_month(current))
+    last = current
+    for _ in range(MONTHS_AHEAD):
+        last = next_month(last)
+
+    for table in TABLES:
+        prepare(schema_editor, table, bound)
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        schema_editor.execute(f"LOCK TABLE {', '.join(TABLES)} IN ACCESS EXCLUSIVE MODE")
+        for name, _ in constraints(
+            cursor, "payments_paymentdetail", "f", references="payments_payment"
+        ):
+            schema_editor.execute(
+                f"ALTER TABLE payments_paymentdetail DROP CONSTRAINT {name}"
+            )
+        for table in TABLES:
+            swap(schema_editor, cursor, table, bound, last)
+        # No parameters: the functions' format() strings use %s.
+        schema_editor.execute(CHECK_PAYMENT_FUNCTION, None)
+        schema_editor.execute(CHECK_DETAILS_FUNCTION, None)
+        for trigger in TRIGGERS:
+            schema_editor.execute(trigger)
+
+
+class Migration(migrations.Migration):
+    # The indexes are built concurrently and the range checks validated
+    # outside of the transaction that swaps the tables.
+    atomic = False
+
+    dependencies = [
+        ('customers', '0004_live_partial_indexes'),
+        ('loans', '0004_live_partial_indexes'),
+        ('payments', '0004_live_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='payment',
+                    name='external_id',
+                    field=models.CharField(max_length=60),
+                ),
+                migrations.AddConstraint(
+                    model_name='payment',
+                    constraint=models.UniqueConstraint(fields=('external_id', 'created_at'), name='payments_payment_external_id_created_at_uniq'),
+                ),
+                migrations.AlterField(
+                    model_name='paymentdetail',
+                    name='payment',
+                    field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='details', to='payments.payment'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(partition, elidable=False),
+            ],
+        ),
+    ]
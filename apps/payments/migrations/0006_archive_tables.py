@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:49
+
+import apps.common.methods.uuid7
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0004_live_partial_indexes'),
+        ('payments', '0005_monthly_partitions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPayment',
+            fields=[
+                ('id', models.UUIDField(default=apps.common.methods.uuid7.uuid7, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('external_id', models.CharField(max_length=60, unique=True)),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=20)),
+                ('status', models.IntegerField(choices=[(1, 'Completed'), (2, 'Rejected')])),
+                ('paid_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField()),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_payments', to='customers.customer')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedPaymentDetail',
+            fields=[
+                ('id', models.UUIDField(default=apps.common.methods.uuid7.uuid7, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=20)),
+                ('loan_external_id', models.CharField(db_index=True, max_length=60)),
+                ('payment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='details', to='payments.archivedpayment')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
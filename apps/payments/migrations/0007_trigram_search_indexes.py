@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:52
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    # Indexes cannot be created concurrently on a partitioned table: this one
+    # blocks writes to the payments while it is built on every partition.
+
+    dependencies = [
+        ('customers', '0005_trigram_search_indexes'),
+        ('payments', '0006_archive_tables'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('external_id'), name='gin_trgm_ops'), name='payment_external_id_trgm_idx'),
+        ),
+    ]
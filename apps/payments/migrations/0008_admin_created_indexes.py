@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes cannot be created concurrently on a partitioned table: these
+    # block writes to the payments and their details while they are built.
+
+    dependencies = [
+        ('payments', '0007_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['created_at'], name='payment_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentdetail',
+            index=models.Index(fields=['created_at'], name='paymentdetail_created_idx'),
+        ),
+    ]
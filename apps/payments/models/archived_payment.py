@@ -0,0 +1,30 @@
+from django.db.models import (
+    PROTECT,
+    CharField,
+    DateTimeField,
+    DecimalField,
+    ForeignKey,
+    IntegerField,
+)
+
+from apps.common.models.base_model import BaseModel
+from apps.customers.models.customers import Customer
+from apps.payments.choices.payment_status_choices import PaymentStatus
+
+
+class ArchivedPayment(BaseModel):
+    """
+    Settled payment moved out of the partitioned payments table by the
+    archival job (see apps.payments.methods.archive). Same columns as Payment,
+    plus the time it was archived.
+    """
+
+    external_id = CharField(max_length=60, unique=True)
+    total_amount = DecimalField(max_digits=20, decimal_places=2)
+    status = IntegerField(choices=PaymentStatus.choices)
+    paid_at = DateTimeField(null=True, blank=True)
+    customer = ForeignKey(Customer, on_delete=PROTECT, related_name="archived_payments")
+    archived_at = DateTimeField()
+
+    def __str__(self):
+        return f"Archived payment {self.external_id} – ${self.total_amount}"
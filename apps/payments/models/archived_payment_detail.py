@@ -0,0 +1,18 @@
+from django.db.models import CASCADE, CharField, DecimalField, ForeignKey
+
+from apps.common.models.base_model import BaseModel
+from apps.payments.models.archived_payment import ArchivedPayment
+
+
+class ArchivedPaymentDetail(BaseModel):
+    amount = DecimalField(max_digits=20, decimal_places=2)
+    # The loan may still be in the loans table or already archived, so it is
+    # kept by its external_id rather than by a foreign key.
+    loan_external_id = CharField(max_length=60, db_index=True)
+    payment = ForeignKey(ArchivedPayment, on_delete=CASCADE, related_name="details")
+
+    def __str__(self):
+        return (
+            f"Archived detail: ${self.amount} for Loan {self.loan_external_id} "
+            f"(Payment {self.payment.external_id})"
+        )
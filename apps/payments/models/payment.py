@@ -1,11 +1,16 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db.models import (
     PROTECT,
     CharField,
     DateTimeField,
     DecimalField,
     ForeignKey,
+    Index,
     IntegerField,
+    Q,
+    UniqueConstraint,
 )
+from django.db.models.functions import Upper
 
 from apps.common.models.base_model import BaseModel
 from apps.customers.models.customers import Customer
@@ -13,14 +18,44 @@ from apps.payments.choices.payment_status_choices import PaymentStatus
 
 
 class Payment(BaseModel):
-    external_id = CharField(max_length=60, unique=True)
+    # The table is partitioned by created_at month, which every unique
+    # constraint must include: external_id is only unique per created_at in
+    # the database. Payment creation keeps it globally unique by taking
+    # lock_external_id and checking it is free (PaymentCreateSerializer.create).
+    external_id = CharField(max_length=60)
     total_amount = DecimalField(max_digits=20, decimal_places=2)
     status = IntegerField(
         choices=PaymentStatus.choices,
         default=PaymentStatus.COMPLETED,
     )
     paid_at = DateTimeField(null=True, blank=True)
-    customer = ForeignKey(Customer, on_delete=PROTECT, related_name="payments")
+    customer = ForeignKey(
+        Customer, on_delete=PROTECT, related_name="payments", db_index=False
+    )
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["external_id", "created_at"],
+                name="payments_payment_external_id_created_at_uniq",
+            ),
+        ]
+        indexes = [
+            # Also serves the customer foreign key (PROTECT checks), so not partial.
+            Index(fields=["customer", "created_at"], name="payment_customer_created_idx"),
+            Index(
+                fields=["created_at"],
+                condition=Q(is_active=True),
+                name="payment_live_created_idx",
+            ),
+            # Admin changelist: every row, newest first.
+            Index(fields=["created_at"], name="payment_created_idx"),
+            # Admin search: icontains compiles to UPPER(external_id) LIKE '%...%'.
+            GinIndex(
+                OpClass(Upper("external_id"), name="gin_trgm_ops"),
+                name="payment_external_id_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Payment {self.external_id} – ${self.total_amount}"
@@ -1,4 +1,4 @@
-from django.db.models import CASCADE, DecimalField, ForeignKey
+from django.db.models import CASCADE, DecimalField, ForeignKey, Index
 
 from apps.common.models.base_model import BaseModel
 from apps.loans.models.loans import Loan
@@ -8,7 +8,20 @@ from apps.payments.models.payment import Payment
 class PaymentDetail(BaseModel):
     amount = DecimalField(max_digits=20, decimal_places=2)
     loan = ForeignKey(Loan, on_delete=CASCADE, related_name="payment_details")
-    payment = ForeignKey(Payment, on_delete=CASCADE, related_name="details")
+    # The payments table is partitioned (see apps.payments.methods.partitions):
+    # its primary key is (id, created_at), so there is no constraint on id alone
+    # for a foreign key to reference. Triggers of migration 0005 enforce it
+    # instead: a detail's payment must exist, and a payment with details cannot
+    # be deleted.
+    payment = ForeignKey(
+        Payment, on_delete=CASCADE, related_name="details", db_constraint=False
+    )
+
+    class Meta:
+        indexes = [
+            # Admin changelist: every row, newest first.
+            Index(fields=["created_at"], name="paymentdetail_created_idx"),
+        ]
 
     def __str__(self):
         return (
@@ -1,10 +1,20 @@
+from django.conf import settings
 from django.db.models import Sum
 from django.utils import timezone
 from rest_framework import serializers
 
+from apps.common.methods.metrics import PAYMENT_DISTRIBUTION_LOANS
+from apps.common.methods.request_timing import timed
 from apps.customers.models.customers import Customer
 from apps.loans.choices.loan_status import LoanStatus
+from apps.loans.models.loans import Loan
+from apps.payments.choices.allocation_strategy import AllocationStrategy
 from apps.payments.choices.payment_status_choices import PaymentStatus
+from apps.payments.methods.allocation_engine import OpenLoans, allocate, to_cents
+from apps.payments.methods.partitions import lock_external_id
+from apps.payments.methods.payment_distribution import OPEN_LOAN_STATUSES, distribute
+from apps.payments.models.archived_payment import ArchivedPayment
+from apps.payments.models.archived_payment_detail import ArchivedPaymentDetail
 from apps.payments.models.payment import Payment
 from apps.payments.models.payment_detail import PaymentDetail
 
@@ -46,18 +56,46 @@ class PaymentReadSerializer(serializers.ModelSerializer):
         ]
 
 
+class ArchivedPaymentDetailReadSerializer(serializers.ModelSerializer):
+    """
+    Detalle de un pago archivado: el préstamo se guarda por su external_id.
+    """
+
+    amount = serializers.DecimalField(max_digits=20, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = ArchivedPaymentDetail
+        fields = ["loan_external_id", "amount"]
+
+
+class ArchivedPaymentReadSerializer(PaymentReadSerializer):
+    """
+    Lectura de un pago archivado, con la misma forma que PaymentReadSerializer.
+    """
+
+    payment_details = ArchivedPaymentDetailReadSerializer(
+        source="details", many=True, read_only=True
+    )
+
+    class Meta(PaymentReadSerializer.Meta):
+        model = ArchivedPayment
+
+
 class PaymentCreateSerializer(serializers.ModelSerializer):
     """
     Serializer para creación de Payment con reparto automático:
       - Si total_amount > deuda total → status=REJECTED.
       - Si total_amount ≤ deuda total:
           * status=COMPLETED, paid_at=ahora.
-          * Distribuye en FIFO (por taken_at asc) hasta agotar el monto.
+          * Distribuye según PAYMENT_ALLOCATION_STRATEGY (FIFO por taken_at asc
+            por defecto) usando el motor de asignación en memoria.
           * Crea PaymentDetail y actualiza outstanding/status de cada Loan.
     """
 
     customer_external_id = serializers.SlugRelatedField(
-        source="customer", slug_field="external_id", queryset=Customer.objects.all()
+        source="customer",
+        slug_field="external_id",
+        queryset=Customer.active_objects.all(),
     )
 
     class Meta:
@@ -70,12 +108,13 @@ class PaymentCreateSerializer(serializers.ModelSerializer):
         total_amount = data["total_amount"]
 
         # 1) Calcula la deuda total pendiente
-        total_debt = (
-            customer.loans.filter(
-                status__in=[LoanStatus.PENDING, LoanStatus.ACTIVE]
-            ).aggregate(debt=Sum("outstanding"))["debt"]
-            or 0
-        )
+        with timed("debt"):
+            total_debt = (
+                customer.loans.active()
+                .filter(status__in=[LoanStatus.PENDING, LoanStatus.ACTIVE])
+                .aggregate(debt=Sum("outstanding"))["debt"]
+                or 0
+            )
 
         # 2) Permite pasar a create(), donde se registrará REJECTED o COMPLETED
         if total_amount > total_debt:
@@ -89,16 +128,31 @@ class PaymentCreateSerializer(serializers.ModelSerializer):
         total_amount = validated_data["total_amount"]
         external_id = validated_data["external_id"]
 
-        # Recalculamos deuda para evitar race conditions
-        total_debt = (
-            customer.loans.filter(
-                status__in=[LoanStatus.PENDING, LoanStatus.ACTIVE]
-            ).aggregate(debt=Sum("outstanding"))["debt"]
-            or 0
-        )
+        # La tabla está particionada: la base de datos solo garantiza que
+        # external_id sea único por mes, así que lo verificamos bajo un lock.
+        # También en el archivo; primero la tabla activa, porque el archivado
+        # mueve el pago de una a otra en una sola transacción.
+        lock_external_id(external_id)
+        if (
+            Payment.objects.filter(external_id=external_id).exists()
+            or ArchivedPayment.objects.filter(external_id=external_id).exists()
+        ):
+            raise serializers.ValidationError(
+                {"external_id": ["payment with this external id already exists."]}
+            )
+
+        # Leemos una sola vez los préstamos abiertos para evitar race conditions
+        with timed("allocation"):
+            book = OpenLoans.from_rows(
+                (loan, loan.outstanding, loan.taken_at, loan.maximum_payment_date)
+                for loan in customer.loans.active().filter(status__in=OPEN_LOAN_STATUSES)
+            )
+            allocation = allocate(
+                book, to_cents(total_amount), settings.PAYMENT_ALLOCATION_STRATEGY
+            )
 
         # 1) Si excede deuda total → REJECTED
-        if total_amount > total_debt:
+        if allocation.rejected:
             return Payment.objects.create(
                 external_id=external_id,
                 customer=customer,
@@ -116,26 +170,87 @@ class PaymentCreateSerializer(serializers.ModelSerializer):
             paid_at=timezone.now(),
         )
 
-        # 3) Reparto FIFO por taken_at
-        remaining = total_amount
-        loans = customer.loans.filter(
-            status__in=[LoanStatus.PENDING, LoanStatus.ACTIVE]
-        ).order_by("taken_at")
-        for loan in loans:
-            if remaining <= 0:
-                break
-
-            to_apply = min(loan.outstanding, remaining)
-            # guardamos detalle
-            PaymentDetail.objects.create(payment=payment, loan=loan, amount=to_apply)
-            # actualizamos préstamo
-            loan.outstanding -= to_apply
-            if loan.outstanding == 0:
-                loan.status = LoanStatus.PAID
-            else:
-                loan.status = LoanStatus.ACTIVE
-            loan.save(update_fields=["outstanding", "status"])
-
-            remaining -= to_apply
+        # 3) Aplicamos el reparto calculado por el motor de asignación
+        with timed("distribution"):
+            details, loans = [], []
+            for loan, applied, outstanding, loan_status in distribute(book, allocation):
+                loan.outstanding = outstanding
+                loan.status = loan_status
+                details.append(PaymentDetail(payment=payment, loan=loan, amount=applied))
+                loans.append(loan)
+
+            PaymentDetail.objects.bulk_create(details)
+            Loan.objects.bulk_update(loans, ["outstanding", "status"])
+        PAYMENT_DISTRIBUTION_LOANS.observe(len(details))
 
         return payment
+
+
+class PaymentSimulationSerializer(serializers.Serializer):
+    """
+    Entrada para simular un pago sin registrarlo.
+      - total_amount: un único monto a simular, o
+      - amounts: lista de montos candidatos (se simula cada uno por separado).
+      - strategy: estrategia de reparto; por defecto PAYMENT_ALLOCATION_STRATEGY.
+    """
+
+    MAX_AMOUNTS = 50
+
+    customer_external_id = serializers.SlugRelatedField(
+        source="customer",
+        slug_field="external_id",
+        queryset=Customer.active_objects.all(),
+    )
+    total_amount = serializers.DecimalField(
+        max_digits=20, decimal_places=2, required=False
+    )
+    amounts = serializers.ListField(
+        child=serializers.DecimalField(max_digits=20, decimal_places=2),
+        required=False,
+        min_length=1,
+        max_length=MAX_AMOUNTS,
+    )
+    strategy = serializers.ChoiceField(choices=AllocationStrategy.choices, required=False)
+
+    def validate(self, data):
+        if ("total_amount" in data) == ("amounts" in data):
+            raise serializers.ValidationError(
+                "Provide either total_amount or amounts, not both."
+            )
+        if "total_amount" in data:
+            data["amounts"] = [data.pop("total_amount")]
+        data.setdefault("strategy", settings.PAYMENT_ALLOCATION_STRATEGY)
+        return data
+
+
+class PaymentSimulationDetailSerializer(serializers.Serializer):
+    """
+    Reparto simulado sobre un préstamo y su estado resultante.
+    """
+
+    loan_external_id = serializers.CharField()
+    amount = serializers.DecimalField(max_digits=20, decimal_places=2)
+    outstanding = serializers.DecimalField(max_digits=12, decimal_places=2)
+    status = serializers.ChoiceField(choices=LoanStatus.choices)
+
+
+class PaymentSimulationResultSerializer(serializers.Serializer):
+    """
+    Resultado de simular un monto: estado del pago, deuda restante y reparto.
+    """
+
+    total_amount = serializers.DecimalField(max_digits=20, decimal_places=2)
+    status = serializers.ChoiceField(choices=PaymentStatus.choices)
+    remaining_debt = serializers.DecimalField(max_digits=20, decimal_places=2)
+    payment_details = PaymentSimulationDetailSerializer(many=True)
+
+
+class PaymentSimulationResponseSerializer(serializers.Serializer):
+    """
+    Salida del endpoint de simulación (una entrada en results por monto).
+    """
+
+    customer_external_id = serializers.CharField()
+    total_debt = serializers.DecimalField(max_digits=20, decimal_places=2)
+    strategy = serializers.ChoiceField(choices=AllocationStrategy.choices)
+    results = PaymentSimulationResultSerializer(many=True)
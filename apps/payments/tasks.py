@@ -0,0 +1,21 @@
+from apps.payments.methods.archive import archive_closed_records
+from apps.payments.methods.partitions import ensure_partitions
+from mo.celery import celery_app
+
+
+@celery_app.task(name="create_payment_partitions_task")
+def create_payment_partitions_task():
+    """
+    Beat task (CELERY_BEAT_SCHEDULE): create the monthly partitions of the
+    payments tables PAYMENT_PARTITIONS_AHEAD months ahead.
+    """
+    return ensure_partitions()
+
+
+@celery_app.task(name="archive_closed_records_task")
+def archive_closed_records_task():
+    """
+    Beat task (CELERY_BEAT_SCHEDULE): move the loans and payments closed for
+    more than ARCHIVE_RETENTION_DAYS into the archive tables.
+    """
+    return archive_closed_records()
@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.dateparse import parse_datetime
+
+from apps.payments.choices.allocation_strategy import AllocationStrategy
+from apps.payments.methods.allocation_engine import (
+    OpenLoans,
+    allocate,
+    from_cents,
+    to_cents,
+)
+
+
+class AllocationEngineTests(SimpleTestCase):
+    def setUp(self):
+        # loan_b was taken first, loan_a is due first, loan_c is still pending.
+        self.loans = OpenLoans.from_rows(
+            (key, amount, taken_at and parse_datetime(taken_at), parse_datetime(due))
+            for key, amount, taken_at, due in [
+                ("loan_a", "600.00", "2025-04-02T00:00:00Z", "2025-04-20T00:00:00Z"),
+                ("loan_b", "300.00", "2025-04-01T00:00:00Z", "2025-05-01T00:00:00Z"),
+                ("loan_c", "100.00", None, "2025-06-01T00:00:00Z"),
+            ]
+        )
+
+    def allocated(self, amount, strategy):
+        allocation = allocate(self.loans, to_cents(amount), strategy)
+        return {
+            self.loans.keys[index]: from_cents(cents)
+            for index, cents in allocation.items()
+        }
+
+    def test_cents_round_trip(self):
+        self.assertEqual(to_cents(Decimal("700.05")), 70005)
+        self.assertEqual(from_cents(70005), Decimal("700.05"))
+
+    def test_fifo_pays_by_taken_at_with_undated_loans_last(self):
+        """FIFO settles loan_b first, then loan_a; the undated loan goes last."""
+        self.assertEqual(
+            self.allocated("500.00", AllocationStrategy.FIFO),
+            {"loan_b": Decimal("300.00"), "loan_a": Decimal("200.00")},
+        )
+        self.assertEqual(
+            self.allocated("950.00", AllocationStrategy.FIFO),
+            {
+                "loan_b": Decimal("300.00"),
+                "loan_a": Decimal("600.00"),
+                "loan_c": Decimal("50.00"),
+            },
+        )
+
+    def test_oldest_due_pays_by_maximum_payment_date(self):
+        self.assertEqual(
+            self.allocated("700.00", AllocationStrategy.OLDEST_DUE),
+            {"loan_a": Decimal("600.00"), "loan_b": Decimal("100.00")},
+        )
+
+    def test_pro_rata_splits_by_outstanding_without_losing_cents(self):
+        allocation = self.allocated("100.01", AllocationStrategy.PRO_RATA)
+        self.assertEqual(sum(allocation.values()), Decimal("100.01"))
+        self.assertEqual(
+            allocation,
+            {
+                "loan_a": Decimal("60.01"),
+                "loan_b": Decimal("30.00"),
+                "loan_c": Decimal("10.00"),
+            },
+        )
+
+    def test_amount_above_total_debt_is_rejected(self):
+        allocation = allocate(self.loans, to_cents("1000.01"))
+        self.assertTrue(allocation.rejected)
+        self.assertEqual(list(allocation.items()), [])
+
+    def test_exact_total_debt_settles_every_loan(self):
+        for strategy in AllocationStrategy:
+            with self.subTest(strategy=strategy):
+                allocation = allocate(self.loans, self.loans.total, strategy)
+                self.assertFalse(allocation.rejected)
+                self.assertEqual(list(allocation.applied), list(self.loans.outstanding))
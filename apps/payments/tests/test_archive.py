@@ -0,0 +1,132 @@
+import datetime
+
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_api_key.models import APIKey
+
+from apps.customers.models.customers import Customer
+from apps.loans.choices.loan_status import LoanStatus
+from apps.loans.models.archived_loan import ArchivedLoan
+from apps.loans.models.loans import Loan
+from apps.payments.methods.archive import archive_closed_records
+from apps.payments.models.archived_payment import ArchivedPayment
+from apps.payments.models.payment import Payment
+from apps.payments.models.payment_detail import PaymentDetail
+from apps.payments.tasks import archive_closed_records_task
+
+LATER = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=400)
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        _, api_key = APIKey.objects.create_key(name="test")
+        self.auth = {"HTTP_X_API_KEY": api_key}
+        self.customer = Customer.objects.create(external_id="cust_arch", score=1000)
+        for external_id, loan_status in (
+            ("loan_arch_paid", LoanStatus.ACTIVE),
+            ("loan_arch_rejected", LoanStatus.REJECTED),
+        ):
+            Loan.objects.create(
+                external_id=external_id,
+                customer=self.customer,
+                amount=100,
+                outstanding=100,
+                status=loan_status,
+                taken_at="2025-04-01T00:00:00Z",
+                maximum_payment_date="2025-05-01T00:00:00Z",
+            )
+
+    def post(self, path, data):
+        return self.client.post(path, data, format="json", **self.auth)
+
+    def pay(self, external_id, amount):
+        return self.post(
+            "/payments/",
+            {
+                "external_id": external_id,
+                "customer_external_id": "cust_arch",
+                "total_amount": amount,
+            },
+        )
+
+    def test_settled_records_move_to_the_archive(self):
+        self.pay("pay_arch", "100.00")
+        self.pay("pay_arch_rejected", "500.00")
+        Loan.objects.create(
+            external_id="loan_arch_open",
+            customer=self.customer,
+            amount=50,
+            outstanding=50,
+            status=LoanStatus.ACTIVE,
+            maximum_payment_date="2025-05-01T00:00:00Z",
+        )
+        self.pay("pay_arch_open", "10.00")
+        self.assertEqual(
+            Loan.objects.get(external_id="loan_arch_paid").status, LoanStatus.PAID
+        )
+
+        self.assertEqual(
+            archive_closed_records(retention_days=30, now=LATER),
+            {"payments": 2, "payment_details": 1, "loans": 2},
+        )
+        self.assertEqual(
+            set(Payment.objects.values_list("external_id", flat=True)), {"pay_arch_open"}
+        )
+        self.assertEqual(
+            set(Loan.objects.values_list("external_id", flat=True)), {"loan_arch_open"}
+        )
+        archived = ArchivedPayment.objects.get(external_id="pay_arch")
+        self.assertEqual(
+            list(archived.details.values_list("loan_external_id", "amount")),
+            [("loan_arch_paid", 100)],
+        )
+        self.assertEqual(PaymentDetail.objects.count(), 1)
+        self.assertEqual(archive_closed_records(retention_days=30, now=LATER)["loans"], 0)
+
+    def test_retention_window_and_batches(self):
+        self.pay("pay_arch", "100.00")
+        self.assertEqual(
+            archive_closed_records(retention_days=30),
+            {"payments": 0, "payment_details": 0, "loans": 0},
+        )
+        moved = archive_closed_records(retention_days=30, batch_size=1, now=LATER)
+        self.assertEqual(moved, {"payments": 1, "payment_details": 1, "loans": 2})
+        self.assertFalse(Loan.objects.exists())
+
+    def test_retrieve_falls_back_to_the_archive(self):
+        self.pay("pay_arch", "100.00")
+        expected_payment = self.client.get("/payments/pay_arch/", **self.auth).data
+        expected_loan = self.client.get("/loans/loan_arch_paid/", **self.auth).data
+        with self.settings(ARCHIVE_RETENTION_DAYS=-1):
+            archive_closed_records_task.apply().get()
+
+        resp = self.client.get("/payments/pay_arch/", **self.auth)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data, expected_payment)
+        resp = self.client.get("/loans/loan_arch_paid/", **self.auth)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data, expected_loan)
+        self.assertEqual(
+            self.client.get("/loans/missing/", **self.auth).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        # Archived loans are read-only and their external_ids stay taken.
+        resp = self.post("/loans/loan_arch_rejected/activate/", {})
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.pay("pay_arch", "10.00").status_code, 400)
+        resp = self.post(
+            "/loans/",
+            {
+                "external_id": "loan_arch_paid",
+                "customer_external_id": "cust_arch",
+                "amount": "10.00",
+                "contract_version": "v1",
+                "maximum_payment_date": "2025-05-01T00:00:00Z",
+            },
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("external_id", resp.data)
+        self.assertFalse(ArchivedLoan.objects.filter(status=LoanStatus.ACTIVE).exists())
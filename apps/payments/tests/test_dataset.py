@@ -0,0 +1,85 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from apps.customers.models.customers import Customer
+from apps.loans.choices.loan_status import LoanStatus
+from apps.loans.models.loans import Loan
+from apps.payments.choices.payment_status_choices import PaymentStatus
+from apps.payments.methods.dataset import DatasetSpec, build_chunk
+from apps.payments.models.payment import Payment
+
+END = datetime.datetime(2025, 6, 1, tzinfo=datetime.timezone.utc)
+
+
+def fetch_all(sql: str):
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        return cursor.fetchall()
+
+
+class GenerateDatasetTests(TestCase):
+    def test_same_seed_builds_the_same_rows(self):
+        spec = DatasetSpec(customers=30, seed=3, end=END, chunk_size=10)
+        self.assertEqual(build_chunk(spec, 2), build_chunk(spec, 2))
+        other = DatasetSpec(customers=30, seed=4, end=END, chunk_size=10)
+        self.assertNotEqual(build_chunk(spec, 2), build_chunk(other, 2))
+
+    def test_generated_rows_keep_the_balance_invariants(self):
+        call_command(
+            "generate_dataset",
+            "--end=2025-06-01",
+            customers=60,
+            seed=1,
+            months=6,
+            chunk_size=25,
+            workers=1,
+            stdout=StringIO(),
+        )
+        self.assertEqual(Customer.objects.count(), 60)
+        self.assertTrue(Loan.objects.filter(status=LoanStatus.PAID).exists())
+        self.assertTrue(Payment.objects.filter(status=PaymentStatus.COMPLETED).exists())
+
+        # outstanding = amount - the loan's payment details
+        self.assertEqual(
+            fetch_all(
+                "SELECT l.id FROM loans_loan l LEFT JOIN payments_paymentdetail d "
+                "ON d.loan_id = l.id GROUP BY l.id "
+                "HAVING l.outstanding <> l.amount - COALESCE(sum(d.amount), 0) "
+                "OR (l.outstanding = 0) <> (l.status = %s)" % LoanStatus.PAID
+            ),
+            [],
+        )
+        # completed payments: total = their details; rejected ones: no details
+        self.assertEqual(
+            fetch_all(
+                "SELECT p.id FROM payments_payment p LEFT JOIN payments_paymentdetail d "
+                "ON d.payment_id = p.id GROUP BY p.id, p.status, p.total_amount "
+                "HAVING COALESCE(sum(d.amount), 0) <> "
+                "CASE WHEN p.status = %s THEN p.total_amount ELSE 0 END"
+                % PaymentStatus.COMPLETED
+            ),
+            [],
+        )
+        # open debt within the credit line, details on the payer's own loans
+        self.assertEqual(
+            fetch_all(
+                "SELECT c.id FROM customers_customer c JOIN loans_loan l "
+                "ON l.customer_id = c.id WHERE l.status IN (%s, %s) "
+                "GROUP BY c.id HAVING sum(l.outstanding) > c.score"
+                % (LoanStatus.PENDING, LoanStatus.ACTIVE)
+            ),
+            [],
+        )
+        self.assertEqual(
+            fetch_all(
+                "SELECT d.id FROM payments_paymentdetail d "
+                "JOIN payments_payment p ON p.id = d.payment_id "
+                "JOIN loans_loan l ON l.id = d.loan_id "
+                "WHERE p.customer_id <> l.customer_id"
+            ),
+            [],
+        )
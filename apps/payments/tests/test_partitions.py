@@ -0,0 +1,148 @@
+import datetime
+import uuid
+
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_api_key.models import APIKey
+
+from apps.customers.models.customers import Customer
+from apps.loans.choices.loan_status import LoanStatus
+from apps.loans.models.loans import Loan
+from apps.payments.methods.partitions import (
+    add_months,
+    ensure_partitions,
+    month_start,
+    partition_name,
+)
+from apps.payments.models.payment import Payment
+from apps.payments.models.payment_detail import PaymentDetail
+from apps.payments.tasks import create_payment_partitions_task
+
+FAR_MONTH = datetime.datetime(2031, 7, 1, tzinfo=datetime.timezone.utc)
+
+
+def partition_of(model, pk) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT tableoid::regclass::text FROM {model._meta.db_table} WHERE id = %s",
+            [pk],
+        )
+        return cursor.fetchone()[0]
+
+
+class PartitionsTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        _, api_key = APIKey.objects.create_key(name="test")
+        self.auth = {"HTTP_X_API_KEY": api_key}
+        self.customer = Customer.objects.create(external_id="cust_part", score=1000)
+        Loan.objects.create(
+            external_id="loan_part",
+            customer=self.customer,
+            amount=500,
+            outstanding=500,
+            status=LoanStatus.ACTIVE,
+            taken_at="2025-04-01T00:00:00Z",
+            maximum_payment_date="2025-05-01T00:00:00Z",
+        )
+
+    def pay(self, external_id, amount="100.00"):
+        return self.client.post(
+            "/payments/",
+            {
+                "external_id": external_id,
+                "customer_external_id": "cust_part",
+                "total_amount": amount,
+            },
+            format="json",
+            **self.auth,
+        )
+
+    def test_payments_land_in_the_month_partition(self):
+        self.assertEqual(self.pay("pay_part").status_code, status.HTTP_201_CREATED)
+        payment = Payment.objects.get(external_id="pay_part")
+        detail = payment.details.get()
+        month = month_start(payment.created_at)
+        self.assertEqual(
+            partition_of(Payment, payment.pk), partition_name("payments_payment", month)
+        )
+        self.assertEqual(
+            partition_of(type(detail), detail.pk),
+            partition_name("payments_paymentdetail", month),
+        )
+
+    def test_external_id_stays_unique_across_partitions(self):
+        self.assertEqual(self.pay("pay_dup").status_code, status.HTTP_201_CREATED)
+        Payment.objects.filter(external_id="pay_dup").update(created_at=FAR_MONTH)
+
+        resp = self.pay("pay_dup")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("external_id", resp.data)
+        self.assertEqual(Payment.objects.filter(external_id="pay_dup").count(), 1)
+
+    def test_details_cannot_outlive_their_payment(self):
+        self.pay("pay_orphan")
+        payment = Payment.objects.get(external_id="pay_orphan")
+        detail = payment.details.get()
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            PaymentDetail.objects.create(
+                payment_id=uuid.uuid4(), loan_id=detail.loan_id, amount=1
+            )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            PaymentDetail.objects.filter(pk=detail.pk).update(payment_id=uuid.uuid4())
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM payments_payment WHERE id = %s", [payment.pk])
+
+        payment.delete()
+        self.assertFalse(PaymentDetail.objects.filter(pk=detail.pk).exists())
+
+    def test_ensure_partitions_is_idempotent_and_moves_stray_rows(self):
+        self.pay("pay_stray")
+        Payment.objects.filter(external_id="pay_stray").update(created_at=FAR_MONTH)
+        payment = Payment.objects.get(external_id="pay_stray")
+        self.assertEqual(partition_of(Payment, payment.pk), "payments_payment_default")
+
+        created = ensure_partitions(months_ahead=1, today=FAR_MONTH)
+        self.assertEqual(
+            created,
+            [
+                "payments_payment_p203107",
+                "payments_paymentdetail_p203107",
+                "payments_payment_p203108",
+                "payments_paymentdetail_p203108",
+            ],
+        )
+        self.assertEqual(partition_of(Payment, payment.pk), "payments_payment_p203107")
+        self.assertEqual(ensure_partitions(months_ahead=1, today=FAR_MONTH), [])
+
+    def test_beat_task_creates_partitions_ahead(self):
+        with self.settings(PAYMENT_PARTITIONS_AHEAD=5):
+            created = create_payment_partitions_task.apply().get()
+        last = add_months(month_start(datetime.datetime.now(datetime.timezone.utc)), 5)
+        self.assertIn(partition_name("payments_payment", last), created)
+
+    def test_date_filtered_list_prunes_partitions(self):
+        self.pay("pay_recent")
+        month = month_start(datetime.datetime.now(datetime.timezone.utc))
+        resp = self.client.get(f"/payments/?created_after={month:%Y-%m-%d}", **self.auth)
+        self.assertEqual(resp.data["count"], 1)
+        resp = self.client.get("/payments/?created_before=2000-01-01", **self.auth)
+        self.assertEqual(resp.data["count"], 0)
+        resp = self.client.get("/payments/?created_before=yesterday", **self.auth)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("created_before", resp.data)
+
+        queryset = Payment.objects.filter(
+            created_at__gte=month, created_at__lt=add_months(month, 1)
+        )
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}", params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        self.assertIn(partition_name("payments_payment", month), plan)
+        self.assertNotIn("payments_payment_default", plan)
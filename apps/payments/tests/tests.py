@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 from rest_framework_api_key.models import APIKey
@@ -122,3 +124,86 @@ class PaymentViewSetTests(APITestCase):
         resp_det = self.client.get(f"{self.url}{p.external_id}/", **self.auth)
         self.assertEqual(resp_det.status_code, status.HTTP_200_OK)
         self.assertEqual(resp_det.data["external_id"], p.external_id)
+
+    def count_queries(self, method, path, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            resp = method(path, data, format="json", **self.auth)
+        self.assertLess(resp.status_code, 300)
+        return len(queries)
+
+    def test_query_counts_do_not_grow_with_the_details(self):
+        """
+        The create response and the list load the customer and the details'
+        loans up front: no query per payment or per detail.
+        """
+
+        def pay(external_id, amount):
+            payload = {
+                "external_id": external_id,
+                "customer_external_id": self.customer.external_id,
+                "total_amount": amount,
+            }
+            return self.count_queries(self.client.post, self.url, payload)
+
+        pay("pay_warm", "1.00")
+        one_detail = pay("pay_one", "1.00")
+        list_queries = self.count_queries(self.client.get, self.url)
+        self.assertEqual(pay("pay_two", "700.00"), one_detail)
+        self.assertEqual(self.count_queries(self.client.get, self.url), list_queries)
+
+    def test_simulate_payment_returns_distribution_without_writing(self):
+        """
+        POST /payments/simulate/ with total_amount=700.00:
+        - Returns the same distribution a real payment would make
+        - Reports the resulting outstanding and status of each loan
+        - Creates no payment and leaves loans unchanged.
+        """
+        payload = {
+            "customer_external_id": self.customer.external_id,
+            "total_amount": "700.00",
+        }
+        resp = self.client.post(
+            f"{self.url}simulate/", payload, format="json", **self.auth
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["total_debt"], "1000.00")
+
+        (result,) = resp.data["results"]
+        self.assertEqual(result["status"], PaymentStatus.COMPLETED)
+        self.assertEqual(result["remaining_debt"], "300.00")
+        details = {d["loan_external_id"]: d for d in result["payment_details"]}
+        self.assertEqual(details["loan_x"]["amount"], "600.00")
+        self.assertEqual(details["loan_x"]["status"], LoanStatus.PAID)
+        self.assertEqual(details["loan_y"]["outstanding"], "300.00")
+        self.assertEqual(details["loan_y"]["status"], LoanStatus.ACTIVE)
+
+        self.assertFalse(Payment.objects.exists())
+        self.loan1.refresh_from_db()
+        self.assertEqual(self.loan1.outstanding, 600)
+
+    def test_simulate_vector_of_amounts_flags_rejections(self):
+        """
+        POST /payments/simulate/ with several amounts returns one result per
+        amount, in order, marking the ones above total debt as REJECTED.
+        """
+        payload = {
+            "customer_external_id": self.customer.external_id,
+            "amounts": ["100.00", "1000.00", "1000.01"],
+        }
+        resp = self.client.post(
+            f"{self.url}simulate/", payload, format="json", **self.auth
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        statuses = [r["status"] for r in resp.data["results"]]
+        self.assertEqual(
+            statuses,
+            [PaymentStatus.COMPLETED, PaymentStatus.COMPLETED, PaymentStatus.REJECTED],
+        )
+        self.assertEqual(resp.data["results"][2]["payment_details"], [])
+
+    def test_simulate_requires_exactly_one_amount_input(self):
+        payload = {"customer_external_id": self.customer.external_id}
+        resp = self.client.post(
+            f"{self.url}simulate/", payload, format="json", **self.auth
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,10 +1,13 @@
 from django.urls import include, path
-from rest_framework import routers
 
+from apps.common.routers.async_read_router import AsyncReadRouter
+from apps.payments.views.async_payments_view import AsyncPaymentViewSet
 from apps.payments.views.payments_view import PaymentViewSet
 
-router = routers.DefaultRouter()
-router.register(r"payments", PaymentViewSet, basename="payment")
+router = AsyncReadRouter()
+router.register(
+    r"payments", PaymentViewSet, basename="payment", async_viewset=AsyncPaymentViewSet
+)
 
 urlpatterns = [
     path("", include(router.urls)),
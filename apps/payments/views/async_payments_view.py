@@ -0,0 +1,31 @@
+# apps/payments/views/async_payments_view.py
+
+from rest_framework.response import Response
+
+from apps.common.mixins.async_read_view_mixin import AsyncReadViewMixin
+from apps.payments.views.payments_view import PaymentViewSet
+
+
+class AsyncPaymentViewSet(AsyncReadViewMixin, PaymentViewSet):
+    """
+    Async (ASGI) versions of the PaymentViewSet read actions:
+      GET /api/payments/?customer_external_id={external_id}
+      GET /api/payments/{external_id}/
+
+    Serialization must not query lazily inside the event loop: the inherited
+    queryset already loads the customer and the details' loans.
+    """
+
+    async def list(self, request):
+        qs = self.filter_list_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(qs)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([payment async for payment in qs], many=True)
+        return Response(serializer.data)
+
+    async def retrieve(self, request, external_id=None):
+        payment = await self.aget_object_or_archived()
+        serializer = self.get_serializer(payment)
+        return Response(serializer.data)
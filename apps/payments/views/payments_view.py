@@ -1,9 +1,11 @@
 # apps/payments/views/payments_view.py
 
 from django.db import transaction
+from django.db.models import prefetch_related_objects
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import status, viewsets
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 
@@ -11,14 +13,31 @@ from apps.authentication.mixins.api_key_protected_view_mixin import (
     ApiKeyProtectedViewMixin,
 )
 from apps.common.methods.custom_pagination import CustomPagination
+from apps.common.methods.request_timing import timed
+from apps.common.mixins.archive_fallback_view_mixin import ArchiveFallbackViewMixin
+from apps.common.mixins.replica_read_view_mixin import ReplicaReadViewMixin
+from apps.payments.methods.allocation_engine import from_cents
+from apps.payments.methods.payment_distribution import (
+    load_open_loans,
+    simulate_payments,
+)
+from apps.payments.models.archived_payment import ArchivedPayment
 from apps.payments.models.payment import Payment
 from apps.payments.serializers.payments_serializer import (
+    ArchivedPaymentReadSerializer,
     PaymentCreateSerializer,
     PaymentReadSerializer,
+    PaymentSimulationResponseSerializer,
+    PaymentSimulationSerializer,
 )
 
 
-class PaymentViewSet(ApiKeyProtectedViewMixin, viewsets.GenericViewSet):
+class PaymentViewSet(
+    ArchiveFallbackViewMixin,
+    ReplicaReadViewMixin,
+    ApiKeyProtectedViewMixin,
+    viewsets.GenericViewSet,
+):
     """
     list:
       GET /api/payments/?customer_external_id={external_id}
@@ -30,10 +49,23 @@ class PaymentViewSet(ApiKeyProtectedViewMixin, viewsets.GenericViewSet):
 
     retrieve:
       GET /api/payments/{external_id}/
-      Returns a single payment by its external_id.
+      Returns a single payment by its external_id, archived payments included.
+
+    simulate:
+      POST /api/payments/simulate/
+      Dry-run of one or many candidate amounts; nothing is written.
     """
 
-    queryset = Payment.objects.all()
+    # The read serializer renders the customer and every detail's loan.
+    queryset = (
+        Payment.active_objects.select_related("customer")
+        .prefetch_related("details__loan")
+        .order_by("-created_at")
+    )
+    archive_queryset = ArchivedPayment.active_objects.select_related(
+        "customer"
+    ).prefetch_related("details")
+    archive_serializer_class = ArchivedPaymentReadSerializer
     lookup_field = "external_id"
     parser_classes = [JSONParser]
     pagination_class = CustomPagination
@@ -41,13 +73,41 @@ class PaymentViewSet(ApiKeyProtectedViewMixin, viewsets.GenericViewSet):
     def get_serializer_class(self):
         if self.action == "create":
             return PaymentCreateSerializer
+        if self.action == "simulate":
+            return PaymentSimulationSerializer
         return PaymentReadSerializer
 
+    def filter_list_queryset(self, queryset):
+        """
+        Apply the list filters. A created_at range lets Postgres prune the
+        monthly partitions outside it.
+        """
+        params = self.request.query_params
+        customer_id = params.get("customer_external_id")
+        if customer_id:
+            queryset = queryset.filter(customer__external_id=customer_id)
+        bounds = (
+            ("created_after", "created_at__gte"),
+            ("created_before", "created_at__lt"),
+        )
+        for param, lookup in bounds:
+            value = params.get(param)
+            if not value:
+                continue
+            try:
+                instant = serializers.DateTimeField().to_internal_value(value)
+            except serializers.ValidationError as exc:
+                raise serializers.ValidationError({param: exc.detail})
+            queryset = queryset.filter(**{lookup: instant})
+        return queryset
+
     @swagger_auto_schema(
         operation_summary="List Payments",
         operation_description=(
             "Optionally filter by passing `?customer_external_id=<id>`; "
-            "returns a list of payments matching that customer."
+            "returns a list of payments matching that customer. "
+            "`?created_after=` and `?created_before=` restrict the list to a "
+            "creation date range, which only reads the matching monthly partitions."
         ),
         manual_parameters=[
             openapi.Parameter(
@@ -56,15 +116,28 @@ class PaymentViewSet(ApiKeyProtectedViewMixin, viewsets.GenericViewSet):
                 type=openapi.TYPE_STRING,
                 description="External ID of the Customer to filter payments by",
                 required=False,
-            )
+            ),
+            openapi.Parameter(
+                name="created_after",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATETIME,
+                description="Only payments created at or after this date (ISO 8601)",
+                required=False,
+            ),
+            openapi.Parameter(
+                name="created_before",
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                format=openapi.FORMAT_DATETIME,
+                description="Only payments created before this date (ISO 8601)",
+                required=False,
+            ),
         ],
         responses={200: PaymentReadSerializer(many=True), 403: "Forbidden"},
     )
     def list(self, request):
-        customer_id = request.query_params.get("customer_external_id")
-        qs = self.get_queryset()
-        if customer_id:
-            qs = qs.filter(customer__external_id=customer_id)
+        qs = self.filter_list_queryset(self.get_queryset())
         page = self.paginate_queryset(qs)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -85,17 +158,52 @@ class PaymentViewSet(ApiKeyProtectedViewMixin, viewsets.GenericViewSet):
     @transaction.atomic
     def create(self, request):
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        with timed("validation"):
+            serializer.is_valid(raise_exception=True)
         payment = serializer.save()
+        prefetch_related_objects([payment], "details__loan")
         output = PaymentReadSerializer(payment)
         return Response(output.data, status=status.HTTP_201_CREATED)
 
     @swagger_auto_schema(
         operation_summary="Retrieve Payment",
-        operation_description="Fetch a single payment by its external_id.",
+        operation_description=(
+            "Fetch a single payment by its external_id; settled payments moved to "
+            "the archive are found there."
+        ),
         responses={200: PaymentReadSerializer, 404: "Not Found", 403: "Forbidden"},
     )
     def retrieve(self, request, external_id=None):
-        payment = self.get_object()
+        payment = self.get_object_or_archived()
         serializer = self.get_serializer(payment)
         return Response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_summary="Simulate Payment",
+        operation_description=(
+            "Dry-run of a payment: returns, for `total_amount` or each of `amounts`, "
+            "the per-loan distribution, the resulting outstanding and status of each "
+            "loan, and whether the payment would be REJECTED. Nothing is written."
+        ),
+        request_body=PaymentSimulationSerializer,
+        responses={
+            200: PaymentSimulationResponseSerializer,
+            400: "Bad Request",
+            403: "Forbidden",
+        },
+    )
+    @action(detail=False, methods=["post"])
+    def simulate(self, request):
+        serializer = self.get_serializer(data=request.data)
+        with timed("validation"):
+            serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        loans = load_open_loans(data["customer"])
+        payload = {
+            "customer_external_id": data["customer"].external_id,
+            "total_debt": str(from_cents(loans.total)),
+            "strategy": data["strategy"],
+            "results": simulate_payments(loans, data["amounts"], data["strategy"]),
+        }
+        return Response(payload)
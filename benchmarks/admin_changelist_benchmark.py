@@ -0,0 +1,191 @@
+"""
+Admin changelists of the payments and customers on big tables, with
+LargeTableAdminMixin and the trigram search indexes against the previous
+admin (exact counts, ICONTAINS searches ORed across joins, the old orderings
+and a date_hierarchy).
+
+Seeds ROWS payments over the last MONTHS months of partitions and ROWS /
+PAYMENTS_PER_CUSTOMER customers with SQL, runs VACUUM ANALYZE, and times the
+changelist pages through the admin (logged in as a superuser): first, inside a
+rolled back transaction, without the trigram indexes and with the previous
+admin options, then as they are now.
+
+Runs against a throwaway test database. Run with:
+    python -m benchmarks.admin_changelist_benchmark [rows]
+"""
+
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+from benchmarks.utils import setup_django, test_database
+
+ROWS = 10_000_000
+PAYMENTS_PER_CUSTOMER = 20
+MONTHS = 12
+REPEAT = 3
+PREVIOUS_OPTIONS = (
+    "paginator",
+    "show_full_result_count",
+    "ordering",
+    "date_hierarchy",
+    "get_search_results",
+)
+TRIGRAM_INDEXES = (
+    "customer_external_id_trgm_idx",
+    "loan_external_id_trgm_idx",
+    "payment_external_id_trgm_idx",
+)
+
+# Time ordered ids, like the uuid7 BaseModel generates: the row number in the
+# first 48 bits.
+ORDERED_ID = "(lpad(to_hex({n}), 12, '0') || substr(md5({n}::text), 1, 20))::uuid"
+
+
+def seed(rows: int):
+    from django.db import connection
+    from django.utils import timezone
+
+    from apps.payments.methods.partitions import (
+        PARTITIONED_TABLES,
+        add_months,
+        create_partition,
+        month_start,
+    )
+
+    current = month_start(timezone.now())
+    for offset in range(-MONTHS, 1):
+        for table in PARTITIONED_TABLES:
+            create_partition(table, add_months(current, offset))
+
+    customers = rows // PAYMENTS_PER_CUSTOMER
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO customers_customer (id, is_active, created_at, updated_at, "
+            "external_id, status, score) "
+            f"SELECT {ORDERED_ID.format(n='n')}, true, ts, ts, "
+            "'customer-' || md5(n::text), 1, 1000 "
+            "FROM generate_series(1, %s) n, "
+            "LATERAL (SELECT now() - make_interval(secs => %s - n) AS ts) t",
+            [customers, customers],
+        )
+        cursor.execute(
+            "INSERT INTO payments_payment (id, is_active, created_at, updated_at, "
+            "external_id, total_amount, status, paid_at, customer_id) "
+            f"SELECT {ORDERED_ID.format(n='n')}, true, ts, ts, "
+            f"'payment-' || md5((-n)::text), 10, 1, ts, {ORDERED_ID.format(n='c')} "
+            "FROM generate_series(1, %s) n, LATERAL (SELECT 1 + n %% %s AS c, "
+            "now() - make_interval(secs => (%s - n)::float8 / %s * %s * 86400) AS ts) t",
+            [rows, customers, rows, rows, MONTHS * 30],
+        )
+    with connection.cursor() as cursor:
+        cursor.execute("VACUUM ANALYZE")
+        cursor.execute(
+            "SELECT substr(external_id, 1, 16) FROM customers_customer LIMIT 1"
+        )
+        customer_term = cursor.fetchone()[0]
+    return customer_term
+
+
+def pages(customer_term: str):
+    """
+    (name, url) of the changelist pages to time.
+    """
+    from django.conf import settings
+
+    admin = f"/{settings.ADMIN_URL}"
+    return (
+        ("payments", f"{admin}/payments/payment/"),
+        ("payments, search customer", f"{admin}/payments/payment/?q={customer_term}"),
+        ("payments, search missing", f"{admin}/payments/payment/?q=nothing-like-it"),
+        ("customers", f"{admin}/customers/customer/"),
+        ("customers, search", f"{admin}/customers/customer/?q={customer_term}"),
+    )
+
+
+@contextmanager
+def previous_admin():
+    """
+    Put the admin options of the payments and customers back as they were.
+    """
+    from django.contrib import admin
+    from django.core.paginator import Paginator
+
+    from apps.customers.models.customers import Customer
+    from apps.payments.models.payment import Payment
+
+    options = (
+        (Payment, ("-paid_at",), "created_at"),
+        (Customer, ("-created_at",), None),
+    )
+    model_admins = [admin.site._registry[model] for model, _, _ in options]
+    for model_admin, (_, ordering, date_hierarchy) in zip(model_admins, options):
+        vars(model_admin).update(
+            paginator=Paginator,
+            show_full_result_count=True,
+            ordering=ordering,
+            date_hierarchy=date_hierarchy,
+            get_search_results=admin.ModelAdmin.get_search_results.__get__(model_admin),
+        )
+    try:
+        yield
+    finally:
+        for model_admin in model_admins:
+            for name in PREVIOUS_OPTIONS:
+                delattr(model_admin, name)
+
+
+def run(client, urls):
+    """
+    Median wall time (ms) of every changelist page.
+    """
+    results = []
+    for name, url in urls:
+        timings = []
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            resp = client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+            assert resp.status_code == 200, (url, resp.status_code)
+        results.append((name, statistics.median(timings)))
+    return results
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    setup_django()
+
+    from django.conf import settings
+    from django.db import connection, transaction
+    from django.test import Client
+
+    from apps.users.models.user import User
+
+    settings.SLOW_QUERY_THRESHOLD = 0  # the seeding is slow on purpose
+    settings.ALLOWED_HOSTS = ["*"]
+    with test_database():
+        customer_term = seed(rows)
+        client = Client()
+        client.force_login(User.objects.create_superuser("bench@example.com", "x"))
+        urls = pages(customer_term)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for index in TRIGRAM_INDEXES:
+                    cursor.execute(f"DROP INDEX {index}")
+            with previous_admin():
+                before = run(client, urls)
+            transaction.set_rollback(True)
+        after = run(client, urls)
+
+    print(
+        f"{rows} payments, {rows // PAYMENTS_PER_CUSTOMER} customers; "
+        f"median of {REPEAT} requests"
+    )
+    print(f"{'changelist':>26} {'before ms':>10} {'after ms':>10}")
+    for (name, old), (_, new) in zip(before, after):
+        print(f"{name:>26} {old:>10.1f} {new:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
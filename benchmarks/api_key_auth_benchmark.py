@@ -0,0 +1,73 @@
+"""
+Per-request API-key authentication overhead, before and after the verified
+key cache.
+
+  - HasAPIKey:  DB lookup + hasher check on every request (before). Measured
+                for a current SHA-512 key and for a legacy key hashed with
+                Django's password hasher (keys created before
+                djangorestframework-api-key 2.0); the legacy row includes the
+                UPDATE that resets the hash the library upgrades on success.
+  - CachedHasAPIKey: hits served by the shared tier and by the local tier.
+
+Runs against a throwaway test database. Run with:
+    python -m benchmarks.api_key_auth_benchmark
+"""
+
+from benchmarks.utils import per_call_us, setup_django, test_database
+
+NUMBER = 200
+
+
+def main():
+    setup_django()
+
+    from django.contrib.auth.hashers import make_password
+    from django.db import connection
+    from django.test import RequestFactory
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework_api_key.models import APIKey
+    from rest_framework_api_key.permissions import HasAPIKey
+
+    from apps.authentication.methods import api_key_cache
+    from apps.authentication.permissions.cached_has_api_key import CachedHasAPIKey
+
+    factory = RequestFactory()
+
+    with test_database():
+        _, key = APIKey.objects.create_key(name="bench")
+        legacy_obj, legacy_key = APIKey.objects.create_key(name="bench-legacy")
+        legacy_hash = make_password(legacy_key)
+        request = factory.get("/customers/", HTTP_X_API_KEY=key)
+        legacy_request = factory.get("/customers/", HTTP_X_API_KEY=legacy_key)
+
+        def before():
+            assert HasAPIKey().has_permission(request, view=None)
+
+        def before_legacy():
+            APIKey.objects.filter(pk=legacy_obj.pk).update(hashed_key=legacy_hash)
+            assert HasAPIKey().has_permission(legacy_request, view=None)
+
+        def shared_tier():
+            api_key_cache.clear_local()
+            assert CachedHasAPIKey().has_permission(request, view=None)
+
+        def local_tier():
+            assert CachedHasAPIKey().has_permission(request, view=None)
+
+        cases = (
+            ("HasAPIKey (sha512)", before, NUMBER),
+            ("HasAPIKey (legacy)", before_legacy, 3),
+            ("CachedHasAPIKey shared", shared_tier, NUMBER),
+            ("CachedHasAPIKey local", local_tier, NUMBER),
+        )
+        print(f"{'permission':>24} {'µs/request':>12} {'queries':>8}")
+        for name, statement, number in cases:
+            statement()
+            with CaptureQueriesContext(connection) as queries:
+                statement()
+            elapsed = per_call_us(statement, number=number, repeat=1)
+            print(f"{name:>24} {elapsed:>12.1f} {len(queries):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Read endpoints under load: gunicorn sync workers (mo.wsgi) against daphne
+processes (mo.asgi, async read views), with the same number of processes.
+
+Each of CONCURRENCY clients loops over the read endpoints for DURATION seconds.
+A "slow" client sends its request in two halves SLOW_CLIENT_DELAY seconds apart
+(a mobile connection, say): a sync worker is tied up for that whole time while
+the ASGI event loop keeps serving other connections. The RSS column is the
+memory of all server processes after the run.
+
+Under ASGI every request runs its sync code (and so its DB connection) in a
+thread of its own, so it connects per request (mo/asgi.py forces the "default"
+DATABASE_PROFILE); WSGI is measured both ways. Behind PgBouncer on the same
+host the per-request connect costs far less than against Postgres directly.
+
+Runs the servers against a throwaway test database. Needs gunicorn and daphne
+installed. Run with:
+    python -m benchmarks.asgi_load_benchmark
+"""
+
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.utils import free_port, setup_django, test_database, wait_until_listening
+
+PROCESSES = 2
+CONCURRENCY = 64
+DURATION = 5
+SLOW_CLIENT_DELAY = 0.05
+SERVERS = (
+    ("wsgi", "persistent"),
+    ("wsgi", "default"),
+    ("asgi", "default"),
+)
+PATHS = (
+    "/customers/",
+    "/customers/bench-customer/",
+    "/customers/bench-customer/balance/",
+    "/loans/?customer_external_id=bench-customer",
+)
+
+
+def rss_mb(pids) -> float:
+    """
+    Resident memory of ``pids`` and their children, from /proc (Linux).
+    """
+    total = 0
+    pending = list(pids)
+    while pending:
+        pid = pending.pop()
+        try:
+            with open(f"/proc/{pid}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+            with open(f"/proc/{pid}/task/{pid}/children") as children:
+                pending.extend(int(child) for child in children.read().split())
+        except FileNotFoundError:
+            continue
+    return total / 1024
+
+
+def start_wsgi(env):
+    port = free_port()
+    command = [
+        sys.executable, "-m", "gunicorn", "mo.wsgi:application",
+        "--workers", str(PROCESSES), "--bind", f"127.0.0.1:{port}",
+        "--log-level", "warning",
+    ]  # fmt: skip
+    return [subprocess.Popen(command, env=env)], [port]
+
+
+def start_asgi(env):
+    processes, ports = [], []
+    for _ in range(PROCESSES):
+        port = free_port()
+        command = [
+            sys.executable, "-m", "daphne", "-b", "127.0.0.1", "-p", str(port),
+            "-v", "0", "mo.asgi:application",
+        ]  # fmt: skip
+        processes.append(subprocess.Popen(command, env=env))
+        ports.append(port)
+    return processes, ports
+
+
+async def request(port: int, path: str, api_key: str, slow: bool) -> int:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    head = f"GET {path} HTTP/1.1\r\nHost: localhost\r\n"
+    rest = f"X-Api-Key: {api_key}\r\nConnection: close\r\n\r\n"
+    writer.write(head.encode())
+    if slow:
+        await writer.drain()
+        await asyncio.sleep(SLOW_CLIENT_DELAY)
+    writer.write(rest.encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split(b" ", 2)[1])
+
+
+async def load(ports, api_key: str, slow: bool):
+    latencies, errors = [], 0
+    deadline = time.monotonic() + DURATION
+
+    async def client(index: int):
+        nonlocal errors
+        port = ports[index % len(ports)]
+        step = index
+        while time.monotonic() < deadline:
+            path = PATHS[step % len(PATHS)]
+            step += 1
+            started = time.perf_counter()
+            try:
+                status = await request(port, path, api_key, slow)
+            except (OSError, IndexError, ValueError):
+                status = 0
+            if status == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    await asyncio.gather(*(client(index) for index in range(CONCURRENCY)))
+    return latencies, errors
+
+
+def main():
+    setup_django()
+
+    from django.db import connection
+    from rest_framework_api_key.models import APIKey
+
+    from apps.customers.models.customers import Customer
+    from apps.loans.models.loans import Loan
+
+    with test_database():
+        _, api_key = APIKey.objects.create_key(name="bench")
+        customer = Customer.objects.create(external_id="bench-customer", score=100_000)
+        Loan.objects.bulk_create(
+            Loan(
+                external_id=f"bench-loan-{index}",
+                customer=customer,
+                amount=100,
+                outstanding=100,
+                status=2,
+                maximum_payment_date="2030-01-01T00:00:00Z",
+            )
+            for index in range(20)
+        )
+        connection.close()
+
+        env = {
+            **os.environ,
+            "DATABASE_NAME": connection.settings_dict["NAME"],
+            "DEBUG": "False",
+            "API_KEY_THROTTLE_READ_RATE": "1000000/s",
+        }
+        print(
+            f"{PROCESSES} processes, {CONCURRENCY} concurrent clients, {DURATION}s each"
+        )
+        print(
+            f"{'server':>8} {'db conn':>11} {'clients':>8} {'req/s':>8} "
+            f"{'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'RSS MB':>8}"
+        )
+        starters = {"wsgi": start_wsgi, "asgi": start_asgi}
+        for name, profile in SERVERS:
+            processes, ports = starters[name]({**env, "DATABASE_PROFILE": profile})
+            try:
+                for port in ports:
+                    wait_until_listening(port)
+                asyncio.run(load(ports, api_key, slow=False))  # warm up
+                for slow in (False, True):
+                    latencies, errors = asyncio.run(load(ports, api_key, slow))
+                    latencies.sort()
+                    p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0
+                    print(
+                        f"{name:>8} {profile:>11} {'slow' if slow else 'fast':>8} "
+                        f"{len(latencies) / DURATION:>8.0f} "
+                        f"{statistics.median(latencies or [0]) * 1e3:>8.1f} "
+                        f"{p99 * 1e3:>8.1f} {errors:>7} "
+                        f"{rss_mb(p.pid for p in processes):>8.0f}"
+                    )
+            finally:
+                for process in processes:
+                    process.terminate()
+                for process in processes:
+                    process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Requests per second through the full WSGI stack with a new database connection
+per request (CONN_MAX_AGE=0, the "default" DATABASE_PROFILE) and with a
+persistent, health-checked connection (the "persistent" profile).
+
+Requests go through django.core.handlers.wsgi.WSGIHandler, so Django's own
+request_started/request_finished connection handling runs exactly as under
+gunicorn. The handshake cost depends on where the database is: over TLS or to
+another host it is much larger than against a local server.
+
+Runs against a throwaway test database. Run with:
+    python -m benchmarks.db_connection_benchmark
+"""
+
+import time
+
+from benchmarks.utils import setup_django, test_database
+
+REQUESTS = 500
+
+PROFILES = (
+    ("default", {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False}),
+    ("persistent", {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True}),
+)
+
+
+def main():
+    setup_django()
+
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+    from django.test import RequestFactory
+    from rest_framework_api_key.models import APIKey
+
+    from apps.customers.models.customers import Customer
+
+    settings.API_KEY_THROTTLE_RATES = {"read": "1000000/s", "write": "1000000/s"}
+    factory = RequestFactory()
+    handler = WSGIHandler()
+    opened = []
+    connection_created.connect(lambda **kwargs: opened.append(1), weak=False)
+
+    with test_database():
+        _, key = APIKey.objects.create_key(name="bench")
+        Customer.objects.create(external_id="bench-customer", score=10000)
+        path = "/customers/bench-customer/balance/"
+
+        def request():
+            environ = factory.get(path, HTTP_X_API_KEY=key).environ
+            response = handler(environ, lambda status, headers: None)
+            response.close()
+            assert response.status_code == 200, response.status_code
+
+        print(f"{'profile':>12} {'req/s':>10} {'ms/request':>12} {'connections':>12}")
+        for name, options in PROFILES:
+            connection.close()
+            connection.settings_dict.update(options)
+            request()
+            opened.clear()
+
+            started = time.perf_counter()
+            for _ in range(REQUESTS):
+                request()
+            elapsed = time.perf_counter() - started
+            print(
+                f"{name:>12} {REQUESTS / elapsed:>10.0f} "
+                f"{elapsed / REQUESTS * 1e3:>12.2f} {len(opened):>12}"
+            )
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Per-request overhead, startup time and memory of the full application
+(mo.settings: admin, sessions, CSRF, messages, Swagger...) against the lean
+API-only entry point (mo.settings_api).
+
+Each entry point runs in a fresh process, so imports and app loading are
+measured from scratch: "startup" is django.setup() plus the first request
+(which imports the URLconf and the views), "RSS" is the peak resident memory of
+the process after the run. Requests go through WSGIHandler, like under
+gunicorn, with a persistent database connection so that only the middleware and
+framework overhead differs.
+
+Runs against a throwaway test database. Run with:
+    python -m benchmarks.entry_point_benchmark
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.utils import setup_django, test_database
+
+REQUESTS = 1000
+ENTRY_POINTS = (
+    ("full", "mo.settings"),
+    ("api", "mo.settings_api"),
+)
+PATHS = ("/customers/bench-customer/", "/loans/?customer_external_id=bench-customer")
+
+
+def child(api_key: str):
+    """
+    Runs in the benchmarked process: prints its measurements as JSON.
+    """
+    started = time.perf_counter()
+    setup_django()
+
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.test import RequestFactory
+
+    factory = RequestFactory()
+    handler = WSGIHandler()
+
+    def request(path):
+        environ = factory.get(path, HTTP_X_API_KEY=api_key).environ
+        response = handler(environ, lambda status, headers: None)
+        response.close()
+        assert response.status_code == 200, response.status_code
+
+    request(PATHS[0])
+    startup = time.perf_counter() - started
+
+    timings = {}
+    for path in PATHS:
+        request(path)
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            request(path)
+        timings[path] = (time.perf_counter() - started) / REQUESTS
+    print(
+        json.dumps(
+            {
+                "startup": startup,
+                "timings": timings,
+                "rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            }
+        )
+    )
+
+
+def main():
+    setup_django()
+
+    from django.db import connection
+    from rest_framework_api_key.models import APIKey
+
+    from apps.customers.models.customers import Customer
+    from apps.loans.models.loans import Loan
+
+    with test_database():
+        _, api_key = APIKey.objects.create_key(name="bench")
+        customer = Customer.objects.create(external_id="bench-customer", score=100_000)
+        Loan.objects.bulk_create(
+            Loan(
+                external_id=f"bench-loan-{index}",
+                customer=customer,
+                amount=100,
+                outstanding=100,
+                status=2,
+                maximum_payment_date="2030-01-01T00:00:00Z",
+            )
+            for index in range(20)
+        )
+        connection.close()
+
+        env = {
+            **os.environ,
+            "DATABASE_NAME": connection.settings_dict["NAME"],
+            "DATABASE_PROFILE": "persistent",
+            "DEBUG": "False",
+            "API_KEY_THROTTLE_READ_RATE": "1000000/s",
+        }
+        print(f"{REQUESTS} requests per path")
+        print(
+            f"{'entry point':>12} {'startup ms':>11} "
+            + " ".join(f"{path[:24]:>25}" for path in PATHS)
+            + f" {'RSS MB':>8}"
+        )
+        for name, settings_module in ENTRY_POINTS:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.entry_point_benchmark", api_key],
+                env={**env, "DJANGO_SETTINGS_MODULE": settings_module},
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.splitlines()[-1])
+            print(
+                f"{name:>12} {result['startup'] * 1e3:>11.0f} "
+                + " ".join(f"{result['timings'][path] * 1e3:>22.2f} ms" for path in PATHS)
+                + f" {result['rss']:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        child(sys.argv[1])
+    else:
+        main()
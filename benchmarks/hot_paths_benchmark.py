@@ -0,0 +1,309 @@
+"""
+Latency percentiles and query counts of the API hot paths, recorded to JSON and
+compared against a stored baseline, so that a regression shows up on the commit
+that introduced it.
+
+Cases:
+  - balance/N:          GET /customers/{id}/balance/ of a customer with N open
+                        loans
+  - validate_amount/N:  LoanCreateSerializer.validate_amount against N open loans
+  - payment/N:          POST /payments/ settling N open loans
+                        (PaymentCreateSerializer.create distribution)
+  - import/N:           import_customers_task over an N line file
+  - <list> last page:   GET of the last page of the customers, loans and
+                        payments lists, over LIST_CUSTOMERS customers of
+                        generate_dataset data
+
+Writes roll back after every sample, so each one starts from the same data.
+Every case is run once to warm up, then timed SAMPLES times (fewer for the
+imports); its query count is the one of the last sample.
+
+The results go to benchmarks/results/hot_paths-<commit>.json and are compared
+with benchmarks/baselines/hot_paths.json: a case whose median is more than
+TOLERANCE above the baseline's (the tail percentiles are too noisy for a
+threshold), or which runs more queries, is a regression and makes the script
+exit with status 1. After an intended change (or on a new
+machine), store the new numbers with --update-baseline and commit them.
+
+Runs against a throwaway test database. Run with:
+    python -m benchmarks.hot_paths_benchmark [--update-baseline]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.utils import setup_django, test_database
+
+OPEN_LOANS = (1, 10, 100, 1000)
+IMPORTS = ((10_000, 3), (100_000, 1))
+LIST_CUSTOMERS = 20_000
+SAMPLES = 50
+TOLERANCE = 0.25
+RESULTS_DIR = Path(__file__).parent / "results"
+BASELINE_FILE = Path(__file__).parent / "baselines" / "hot_paths.json"
+
+
+def percentile(timings: list, fraction: float) -> float:
+    """
+    Nearest-rank percentile of ``timings`` (any number of samples).
+    """
+    ordered = sorted(timings)
+    return ordered[max(0, round(fraction * len(ordered)) - 1)]
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting queries (CaptureQueriesContext keeps at
+    most 9000 of them).
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(run, samples: int) -> dict:
+    """
+    Time ``run`` inside a rolled back transaction ``samples`` times, after one
+    warm up run.
+    """
+    from django.db import connection, transaction
+
+    timings = []
+    for sample in range(samples + 1):
+        queries = QueryCounter()
+        with transaction.atomic(), connection.execute_wrapper(queries):
+            start = time.perf_counter()
+            run()
+            elapsed = (time.perf_counter() - start) * 1000
+            transaction.set_rollback(True)
+        if sample:
+            timings.append(elapsed)
+    return {
+        "samples": samples,
+        "p50_ms": round(percentile(timings, 0.50), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "p99_ms": round(percentile(timings, 0.99), 3),
+        "queries": queries.count,
+    }
+
+
+def seed_open_loans(count: int):
+    from django.utils import timezone
+
+    from apps.customers.models.customers import Customer
+    from apps.loans.choices.loan_status import LoanStatus
+    from apps.loans.models.loans import Loan
+
+    customer = Customer.objects.create(
+        external_id=f"bench-customer-{count}", score=1_000_000
+    )
+    now = timezone.now()
+    Loan.objects.bulk_create(
+        Loan(
+            external_id=f"bench-loan-{count}-{index}",
+            customer=customer,
+            amount=100,
+            outstanding=100,
+            status=LoanStatus.ACTIVE,
+            contract_version="v1",
+            taken_at=now,
+            maximum_payment_date=now,
+        )
+        for index in range(count)
+    )
+    return customer
+
+
+def request_cases(client, auth: dict):
+    """
+    (name, run, samples) of the balance, validation and payment cases.
+    """
+    from decimal import Decimal
+
+    from apps.loans.serializers.loan_serializer import LoanCreateSerializer
+
+    cases = []
+    for count in OPEN_LOANS:
+        customer = seed_open_loans(count)
+        external_id = customer.external_id
+        loan_data = {"external_id": "bench-new-loan", "customer_external_id": external_id}
+        payment_data = {
+            "external_id": f"bench-payment-{count}",
+            "customer_external_id": external_id,
+            "total_amount": str(100 * count),
+        }
+
+        def balance(external_id=external_id):
+            resp = client.get(f"/customers/{external_id}/balance/", **auth)
+            assert resp.status_code == 200, resp.content
+
+        def validate_amount(loan_data=loan_data):
+            LoanCreateSerializer(data=loan_data).validate_amount(Decimal("100"))
+
+        def payment(payment_data=payment_data, count=count):
+            resp = client.post("/payments/", payment_data, format="json", **auth)
+            assert resp.status_code == 201, resp.content
+            assert len(resp.data["payment_details"]) == count, resp.data
+
+        cases += [
+            (f"balance/{count}", balance, SAMPLES),
+            (f"validate_amount/{count}", validate_amount, SAMPLES),
+            (f"payment/{count}", payment, SAMPLES),
+        ]
+    return cases
+
+
+def import_cases():
+    from apps.customers.tasks import import_customers_task
+
+    cases = []
+    for rows, samples in IMPORTS:
+        content = "\n".join(f"bench-import-{index},1000" for index in range(rows))
+
+        def run(content=content, rows=rows):
+            result = import_customers_task(content)
+            assert len(result["created"]) == rows, result["errors"][:5]
+
+        cases.append((f"import/{rows}", run, samples))
+    return cases
+
+
+def list_cases(client, auth: dict):
+    from apps.payments.methods import dataset
+
+    spec = dataset.DatasetSpec(
+        customers=LIST_CUSTOMERS,
+        end=datetime.datetime(2025, 6, 1, tzinfo=datetime.timezone.utc),
+    )
+    dataset.create_partitions(spec)
+    for chunk in range(spec.chunks):
+        dataset.load_chunk(spec, chunk)
+
+    cases = []
+    for name in ("customers", "loans", "payments"):
+
+        def run(name=name):
+            resp = client.get(f"/{name}/?page=last", **auth)
+            assert resp.status_code == 200, resp.content
+
+        cases.append((f"{name} last page", run, SAMPLES))
+    return cases
+
+
+def environment() -> dict:
+    from django.db import connection
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {
+        "commit": commit,
+        "recorded_at": datetime.datetime.now(datetime.timezone.utc).isoformat(
+            timespec="seconds"
+        ),
+        "python": platform.python_version(),
+        "postgresql": connection.pg_version,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(cases: dict, baseline: dict) -> list:
+    """
+    Print the cases next to their baseline; return the names of the regressions.
+    """
+    regressions = []
+    print(
+        f"{'case':>24} {'p50 ms':>9} {'p95 ms':>9} {'base p50':>9} {'change':>7} "
+        f"{'queries':>8} {'base':>6}"
+    )
+    for name, result in cases.items():
+        base = baseline.get(name)
+        if base is None:
+            print(
+                f"{name:>24} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                f"{'-':>9} {'-':>7} {result['queries']:>8} {'-':>6}"
+            )
+            continue
+        change = result["p50_ms"] / base["p50_ms"] - 1 if base["p50_ms"] else 0
+        regressed = change > TOLERANCE or result["queries"] > base["queries"]
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:>24} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+            f"{base['p50_ms']:>9.2f} {change:>+7.0%} {result['queries']:>8} "
+            f"{base['queries']:>6}{'  REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--output", type=Path, help="Default: results/hot_paths-<commit>.json"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store these results as the baseline instead of comparing.",
+    )
+    args = parser.parse_args()
+    setup_django()
+
+    from django.conf import settings
+    from rest_framework.test import APIClient
+    from rest_framework_api_key.models import APIKey
+
+    settings.SLOW_QUERY_THRESHOLD = 0  # the imports and the seeding are slow
+    settings.ALLOWED_HOSTS = ["*"]
+    settings.API_KEY_THROTTLE_RATES = {"read": "1000000/s", "write": "1000000/s"}
+    with test_database():
+        client = APIClient()
+        _, key = APIKey.objects.create_key(name="bench")
+        auth = {"HTTP_X_API_KEY": key}
+        cases = request_cases(client, auth) + import_cases() + list_cases(client, auth)
+        results = {}
+        for name, run, samples in cases:
+            results[name] = measure(run, samples)
+        report = {**environment(), "cases": results}
+
+    output = args.output or RESULTS_DIR / f"hot_paths-{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Results written to {output}")
+
+    if args.update_baseline or not args.baseline.exists():
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        compare(results, {})
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    print(f"Against the baseline of {baseline['commit']} ({baseline['recorded_at']})")
+    regressions = compare(results, baseline["cases"])
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
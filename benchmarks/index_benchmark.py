@@ -0,0 +1,198 @@
+"""
+The hot query shapes with the index pack (loans/payments/customers 0002 and
+0004 migrations) against the previous schema, which only had the foreign key
+indexes on customer_id.
+
+Seeds CUSTOMERS customers with LOANS_PER_CUSTOMER loans and
+PAYMENTS_PER_CUSTOMER payments each (DISABLED of every row soft deleted), runs
+VACUUM ANALYZE, and measures the
+server side execution time of every query with the current indexes and, inside
+a rolled back transaction, with the old ones.
+The plans (EXPLAIN without costs or ids, so they are stable) are written to
+benchmarks/explain/index_plans.txt; commit that file when the plans change.
+
+Runs against a throwaway test database. Run with:
+    python -m benchmarks.index_benchmark
+"""
+
+import re
+import statistics
+from pathlib import Path
+
+from benchmarks.utils import setup_django, test_database
+
+CUSTOMERS = 2_000
+LOANS_PER_CUSTOMER = 25
+PAYMENTS_PER_CUSTOMER = 15
+DISABLED = 0.2
+REPEAT = 200
+PLANS_FILE = Path(__file__).parent / "explain" / "index_plans.txt"
+
+NEW_INDEXES = (
+    "loan_live_open_idx",
+    "loan_customer_created_idx",
+    "loan_live_created_idx",
+    "payment_customer_created_idx",
+    "payment_live_created_idx",
+    "customer_live_created_idx",
+)
+OLD_INDEXES = (
+    "CREATE INDEX loans_loan_customer_id ON loans_loan (customer_id)",
+    "CREATE INDEX payments_payment_customer_id ON payments_payment (customer_id)",
+)
+
+
+def hot_queries(customer):
+    """
+    (name, queryset) of the query shapes the API runs on every request.
+    """
+    from django.db.models import Sum
+    from django.utils import timezone
+
+    from apps.customers.models.customers import Customer
+    from apps.loans.models.loans import Loan
+    from apps.payments.methods.partitions import month_start
+    from apps.payments.methods.payment_distribution import OPEN_LOAN_STATUSES
+    from apps.payments.models.payment import Payment
+
+    open_loans = customer.loans.active().filter(status__in=OPEN_LOAN_STATUSES)
+    loans = Loan.active_objects.select_related("customer").order_by("-created_at")
+    payments = Payment.active_objects.order_by("-created_at")
+    external_id = customer.external_id
+    return (
+        ("open loan debt", open_loans.values("customer").annotate(Sum("outstanding"))),
+        (
+            "open loans",
+            open_loans.values_list(
+                "external_id", "outstanding", "taken_at", "maximum_payment_date"
+            ),
+        ),
+        ("customer loans page", loans.filter(customer__external_id=external_id)[:10]),
+        ("loans page", loans[:10]),
+        (
+            "customer payments page",
+            payments.filter(customer__external_id=external_id)[:10],
+        ),
+        ("payments page", payments[:10]),
+        (
+            "payments page, this month",
+            payments.filter(created_at__gte=month_start(timezone.now()))[:10],
+        ),
+        ("customers page", Customer.active_objects.order_by("-created_at")[:10]),
+    )
+
+
+def seed():
+    from django.db import connection
+    from django.utils import timezone
+
+    from apps.customers.models.customers import Customer
+    from apps.loans.choices.loan_status import LoanStatus
+    from apps.loans.models.loans import Loan
+    from apps.payments.models.payment import Payment
+
+    customers = Customer.objects.bulk_create(
+        Customer(external_id=f"bench-customer-{index}", score=100_000)
+        for index in range(CUSTOMERS)
+    )
+    now = timezone.now()
+    statuses = (LoanStatus.PAID, LoanStatus.PAID, LoanStatus.REJECTED, LoanStatus.ACTIVE)
+    Loan.objects.bulk_create(
+        (
+            Loan(
+                external_id=f"bench-loan-{customer.pk}-{index}",
+                customer=customer,
+                amount=100,
+                outstanding=100,
+                status=statuses[index % len(statuses)],
+                contract_version="v1",
+                taken_at=now,
+                maximum_payment_date=now,
+            )
+            for customer in customers
+            for index in range(LOANS_PER_CUSTOMER)
+        ),
+        batch_size=5_000,
+    )
+    Payment.objects.bulk_create(
+        (
+            Payment(
+                external_id=f"bench-payment-{customer.pk}-{index}",
+                customer=customer,
+                total_amount=10,
+            )
+            for customer in customers
+            for index in range(PAYMENTS_PER_CUSTOMER)
+        ),
+        batch_size=5_000,
+    )
+    customer = customers[CUSTOMERS // 2]
+    for model in (Customer, Loan, Payment):
+        rows = model.objects.exclude(pk=customer.pk)
+        sample = rows.order_by("?").values("pk")[: int(rows.count() * DISABLED)]
+        model.objects.filter(pk__in=sample).disable()
+    with connection.cursor() as cursor:
+        cursor.execute("VACUUM ANALYZE")
+    return customer
+
+
+def run(queries):
+    """
+    Median execution time (ms, as reported by EXPLAIN ANALYZE) and plan of every
+    query.
+    """
+    from django.db import connection
+
+    results = []
+    for name, queryset in queries:
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (COSTS OFF) {sql}", params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+            plan = re.sub(r"'[0-9a-f-]{36}'::uuid", "'<uuid>'::uuid", plan)
+            timings = []
+            for _ in range(REPEAT):
+                cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}", params)
+                timings.append(cursor.fetchone()[0][0]["Execution Time"])
+        results.append((name, statistics.median(timings), plan))
+    return results
+
+
+def main():
+    setup_django()
+
+    from django.conf import settings
+    from django.db import connection, transaction
+
+    settings.SLOW_QUERY_THRESHOLD = 0  # the seeding is slow on purpose
+    with test_database():
+        customer = seed()
+        queries = hot_queries(customer)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for index in NEW_INDEXES:
+                    cursor.execute(f"DROP INDEX {index}")
+                for statement in OLD_INDEXES:
+                    cursor.execute(statement)
+                cursor.execute("ANALYZE")
+            before = run(queries)
+            transaction.set_rollback(True)
+        after = run(queries)
+
+    print(
+        f"{CUSTOMERS} customers, {CUSTOMERS * LOANS_PER_CUSTOMER} loans, "
+        f"{CUSTOMERS * PAYMENTS_PER_CUSTOMER} payments; median of {REPEAT} runs"
+    )
+    print(f"{'query':>24} {'before ms':>10} {'after ms':>10}")
+    for (name, old, _), (_, new, _) in zip(before, after):
+        print(f"{name:>24} {old:>10.3f} {new:>10.3f}")
+
+    PLANS_FILE.parent.mkdir(exist_ok=True)
+    with PLANS_FILE.open("w") as plans:
+        for name, _, plan in after:
+            plans.write(f"-- {name}\n{plan}\n\n")
+    print(f"Plans written to {PLANS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
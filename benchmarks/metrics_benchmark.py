@@ -0,0 +1,128 @@
+"""
+Cost of the Prometheus instrumentation, in single-process mode and in the
+multiprocess mode used under gunicorn (values in mmapped files in
+PROMETHEUS_MULTIPROC_DIR).
+
+For each mode, in a fresh process (the mode is picked when prometheus_client
+is imported): the cost of one counter increment and one histogram observation,
+the time per request through WSGIHandler with and without
+PrometheusMetricsMiddleware, and the time to render /metrics.
+
+Runs against a throwaway test database. Run with:
+    python -m benchmarks.metrics_benchmark
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.utils import per_call_us, setup_django, test_database
+
+REQUESTS = 1000
+MIDDLEWARE = (
+    "apps.common.middleware.prometheus_metrics_middleware.PrometheusMetricsMiddleware"
+)
+
+
+def child(api_key: str):
+    """
+    Runs in the benchmarked process: prints its measurements as JSON.
+    """
+    setup_django()
+
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.test import RequestFactory
+
+    from apps.common.methods.metrics import CACHE_LOOKUPS, REQUEST_LATENCY
+
+    counter = CACHE_LOOKUPS.labels("bench", "local_hit")
+    histogram = REQUEST_LATENCY.labels("bench", "GET", 200)
+    result = {
+        "counter_us": per_call_us(counter.inc, number=100_000),
+        "histogram_us": per_call_us(lambda: histogram.observe(0.01), number=100_000),
+    }
+
+    factory = RequestFactory()
+
+    def requests(handler, path, headers):
+        environ = factory.get(path, **headers).environ
+        response = handler(environ, lambda status, headers: None)
+        response.close()
+        assert response.status_code == 200, response.status_code
+
+    with_metrics = WSGIHandler()
+    settings.MIDDLEWARE = [name for name in settings.MIDDLEWARE if name != MIDDLEWARE]
+    without_metrics = WSGIHandler()
+
+    path, headers = "/customers/bench-customer/", {"HTTP_X_API_KEY": api_key}
+    for name, handler in (("without", without_metrics), ("with", with_metrics)):
+        requests(handler, path, headers)
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            requests(handler, path, headers)
+        result[f"request_{name}_ms"] = (time.perf_counter() - started) / REQUESTS * 1e3
+
+    settings.METRICS_TOKEN = "bench"
+    scrape = {"HTTP_AUTHORIZATION": "Bearer bench"}
+    result["scrape_ms"] = (
+        per_call_us(lambda: requests(with_metrics, "/metrics", scrape), number=20) / 1e3
+    )
+    print(json.dumps(result))
+
+
+def main():
+    setup_django()
+
+    from django.db import connection
+    from rest_framework_api_key.models import APIKey
+
+    from apps.customers.models.customers import Customer
+
+    with test_database():
+        _, api_key = APIKey.objects.create_key(name="bench")
+        Customer.objects.create(external_id="bench-customer", score=100_000)
+        connection.close()
+
+        env = {
+            **os.environ,
+            "DATABASE_NAME": connection.settings_dict["NAME"],
+            "DATABASE_PROFILE": "persistent",
+            "DEBUG": "False",
+            "API_KEY_THROTTLE_READ_RATE": "1000000/s",
+        }
+        env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+        print(
+            f"{'mode':>14} {'inc us':>7} {'observe us':>11} {'req ms':>8} "
+            f"{'req ms +metrics':>16} {'scrape ms':>10}"
+        )
+        with tempfile.TemporaryDirectory() as multiproc_dir:
+            modes = (
+                ("single", env),
+                ("multiprocess", {**env, "PROMETHEUS_MULTIPROC_DIR": multiproc_dir}),
+            )
+            for name, mode_env in modes:
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.metrics_benchmark", api_key],
+                    env=mode_env,
+                    capture_output=True,
+                    check=True,
+                    text=True,
+                ).stdout
+                result = json.loads(output.splitlines()[-1])
+                print(
+                    f"{name:>14} {result['counter_us']:>7.2f} "
+                    f"{result['histogram_us']:>11.2f} "
+                    f"{result['request_without_ms']:>8.2f} "
+                    f"{result['request_with_ms']:>16.2f} {result['scrape_ms']:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        child(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,45 @@
+"""
+Latency added by the per-API-key token bucket check.
+
+Measures ``token_bucket.take`` with the in-process fallback and, when
+REDIS_URL is set and reachable, with the Redis Lua script. The target is
+well under one millisecond per request.
+
+Run with:
+    REDIS_URL=redis://localhost:6379/0 python -m benchmarks.throttle_benchmark
+"""
+
+from benchmarks.utils import per_call_us, setup_django
+
+NUMBER = 2_000
+
+
+def main():
+    setup_django()
+
+    import redis
+    from django.conf import settings
+    from django.test import override_settings
+
+    from apps.authentication.methods import token_bucket
+
+    rate = "1000000/s"
+    backends = [("local", "")]
+    if settings.REDIS_URL:
+        backends.append(("redis", settings.REDIS_URL))
+
+    print(f"{'backend':>8} {'µs/check':>10} {'allowed':>8}")
+    for name, url in backends:
+        with override_settings(REDIS_URL=url):
+            try:
+                token_bucket.take("bench:warmup", rate)
+            except redis.RedisError as e:
+                print(f"{name:>8} unavailable: {e}")
+                continue
+            elapsed = per_call_us(lambda: token_bucket.take("bench:key", rate), NUMBER)
+            allowed = token_bucket.take("bench:key", rate) == 0
+            print(f"{name:>8} {elapsed:>10.1f} {str(allowed):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Helpers shared by the benchmark scripts.
+"""
+
+import os
+import socket
+import time
+import timeit
+from contextlib import contextmanager
+
+REPEAT = 5
+
+
+def per_call_us(statement, number: int, repeat: int = REPEAT) -> float:
+    """
+    Best per-call time of ``statement`` in microseconds.
+    """
+    return min(timeit.repeat(statement, number=number, repeat=repeat)) / number * 1e6
+
+
+def free_port() -> int:
+    """
+    A TCP port free on the loopback interface.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_listening(port: int, timeout: float = 30):
+    """
+    Wait for a server started in another process to accept connections.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def setup_django(settings_module: str = "mo.settings"):
+    """
+    Configure Django for a standalone benchmark script.
+    """
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """
+    Create a throwaway test database, exactly like ``manage.py test`` does, and
+    destroy it on exit. The configured database is never touched.
+    """
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
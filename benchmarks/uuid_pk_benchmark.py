@@ -0,0 +1,89 @@
+"""
+Insert throughput and primary key index size with random (uuid4) and
+time-ordered (uuid7, what BaseModel generates) primary keys.
+
+Bulk loads ROWS payment-like rows into an empty table per key version, in
+batches of BATCH with COPY, the keys generated client side like Django does.
+Random keys land on random leaf pages of the primary key B-tree: once the
+index outgrows shared_buffers most inserts read and dirty a page that is not
+in memory, and half-full pages from the splits bloat it. Time-ordered keys
+always append to the rightmost leaf.
+
+Runs against a throwaway test database. Run with:
+    python -m benchmarks.uuid_pk_benchmark [rows]
+"""
+
+import io
+import sys
+import time
+import uuid
+
+from benchmarks.utils import setup_django, test_database
+
+ROWS = 10_000_000
+BATCH = 50_000
+TABLE = """
+    CREATE TABLE bench_{name} (
+        id uuid PRIMARY KEY,
+        customer_id uuid NOT NULL,
+        total_amount numeric(20, 2) NOT NULL,
+        created_at timestamptz NOT NULL DEFAULT now()
+    )
+"""
+
+
+def load(cursor, name: str, new_id, rows: int) -> float:
+    """
+    Load ``rows`` rows into bench_``name``; returns the elapsed seconds.
+    """
+    customer = str(uuid.uuid4())
+    cursor.execute(TABLE.format(name=name))
+    started = time.perf_counter()
+    for offset in range(0, rows, BATCH):
+        buffer = io.StringIO(
+            "".join(
+                f"{new_id()}\t{customer}\t10.00\n"
+                for _ in range(min(BATCH, rows - offset))
+            )
+        )
+        cursor.copy_from(
+            buffer, f"bench_{name}", columns=("id", "customer_id", "total_amount")
+        )
+    return time.perf_counter() - started
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    setup_django()
+
+    from django.db import connection
+
+    from apps.common.methods.uuid7 import uuid7
+
+    with test_database():
+        connection.ensure_connection()
+        raw = connection.connection
+        raw.autocommit = True
+        with raw.cursor() as cursor:
+            cursor.execute("SHOW shared_buffers")
+            print(
+                f"{rows} rows, batches of {BATCH}, shared_buffers={cursor.fetchone()[0]}"
+            )
+            print(f"{'key':>6} {'rows/s':>10} {'pkey MB':>9} {'leaf fill %':>12}")
+            for name, new_id in (("uuid4", uuid.uuid4), ("uuid7", uuid7)):
+                elapsed = load(cursor, name, new_id, rows)
+                cursor.execute(
+                    "SELECT pg_relation_size(%s) / 1048576.0",
+                    [f"bench_{name}_pkey"],
+                )
+                size = cursor.fetchone()[0]
+                # 16 bytes of key plus 8 of tuple header and 4 of line pointer
+                # per entry, on 8 kB pages.
+                fill = rows * 28 / (size * 1048576) * 100
+                print(f"{name:>6} {rows / elapsed:>10.0f} {size:>9.1f} {fill:>12.1f}")
+                cursor.execute(f"DROP TABLE bench_{name}")
+        raw.autocommit = False
+
+
+if __name__ == "__main__":
+    main()
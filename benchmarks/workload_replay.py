@@ -0,0 +1,426 @@
+"""
+Load test replaying a mix of API traffic against the API entry point, served
+by gunicorn (mo.wsgi_api) and by daphne (mo.asgi_api), to check capacity plans
+before the month-end peaks.
+
+The mix gives the share of each operation:
+  - loan_create:  POST /loans/
+  - payment:      POST /payments/
+  - balance:      GET /customers/{external_id}/balance/
+  - list_page:    GET a page of the customers, loans or payments lists
+  - upload:       POST /customers/upload/ with UPLOAD_ROWS new customers
+It is either a JSON file of weights (benchmarks/workloads/month_end.json by
+default) or recorded traffic: the ``request_timing`` log lines of
+ServerTimingMiddleware, replayed in their recorded order. Operations go to
+customers of a generate_dataset dataset, skewed towards a few busy customers,
+with a throwaway API key created by the harness. After its first request every
+worker verifies that key from CachedHasAPIKey's in-process tier, and the
+throttle rates are lifted, so the key costs no more than it would in
+production.
+
+The servers run with USE_CELERY=False, whatever mo/.env says: each upload
+imports its file inline, so its latency and locks include the import work a
+Celery worker would do in production, instead of a 202 from the broker (or the
+broker's connection retries). SLOW_QUERY_THRESHOLD=0 turns off the slow query
+log in the servers, so no EXPLAIN is captured under load.
+
+CONCURRENCY clients each send one request at a time for DURATION seconds,
+spread over PROCESSES server processes. While they run, pg_stat_activity is
+sampled every LOCK_SAMPLE_INTERVAL seconds: the lock-wait time is the time the
+server's database sessions spent waiting on heavyweight locks (row locks,
+the payments' advisory locks...), by lock type.
+
+Runs the servers against a throwaway test database. Needs gunicorn and daphne
+installed. Run with:
+    python -m benchmarks.workload_replay [--mix FILE | --log FILE]
+        [--servers wsgi,asgi] [--concurrency N] [--duration S] [--output FILE]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from benchmarks.utils import free_port, setup_django, test_database, wait_until_listening
+
+PROCESSES = 2
+CONCURRENCY = 32
+DURATION = 30
+CUSTOMERS = 5_000
+UPLOAD_ROWS = 50
+LIST_PAGES = 50
+LOCK_SAMPLE_INTERVAL = 0.05
+MIX_FILE = Path(__file__).parent / "workloads" / "month_end.json"
+OPERATIONS = ("loan_create", "payment", "balance", "list_page", "upload")
+
+# Recorded request (method, path) → operation.
+RECORDED_OPERATIONS = (
+    ("POST", re.compile(r"^/loans/$"), "loan_create"),
+    ("POST", re.compile(r"^/payments/$"), "payment"),
+    ("GET", re.compile(r"^/customers/[^/]+/balance/$"), "balance"),
+    ("GET", re.compile(r"^/(customers|loans|payments)/$"), "list_page"),
+    ("POST", re.compile(r"^/customers/upload/$"), "upload"),
+)
+
+
+def recorded_operations(log: Path) -> list:
+    """
+    Operations of the ``request_timing`` lines of a log, in order. Requests of
+    other endpoints are skipped.
+    """
+    operations = []
+    for line in log.read_text().splitlines():
+        _, marker, entry = line.partition("request_timing ")
+        if not marker:
+            continue
+        request = json.loads(entry)
+        path = request["path"].split("?")[0]
+        for method, pattern, operation in RECORDED_OPERATIONS:
+            if request["method"] == method and pattern.match(path):
+                operations.append(operation)
+                break
+    if not operations:
+        raise SystemExit(f"No replayable request_timing lines in {log}")
+    return operations
+
+
+def weighted_operations(mix: Path, count: int = 10_000, seed: int = 0) -> list:
+    weights = json.loads(mix.read_text())["weights"]
+    unknown = set(weights) - set(OPERATIONS)
+    if unknown:
+        raise SystemExit(f"Unknown operations in {mix}: {', '.join(sorted(unknown))}")
+    rng = random.Random(seed)
+    return rng.choices(list(weights), list(weights.values()), k=count)
+
+
+class RequestFactory:
+    """
+    Builds the HTTP request of each operation, on the customers of the dataset.
+    """
+
+    def __init__(self, customers: list, seed: int):
+        self.customers = customers
+        self.rng = random.Random(seed)
+        self.run = uuid.uuid4().hex[:8]
+        self.sequence = 0
+
+    def customer(self) -> str:
+        # A cube of a uniform draw: a tenth of the customers get half the traffic.
+        return self.customers[int(len(self.customers) * self.rng.random() ** 3)]
+
+    def external_id(self, kind: str) -> str:
+        self.sequence += 1
+        return f"load-{self.run}-{kind}-{self.sequence}"
+
+    def build(self, operation: str):
+        """
+        ``(method, path, content_type, body)`` of one request.
+        """
+        if operation == "loan_create":
+            body = {
+                "external_id": self.external_id("loan"),
+                "customer_external_id": self.customer(),
+                "amount": "10.00",
+                "contract_version": "v1",
+                "maximum_payment_date": "2030-01-01T00:00:00Z",
+            }
+            return "POST", "/loans/", "application/json", json.dumps(body).encode()
+        if operation == "payment":
+            body = {
+                "external_id": self.external_id("payment"),
+                "customer_external_id": self.customer(),
+                "total_amount": f"{self.rng.randint(1, 50)}.00",
+            }
+            return "POST", "/payments/", "application/json", json.dumps(body).encode()
+        if operation == "balance":
+            return "GET", f"/customers/{self.customer()}/balance/", None, b""
+        if operation == "list_page":
+            name = self.rng.choice(("customers", "loans", "payments"))
+            page = self.rng.randint(1, LIST_PAGES)
+            return "GET", f"/{name}/?page={page}", None, b""
+        lines = "\n".join(
+            f"{self.external_id('customer')},1000" for _ in range(UPLOAD_ROWS)
+        )
+        boundary = uuid.uuid4().hex
+        body = (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="customers.csv"\r\n'
+            "Content-Type: text/plain\r\n\r\n"
+            f"{lines}\r\n--{boundary}--\r\n"
+        ).encode()
+        content_type = f"multipart/form-data; boundary={boundary}"
+        return "POST", "/customers/upload/", content_type, body
+
+
+async def request(port: int, api_key: str, method, path, content_type, body) -> int:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    head = (
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nX-Api-Key: {api_key}\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n"
+    )
+    if content_type:
+        head += f"Content-Type: {content_type}\r\n"
+    writer.write(head.encode() + b"\r\n" + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split(b" ", 2)[1])
+
+
+async def load(ports, api_key: str, operations: list, factory, concurrency, duration):
+    """
+    Run the operations in order, cycling, from ``concurrency`` clients.
+    Returns the latencies and the error statuses of every operation.
+    """
+    latencies, errors = defaultdict(list), defaultdict(Counter)
+    deadline = time.monotonic() + duration
+    position = 0
+
+    async def client(index: int):
+        nonlocal position
+        port = ports[index % len(ports)]
+        while time.monotonic() < deadline:
+            operation = operations[position % len(operations)]
+            position += 1
+            started = time.perf_counter()
+            try:
+                status = await request(port, api_key, *factory.build(operation))
+            except (OSError, IndexError, ValueError):
+                status = 0
+            if 200 <= status < 300:
+                latencies[operation].append(time.perf_counter() - started)
+            else:
+                errors[operation][status] += 1
+
+    await asyncio.gather(*(client(index) for index in range(concurrency)))
+    return latencies, errors
+
+
+class LockWaitSampler(threading.Thread):
+    """
+    Samples the sessions of the database waiting on a lock, on a connection of
+    its own, until stopped. ``waits`` holds the seconds waited by lock type.
+    """
+
+    def __init__(self, settings_dict: dict, interval: float = LOCK_SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.settings_dict = settings_dict
+        self.interval = interval
+        self.waits = Counter()
+        self.max_waiting = 0
+        self.stopped = threading.Event()
+
+    def run(self):
+        import psycopg2
+
+        settings_dict = self.settings_dict
+        conn = psycopg2.connect(
+            dbname=settings_dict["NAME"],
+            user=settings_dict["USER"],
+            password=settings_dict["PASSWORD"],
+            host=settings_dict["HOST"],
+            port=settings_dict["PORT"],
+        )
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cursor:
+                while not self.stopped.wait(self.interval):
+                    cursor.execute(
+                        "SELECT wait_event, count(*) FROM pg_stat_activity "
+                        "WHERE datname = current_database() AND wait_event_type = 'Lock' "
+                        "AND pid <> pg_backend_pid() GROUP BY wait_event"
+                    )
+                    rows = cursor.fetchall()
+                    for wait_event, waiting in rows:
+                        self.waits[wait_event] += waiting * self.interval
+                    self.max_waiting = max(self.max_waiting, sum(n for _, n in rows))
+        finally:
+            conn.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def start_servers(kind: str, env: dict, processes: int):
+    if kind == "wsgi":
+        port = free_port()
+        command = [
+            sys.executable, "-m", "gunicorn", "mo.wsgi_api:application",
+            "--workers", str(processes), "--bind", f"127.0.0.1:{port}",
+            "--log-level", "warning",
+        ]  # fmt: skip
+        return [subprocess.Popen(command, env=env)], [port]
+    servers, ports = [], []
+    for _ in range(processes):
+        port = free_port()
+        command = [
+            sys.executable, "-m", "daphne", "-b", "127.0.0.1", "-p", str(port),
+            "-v", "0", "mo.asgi_api:application",
+        ]  # fmt: skip
+        servers.append(subprocess.Popen(command, env=env))
+        ports.append(port)
+    return servers, ports
+
+
+def percentile_ms(latencies: list, fraction: float) -> float:
+    if not latencies:
+        return 0.0
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+
+def summary(latencies, errors, duration: float) -> dict:
+    rows = {}
+    for operation in (*OPERATIONS, "total"):
+        if operation == "total":
+            timings = [t for values in latencies.values() for t in values]
+            failed = sum(sum(statuses.values()) for statuses in errors.values())
+            statuses = sum(errors.values(), Counter())
+        else:
+            timings = latencies.get(operation, [])
+            statuses = errors.get(operation, Counter())
+            failed = sum(statuses.values())
+        if not timings and not failed:
+            continue
+        rows[operation] = {
+            "requests": len(timings),
+            "rps": round(len(timings) / duration, 1),
+            "p50_ms": round(percentile_ms(timings, 0.50), 2),
+            "p95_ms": round(percentile_ms(timings, 0.95), 2),
+            "p99_ms": round(percentile_ms(timings, 0.99), 2),
+            "errors": {str(status): count for status, count in statuses.items()},
+        }
+    return rows
+
+
+def print_report(server: str, rows: dict, sampler: LockWaitSampler):
+    print(
+        f"{server:>5} {'operation':>12} {'requests':>9} {'req/s':>8} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+    )
+    for operation, row in rows.items():
+        print(
+            f"{'':>5} {operation:>12} {row['requests']:>9} {row['rps']:>8.1f} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+            f"{sum(row['errors'].values()):>7}"
+        )
+    waits = ", ".join(
+        f"{event} {seconds:.2f}s" for event, seconds in sampler.waits.items()
+    )
+    print(
+        f"{'':>5} lock wait {sum(sampler.waits.values()):.2f}s"
+        f"{f' ({waits})' if waits else ''}, "
+        f"at most {sampler.max_waiting} sessions waiting"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--mix", type=Path, default=MIX_FILE)
+    source.add_argument("--log", type=Path, help="Replay request_timing log lines.")
+    parser.add_argument("--servers", default="wsgi,asgi")
+    parser.add_argument("--processes", type=int, default=PROCESSES)
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--duration", type=float, default=DURATION)
+    parser.add_argument("--customers", type=int, default=CUSTOMERS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON.")
+    args = parser.parse_args()
+    operations = (
+        recorded_operations(args.log)
+        if args.log
+        else weighted_operations(args.mix, seed=args.seed)
+    )
+    setup_django()
+
+    from django.conf import settings
+    from django.db import connection
+    from rest_framework_api_key.models import APIKey
+
+    from apps.customers.models.customers import Customer
+    from apps.payments.methods import dataset
+
+    settings.SLOW_QUERY_THRESHOLD = 0  # the seeding is slow on purpose
+    results = {"operations": dict(Counter(operations)), "servers": {}}
+    with test_database():
+        spec = dataset.DatasetSpec(customers=args.customers, seed=args.seed, months=3)
+        dataset.create_partitions(spec)
+        for chunk in range(spec.chunks):
+            dataset.load_chunk(spec, chunk)
+        customers = list(
+            Customer.objects.order_by("external_id").values_list("external_id", flat=True)
+        )
+        _, api_key = APIKey.objects.create_key(name="load test")
+        settings_dict = dict(connection.settings_dict)
+        connection.close()
+
+        env = {
+            **os.environ,
+            "DATABASE_NAME": settings_dict["NAME"],
+            "DEBUG": "False",
+            "API_KEY_THROTTLE_READ_RATE": "1000000/s",
+            "API_KEY_THROTTLE_WRITE_RATE": "1000000/s",
+            # Not mo/.env's broker: uploads import inline, like a worker would.
+            "USE_CELERY": "False",
+            "SLOW_QUERY_THRESHOLD": "0",
+        }
+        print(
+            f"{len(customers)} customers, {args.processes} processes, "
+            f"{args.concurrency} concurrent clients, {args.duration:.0f}s per server"
+        )
+        for server in args.servers.split(","):
+            servers, ports = start_servers(server, env, args.processes)
+            try:
+                for port in ports:
+                    wait_until_listening(port)
+                factory = RequestFactory(customers, args.seed)
+                warm_up = ["balance", "list_page"] * args.concurrency
+                asyncio.run(load(ports, api_key, warm_up, factory, args.concurrency, 1))
+
+                sampler = LockWaitSampler(settings_dict)
+                sampler.start()
+                latencies, errors = asyncio.run(
+                    load(
+                        ports,
+                        api_key,
+                        operations,
+                        factory,
+                        args.concurrency,
+                        args.duration,
+                    )
+                )
+                sampler.stop()
+            finally:
+                for process in servers:
+                    process.terminate()
+                for process in servers:
+                    process.wait()
+
+            rows = summary(latencies, errors, args.duration)
+            print_report(server, rows, sampler)
+            results["servers"][server] = {
+                "operations": rows,
+                "lock_wait_s": {
+                    event: round(seconds, 3) for event, seconds in sampler.waits.items()
+                },
+                "max_sessions_waiting": sampler.max_waiting,
+            }
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration, read from the working directory by every
+``gunicorn ...`` command (see docker-compose.yml).
+
+Prometheus metrics run in multiprocess mode: each worker writes its values to
+PROMETHEUS_MULTIPROC_DIR and /metrics sums those of every worker.
+"""
+
+import os
+import tempfile
+
+
+def on_starting(server):
+    # Set before the workers import prometheus_client. A fresh directory per
+    # run: values left by a previous run would be added to this one's.
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path is None:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+        return
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,44 @@
+"""
+URL configuration of the admin entry point (mo.settings_admin): Grappelli
+admin, honeypot and the API documentation.
+"""
+
+from django.conf import settings
+from django.contrib import admin
+from django.urls import include, path, re_path
+
+from apps.common.views.honeypot_view import BufferedAdminHoneypot
+from mo.swagger import CachedSchemaView, schema_view
+
+docs_urls = [
+    re_path(
+        r"^swagger(?P<format>\.json|\.yaml)$",
+        CachedSchemaView.as_view(),
+        name="schema-json",
+    ),
+    re_path(
+        r"^swagger/$",
+        schema_view.with_ui("swagger", cache_timeout=0),
+        name="schema-swagger-ui",
+    ),
+    re_path(
+        r"^redoc/$", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"
+    ),
+]
+
+# admin_honeypot.urls, with the view buffering the login attempts.
+honeypot_urls = [
+    path("login/", BufferedAdminHoneypot.as_view(), name="login"),
+    re_path(r"^.*$", BufferedAdminHoneypot.as_view(), name="index"),
+]
+
+admin_urls = [
+    path(f"{settings.ADMIN_URL}/", admin.site.urls),
+    path("grappelli/", include("grappelli.urls")),
+    path(
+        f"{settings.ADMIN_HONEYPOT_URL}/",
+        include((honeypot_urls, "admin_honeypot")),
+    ),
+]
+
+urlpatterns = docs_urls + admin_urls
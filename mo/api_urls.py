@@ -0,0 +1,15 @@
+"""
+URL configuration of the API entry point (mo.settings_api): only the API
+endpoints and their metrics, no admin or docs.
+"""
+
+from django.urls import include, path
+
+from apps.common.views.metrics_view import metrics_view
+
+urlpatterns = [
+    path("", include("apps.loans.urls")),
+    path("", include("apps.payments.urls")),
+    path("", include("apps.customers.urls")),
+    path("metrics", metrics_view, name="metrics"),
+]
@@ -12,5 +12,11 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mo.settings")
+# Read endpoints run natively async under ASGI.
+os.environ.setdefault("ASYNC_READ_ENDPOINTS", "True")
+# Sync code (and so DB connections) runs in a thread per request under ASGI, so
+# persistent connections would pile up, one per thread: connect per request
+# and, to pool connections, point DATABASE_HOST at PgBouncer.
+os.environ.setdefault("DATABASE_PROFILE", "default")
 
 application = get_asgi_application()
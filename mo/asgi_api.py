@@ -0,0 +1,15 @@
+"""
+ASGI config of the API-only entry point (see mo.settings_api and mo.asgi).
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mo.settings_api")
+os.environ.setdefault("ASYNC_READ_ENDPOINTS", "True")
+os.environ.setdefault("DATABASE_PROFILE", "default")
+
+application = get_asgi_application()
@@ -4,6 +4,12 @@ from celery import Celery
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mo.settings")
 
-celery_app = Celery("mo")
+# Celery's Django fixup (installed because DJANGO_SETTINGS_MODULE is set) handles
+# DB connections the same way Django does around requests: forked workers drop
+# the connections inherited from the parent, and before and after every task
+# connections that are broken or older than CONN_MAX_AGE are closed. With the
+# "persistent" DATABASE_PROFILE, tasks therefore reuse the worker's connection.
+# Every task accepts a `_profile` kwarg (see apps.common.tasks.ProfiledTask).
+celery_app = Celery("mo", task_cls="apps.common.tasks:ProfiledTask")
 celery_app.config_from_object("django.conf:settings", namespace="CELERY")
 celery_app.autodiscover_tasks()
@@ -0,0 +1,118 @@
+"""
+Read replica routing.
+
+Reads go to a replica only inside ``replica_reads()``, which the read actions
+of the API viewsets open (see ReplicaReadViewMixin). Everything else, and any
+read that follows a write within the same block (read-your-own-writes), goes
+to the primary. Replicas lagging more than DATABASE_REPLICA_MAX_LAG seconds,
+or failing the lag check, are skipped until the next check.
+"""
+
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# On a standby, lag is the age of the last replayed transaction unless every
+# received WAL has been replayed already; on a primary (or a test mirror) it
+# is 0.
+REPLICA_LAG_SQL = """
+    SELECT COALESCE(
+        CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END,
+        0
+    )
+"""
+
+
+class _RoutingState:
+    __slots__ = ("wrote",)
+
+    def __init__(self):
+        self.wrote = False
+
+
+_state = ContextVar("db_routing_state", default=None)
+_lag_checks = {}
+_round_robin = itertools.count()
+
+
+@contextmanager
+def replica_reads():
+    """
+    Allow reads to be served by replicas until a write happens in the block.
+    """
+    token = _state.set(_RoutingState())
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+def replica_lag(alias: str) -> float:
+    """
+    Seconds the replica is behind the primary; cached for
+    DATABASE_REPLICA_LAG_CHECK_INTERVAL seconds per process.
+    """
+    now = time.monotonic()
+    checked_at, lag = _lag_checks.get(alias, (None, None))
+    if (
+        checked_at is not None
+        and now - checked_at < settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL
+    ):
+        return lag
+
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        lag = 0.0
+    else:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(REPLICA_LAG_SQL)
+                lag = float(cursor.fetchone()[0])
+        except DatabaseError as e:
+            logger.error(f"Replica {alias} lag check failed: {e}")
+            lag = float("inf")
+    _lag_checks[alias] = (now, lag)
+    return lag
+
+
+def healthy_replicas():
+    return [
+        alias
+        for alias in settings.DATABASE_REPLICAS
+        if replica_lag(alias) <= settings.DATABASE_REPLICA_MAX_LAG
+    ]
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.wrote or not settings.DATABASE_REPLICAS:
+            return DEFAULT_DB_ALIAS
+
+        replicas = healthy_replicas()
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        return replicas[next(_round_robin) % len(replicas)]
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
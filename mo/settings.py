@@ -11,8 +11,10 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 
+from celery.schedules import crontab
 from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -28,6 +30,9 @@ SECRET_KEY = config("SECRET_KEY")
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = config("DEBUG", cast=bool)
 
+# Running under `manage.py test`: keep external services (replicas, Redis) out.
+TESTING = sys.argv[1:2] == ["test"]
+
 ALLOWED_HOSTS = config("ALLOWED_HOSTS", cast=Csv())
 
 CSRF_TRUSTED_ORIGINS = config("CSRF_TRUSTED_ORIGINS", cast=Csv())
@@ -43,6 +48,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 PROJECT_APPS = [
@@ -74,8 +80,15 @@ DJANGO_ADMIN_LOGS_ENABLED = True
 DJANGO_ADMIN_LOGS_DELETABLE = False
 
 GRAPPELLI_ADMIN_TITLE = "MO"
+# Admin changelists of big tables estimate their row count with the query
+# planner, and only run an exact COUNT(*) below this many rows (see
+# apps.common.methods.estimated_count_paginator).
+ADMIN_EXACT_COUNT_LIMIT = config("ADMIN_EXACT_COUNT_LIMIT", default=10_000, cast=int)
 
 MIDDLEWARE = [
+    "apps.common.middleware.profiling_middleware.ProfilingMiddleware",
+    "apps.common.middleware.server_timing_middleware.ServerTimingMiddleware",
+    "apps.common.middleware.prometheus_metrics_middleware.PrometheusMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -86,6 +99,29 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Share of requests ServerTimingMiddleware breaks down (SQL, API key auth,
+# validation and view time) in a Server-Timing header and a log line.
+SERVER_TIMING_SAMPLE_RATE = config(
+    "SERVER_TIMING_SAMPLE_RATE", default=0 if TESTING else 0.01, cast=float
+)
+
+# On-demand profiling (X-Profile header, see ProfilingMiddleware): prefixes of
+# the API keys allowed to profile, and how often each of them may.
+PROFILING_API_KEY_PREFIXES = config("PROFILING_API_KEY_PREFIXES", default="", cast=Csv())
+PROFILING_RATE = config("PROFILING_RATE", default="10/h")
+PROFILING_SAMPLE_INTERVAL = config("PROFILING_SAMPLE_INTERVAL", default=0.001, cast=float)
+PROFILING_STORAGE_DIR = "profiles"
+
+# Slow query log (SlowQuery, in the admin): queries slower than this many
+# seconds (0: off), keeping the SLOW_QUERY_LOG_SIZE most recently seen
+# statements.
+SLOW_QUERY_THRESHOLD = config("SLOW_QUERY_THRESHOLD", default=0.2, cast=float)
+SLOW_QUERY_LOG_SIZE = config("SLOW_QUERY_LOG_SIZE", default=500, cast=int)
+
+# Prometheus metrics (/metrics): scrapers must send this bearer token. When
+# empty, /metrics is only served with DEBUG on.
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
 ROOT_URLCONF = "mo.urls"
 
 TEMPLATES = [
@@ -106,6 +142,11 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "mo.wsgi.application"
 
+# Serve the GET list/retrieve/balance actions from their async viewsets (see
+# apps.common.routers.async_read_router). mo/asgi.py turns it on; leave it off
+# under WSGI, where async views would run through async_to_sync.
+ASYNC_READ_ENDPOINTS = config("ASYNC_READ_ENDPOINTS", default=False, cast=bool)
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -121,6 +162,54 @@ DATABASES = {
     }
 }
 
+# Connection handling:
+#   "default"    a new connection per request / task (Django's default).
+#   "persistent" keep connections open for DATABASE_CONN_MAX_AGE seconds and
+#                check they are alive before reusing them after each request.
+#   "pgbouncer"  "persistent" behind PgBouncer in transaction pooling mode: no
+#                server-side cursors, which would not survive the transaction.
+#                Set the database role's timezone to UTC so Django does not
+#                issue SET TIME ZONE (session state) on connect.
+DATABASE_PROFILE = config(
+    "DATABASE_PROFILE", default="default" if DEBUG else "persistent"
+)
+DATABASE_CONN_MAX_AGE = config("DATABASE_CONN_MAX_AGE", default=600, cast=int)
+
+DATABASE_PROFILES = {
+    "default": {"CONN_MAX_AGE": 0},
+    "persistent": {"CONN_MAX_AGE": DATABASE_CONN_MAX_AGE, "CONN_HEALTH_CHECKS": True},
+    "pgbouncer": {
+        "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+        "DISABLE_SERVER_SIDE_CURSORS": True,
+    },
+}
+
+DATABASES["default"].update(DATABASE_PROFILES[DATABASE_PROFILE])
+
+# Read replicas ("host" or "host:port", comma separated), same credentials as
+# the primary. GET list/retrieve/balance requests read from them (see
+# mo.db_router). Ignored by the test suite, which only uses the primary.
+DATABASE_REPLICA_HOSTS = config("DATABASE_REPLICA_HOSTS", default="", cast=Csv())
+DATABASE_REPLICAS = []
+for index, replica_host in enumerate([] if TESTING else DATABASE_REPLICA_HOSTS, start=1):
+    replica_host, _, replica_port = replica_host.partition(":")
+    alias = f"replica_{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": replica_host,
+        "PORT": replica_port or DATABASES["default"]["PORT"],
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["mo.db_router.ReadReplicaRouter"]
+# Seconds a replica may lag behind before reads fall back to the primary, and
+# how often each process re-checks the lag.
+DATABASE_REPLICA_MAX_LAG = config("DATABASE_REPLICA_MAX_LAG", default=5, cast=float)
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = config(
+    "DATABASE_REPLICA_LAG_CHECK_INTERVAL", default=5, cast=float
+)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -142,6 +231,27 @@ AUTH_PASSWORD_VALIDATORS = [
 
 API_KEY_CUSTOM_HEADER = "HTTP_X_API_KEY"
 
+# Verified API keys are cached (keyed by a digest of the key) to skip the DB
+# lookup and hasher check on every request. The local tier is per process.
+API_KEY_CACHE_TTL = config("API_KEY_CACHE_TTL", default=60, cast=int)
+API_KEY_CACHE_LOCAL_TTL = config("API_KEY_CACHE_LOCAL_TTL", default=5, cast=int)
+API_KEY_CACHE_SIZE = config("API_KEY_CACHE_SIZE", default=1024, cast=int)
+
+# Token bucket per API key: "<tokens>/<period>", period in s/m/h/d like DRF.
+# Reads are list/retrieve/balance/simulate; every other action is a write.
+API_KEY_THROTTLE_RATES = {
+    "read": config("API_KEY_THROTTLE_READ_RATE", default="600/m"),
+    "write": config("API_KEY_THROTTLE_WRITE_RATE", default="120/m"),
+}
+# Seconds to wait for Redis before falling back to in-process buckets, and
+# how long to keep using them before trying Redis again.
+API_KEY_THROTTLE_REDIS_TIMEOUT = config(
+    "API_KEY_THROTTLE_REDIS_TIMEOUT", default=0.05, cast=float
+)
+API_KEY_THROTTLE_REDIS_RETRY = config(
+    "API_KEY_THROTTLE_REDIS_RETRY", default=30, cast=int
+)
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -171,6 +281,9 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Swagger (endpoint documentation)
 
 SWAGGER_SETTINGS = {
+    # Pre-generated schema (mo.swagger.CachedSchemaView) instead of introspecting
+    # the API on every docs page load.
+    "SPEC_URL": "/swagger.json",
     "USE_SESSION_AUTH": True,
     "LOGOUT_URL": "/admin/logout/",
     "DOC_EXPANSION": "list",
@@ -194,9 +307,18 @@ SWAGGER_SETTINGS = {
     },
 }
 
+REDOC_SETTINGS = {"SPEC_URL": "/swagger.json"}
+
 # Swagger Permissions valid values: "Authenticated", "Admin", "Any"
 SWAGGER_PERMISSIONS = "Any"
 
+# The schema is written here once per code version, by
+# `manage.py generate_openapi_schema` or on the first request.
+OPENAPI_SCHEMA_DIR = config(
+    "OPENAPI_SCHEMA_DIR", default=os.path.join(STATIC_ROOT, "openapi/")
+)
+OPENAPI_SCHEMA_MAX_AGE = config("OPENAPI_SCHEMA_MAX_AGE", default=86400, cast=int)
+
 # Security Headers Settings
 CORS_ALLOWED_ORIGINS = config("CORS_ALLOWED_ORIGINS", cast=Csv())
 CORS_ALLOW_CREDENTIALS = config("CORS_ALLOW_CREDENTIALS", cast=bool)
@@ -218,11 +340,74 @@ CORS_ALLOW_HEADERS = [
 ]
 
 
+# Redis (rate limiting and cache). Leave empty to keep that state in process memory.
+REDIS_URL = config("REDIS_URL", default="")
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# "redis" in production; "locmem" for tests and local runs without Redis.
+# apps.common.cache.two_tier_cache adds a per-process LRU tier in front of it.
+
+CACHE_PROFILE = config(
+    "CACHE_PROFILE", default="redis" if REDIS_URL and not TESTING else "locmem"
+)
+
+CACHE_PROFILES = {
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "mo",
+        "OPTIONS": {"socket_timeout": 0.1, "socket_connect_timeout": 0.1},
+    },
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "mo",
+    },
+}
+
+CACHES = {"default": CACHE_PROFILES[CACHE_PROFILE]}
+
+CACHE_DEFAULT_TTL = config("CACHE_DEFAULT_TTL", default=300, cast=int)
+CACHE_LOCAL_TTL = config("CACHE_LOCAL_TTL", default=5, cast=int)
+CACHE_LOCAL_MAXSIZE = config("CACHE_LOCAL_MAXSIZE", default=1024, cast=int)
+CACHE_VERSION_CHECK_INTERVAL = config("CACHE_VERSION_CHECK_INTERVAL", default=1, cast=int)
+CACHE_LOCK_TIMEOUT = config("CACHE_LOCK_TIMEOUT", default=10, cast=int)
+# Seconds to skip the shared tier after a Redis error.
+CACHE_REMOTE_RETRY = config("CACHE_REMOTE_RETRY", default=30, cast=int)
+
+
 # Celery Queue
 
 CELERY_BROKER_URL = config("CELERY_BROKER_URL")
 CELERY_RESULT_BACKEND = config("CELERY_RESULT_BACKEND")
 USE_CELERY = config("USE_CELERY", cast=bool)
+# Port on which each worker exposes its Prometheus metrics (0: not exposed).
+CELERY_METRICS_PORT = config("CELERY_METRICS_PORT", default=0, cast=int)
+# Synced into django_celery_beat's DatabaseScheduler when beat starts.
+CELERY_BEAT_SCHEDULE = {
+    "create-payment-partitions": {
+        "task": "create_payment_partitions_task",
+        "schedule": crontab(minute=0, hour=3),
+    },
+    "archive-closed-records": {
+        "task": "archive_closed_records_task",
+        "schedule": crontab(minute=0, hour=4),
+    },
+}
+
+
+# Payments
+# Strategy used to distribute a payment across open loans:
+# "fifo" (taken_at), "oldest_due" (maximum_payment_date) or "pro_rata".
+PAYMENT_ALLOCATION_STRATEGY = config("PAYMENT_ALLOCATION_STRATEGY", default="fifo")
+# Monthly partitions of the payments tables created ahead of time (see
+# apps.payments.methods.partitions).
+PAYMENT_PARTITIONS_AHEAD = config("PAYMENT_PARTITIONS_AHEAD", default=3, cast=int)
+# Closed loans and settled payments older than this are moved to the archive
+# tables, this many rows per transaction (see apps.payments.methods.archive).
+ARCHIVE_RETENTION_DAYS = config("ARCHIVE_RETENTION_DAYS", default=180, cast=int)
+ARCHIVE_BATCH_SIZE = config("ARCHIVE_BATCH_SIZE", default=1000, cast=int)
 
 
 # Django Storage
@@ -240,6 +425,21 @@ AWS_S3_ADDRESSING_STYLE = config("AWS_S3_ADDRESSING_STYLE")
 # HoneyPot settings
 ADMIN_URL = config("ADMIN_URL", default="admin")
 ADMIN_HONEYPOT_URL = config("ADMIN_HONEYPOT_URL", default="admin-honeypot")
+# Login attempts are buffered in Redis (or process memory) and written in bulk
+# every HONEYPOT_FLUSH_INTERVAL seconds; at most HONEYPOT_BUFFER_SIZE distinct
+# attempts are kept between flushes (see apps.common.methods.honeypot_log).
+HONEYPOT_FLUSH_INTERVAL = config("HONEYPOT_FLUSH_INTERVAL", default=30, cast=int)
+HONEYPOT_BUFFER_SIZE = config("HONEYPOT_BUFFER_SIZE", default=10_000, cast=int)
+# Seconds to wait for Redis before buffering in process memory, and how long to
+# keep doing so before trying Redis again.
+HONEYPOT_REDIS_TIMEOUT = config("HONEYPOT_REDIS_TIMEOUT", default=0.05, cast=float)
+HONEYPOT_REDIS_RETRY = config("HONEYPOT_REDIS_RETRY", default=30, cast=int)
+# Each flush mails the ADMINS one per-IP summary (ADMIN_HONEYPOT_EMAIL_ADMINS,
+# default True), never one email per attempt.
+CELERY_BEAT_SCHEDULE["flush-honeypot-attempts"] = {
+    "task": "flush_honeypot_attempts_task",
+    "schedule": HONEYPOT_FLUSH_INTERVAL,
+}
 
 AUTH_USER_MODEL = "users.User"
 
@@ -253,3 +453,22 @@ AUTH_USER_MODEL = "users.User"
 #         "rest_framework_api_key.permissions.HasAPIKey",
 #     ],
 # }
+
+
+# Logging
+# https://docs.djangoproject.com/en/4.2/topics/logging/
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        # One line per request sampled by ServerTimingMiddleware.
+        "apps.common.middleware.server_timing_middleware": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
@@ -0,0 +1,10 @@
+"""
+Settings of the admin entry point (mo.wsgi_admin): the full configuration of
+mo.settings, serving only the admin, the honeypot and the API documentation.
+"""
+
+from mo.settings import *  # noqa: F401,F403
+
+ROOT_URLCONF = "mo.admin_urls"
+
+WSGI_APPLICATION = "mo.wsgi_admin.application"
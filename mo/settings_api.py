@@ -0,0 +1,42 @@
+"""
+Settings of the API-only entry point (mo.wsgi_api / mo.asgi_api).
+
+The same configuration as mo.settings, minus everything the API endpoints do
+not use: no admin, Grappelli, honeypot, sessions, messages or Swagger, and
+only the middleware an API-key authenticated JSON API needs. The admin and the
+API documentation are served by their own entry point (mo.wsgi_admin).
+"""
+
+from mo.settings import *  # noqa: F401,F403
+from mo.settings import PROJECT_APPS
+
+# Application definition
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    # Index expressions with operator classes (the trigram search indexes).
+    "django.contrib.postgres",
+    "rest_framework",
+    "rest_framework_api_key",
+] + PROJECT_APPS
+
+# No sessions, CSRF or clickjacking protection: requests are authenticated by
+# API key and answered with JSON.
+MIDDLEWARE = [
+    "apps.common.middleware.profiling_middleware.ProfilingMiddleware",
+    "apps.common.middleware.server_timing_middleware.ServerTimingMiddleware",
+    "apps.common.middleware.prometheus_metrics_middleware.PrometheusMetricsMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "django.middleware.common.CommonMiddleware",
+]
+
+ROOT_URLCONF = "mo.api_urls"
+
+WSGI_APPLICATION = "mo.wsgi_api.application"
+
+# Rest Framework: JSON only (no browsable API).
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+}
@@ -2,17 +2,35 @@
 Swagger configuration
 
 This file is used to configure the swagger documentation for the API.
+
+The JSON/YAML schema is generated once per code version (see
+schema_fingerprint) and written to OPENAPI_SCHEMA_DIR, either by
+`manage.py generate_openapi_schema` or on the first request, then served from
+memory with ETag and Cache-Control headers by CachedSchemaView. The Swagger and
+ReDoc UIs load it from there (SPEC_URL).
 """
 
+# Python libs
+import hashlib
+import os
+from functools import lru_cache
+from importlib.metadata import version
+from pathlib import Path
+
 # Django lib
 from django.conf import settings
+from django.http import HttpResponse
 
 # Third party libs
 from drf_yasg import openapi
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
 from drf_yasg.views import get_schema_view
 
 # Rest Framework
 from rest_framework import permissions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.views import APIView
 
 ALLOWED_PERMISSIONS = {
     "Authenticated": permissions.IsAuthenticated,
@@ -22,15 +40,105 @@ ALLOWED_PERMISSIONS = {
 
 permission = ALLOWED_PERMISSIONS.get(settings.SWAGGER_PERMISSIONS, permissions.AllowAny)
 
+API_INFO = openapi.Info(
+    title="Mo API",
+    default_version="v1",
+    description="Description",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="juancamiloariascalderon173@gmail.com"),
+    license=openapi.License(name="BSD License"),
+)
+
+# The API's own URLconf: the docs are served by the admin entry point.
+API_URLCONF = "mo.api_urls"
+
 schema_view = get_schema_view(
-    openapi.Info(
-        title="Mo API",
-        default_version="v1",
-        description="Description",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="juancamiloariascalderon173@gmail.com"),
-        license=openapi.License(name="BSD License"),
-    ),
+    API_INFO,
     public=True,
     permission_classes=(permission,),
+    urlconf=API_URLCONF,
 )
+
+SCHEMA_FORMATS = {
+    ".json": OpenAPICodecJson,
+    ".yaml": OpenAPICodecYaml,
+}
+
+
+@lru_cache(maxsize=1)
+def schema_fingerprint() -> str:
+    """
+    Digest of the project's code (and of the drf-yasg version): the schema
+    can only change when this does.
+    """
+    base_dir = Path(settings.BASE_DIR)
+    digest = hashlib.blake2b(version("drf-yasg").encode(), digest_size=16)
+    for directory in ("apps", "mo"):
+        for path in sorted((base_dir / directory).rglob("*.py")):
+            if "tests" in path.parts or "migrations" in path.parts:
+                continue
+            digest.update(str(path.relative_to(base_dir)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def schema_path(schema_format: str) -> Path:
+    return (
+        Path(settings.OPENAPI_SCHEMA_DIR)
+        / f"openapi-{schema_fingerprint()}{schema_format}"
+    )
+
+
+def generate_schema_files() -> list:
+    """
+    Introspect the API once and write the schema in every format.
+    """
+    generator = swagger_settings.DEFAULT_GENERATOR_CLASS(
+        API_INFO, url=swagger_settings.DEFAULT_API_URL, urlconf=API_URLCONF
+    )
+    schema = generator.get_schema(request=None, public=True)
+
+    paths = []
+    for schema_format, codec in SCHEMA_FORMATS.items():
+        path = schema_path(schema_format)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Other processes may be reading: write aside, then swap atomically.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(codec(validators=[]).encode(schema))
+        os.replace(tmp_path, path)
+        paths.append(path)
+    return paths
+
+
+@lru_cache(maxsize=None)
+def load_schema(schema_format: str) -> bytes:
+    path = schema_path(schema_format)
+    if not path.exists():
+        generate_schema_files()
+    return path.read_bytes()
+
+
+class CachedSchemaView(APIView):
+    """
+    Serves the pre-generated schema (/swagger.json, /swagger.yaml).
+    """
+
+    swagger_schema = None
+    permission_classes = (permission,)
+    renderer_classes = (JSONRenderer,)
+
+    def perform_content_negotiation(self, request, force=False):
+        # The body is already encoded; never answer 406 to an Accept header.
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, format=".json"):
+        codec = SCHEMA_FORMATS[format]
+        headers = {
+            "ETag": f'"{schema_fingerprint()[:20]}{format}"',
+            "Cache-Control": f"public, max-age={settings.OPENAPI_SCHEMA_MAX_AGE}",
+        }
+        if headers["ETag"] in request.headers.get("If-None-Match", ""):
+            return HttpResponse(status=304, headers=headers)
+        return HttpResponse(
+            load_schema(format), content_type=codec.media_type, headers=headers
+        )
@@ -13,40 +13,11 @@ Class-based views
 Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
-"""
-
-from django.conf import settings
-from django.contrib import admin
-from django.urls import include, path, re_path
 
-from mo.swagger import schema_view
-
-urlpatterns = [
-    path("", include("apps.loans.urls")),
-    path("", include("apps.payments.urls")),
-    path("", include("apps.customers.urls")),
-    re_path(
-        r"^swagger(?P<format>\.json|\.yaml)$",
-        schema_view.without_ui(cache_timeout=0),
-        name="schema-json",
-    ),
-    re_path(
-        r"^swagger/$",
-        schema_view.with_ui("swagger", cache_timeout=0),
-        name="schema-swagger-ui",
-    ),
-    re_path(
-        r"^redoc/$", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"
-    ),
-]
+Entry points with only one half: mo.api_urls (API) and mo.admin_urls (admin
+and docs).
+"""
 
-admin_urls = [
-    path(f"{settings.ADMIN_URL}/", admin.site.urls),
-    path("grappelli/", include("grappelli.urls")),
-    path(
-        f"{settings.ADMIN_HONEYPOT_URL}/",
-        include("admin_honeypot.urls", namespace="admin_honeypot"),
-    ),
-]
+from mo import admin_urls, api_urls
 
-urlpatterns += admin_urls
+urlpatterns = api_urls.urlpatterns + admin_urls.urlpatterns
@@ -0,0 +1,13 @@
+"""
+WSGI config of the admin entry point (see mo.settings_admin).
+
+It exposes the WSGI callable as a module-level variable named ``application``.
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mo.settings_admin")
+
+application = get_wsgi_application()
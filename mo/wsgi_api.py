@@ -0,0 +1,13 @@
+"""
+WSGI config of the API-only entry point (see mo.settings_api).
+
+It exposes the WSGI callable as a module-level variable named ``application``.
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mo.settings_api")
+
+application = get_wsgi_application()